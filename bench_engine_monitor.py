@@ -0,0 +1,65 @@
+"""Benchmark fleet-wide engine alert evaluation against a per-vessel loop.
+
+Usage: python bench_engine_monitor.py [vessels]
+"""
+import sys
+import time
+
+import numpy as np
+
+from src.models.engine_monitor import evaluate_engine_alerts
+from src.models.fleet_state import FleetState
+
+
+def scalar_alerts(values, limits):
+    """Per-vessel threshold rules, as evaluated before the vectorized path"""
+    rpm, load, pressure, temp = values
+    alerts = []
+    if not limits[0][0] <= rpm <= limits[0][1]:
+        alerts.append({'parameter': 0, 'value': rpm, 'normal_range': limits[0],
+                       'severity': 'high' if abs(rpm - sum(limits[0]) / 2) > 15 else 'medium'})
+    if not limits[1][0] <= load <= limits[1][1]:
+        alerts.append({'parameter': 1, 'value': load, 'normal_range': limits[1],
+                       'severity': 'high' if load > 90 else 'medium'})
+    if not limits[2][0] <= pressure <= limits[2][1]:
+        alerts.append({'parameter': 2, 'value': pressure, 'normal_range': limits[2], 'severity': 'high'})
+    if not limits[3][0] <= temp <= limits[3][1]:
+        alerts.append({'parameter': 3, 'value': temp, 'normal_range': limits[3],
+                       'severity': 'high' if temp > limits[3][1] + 10 else 'medium'})
+    return alerts
+
+
+def random_fleet(size: int, seed: int = 7) -> FleetState:
+    rng = np.random.default_rng(seed)
+    fleet = FleetState(capacity=size)
+    for _ in range(size):
+        fleet.add(0.0, 0.0)
+    fleet.engine[:size] = np.column_stack((
+        rng.normal(80, 4, size), rng.normal(72, 4, size), rng.normal(8.0, 0.1, size), rng.normal(80, 2, size)
+    ))
+    return fleet
+
+
+def best_of(function, repeats: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    fleet = random_fleet(size)
+    values = fleet.engine[:size].tolist()
+    limits = fleet.engine_limits[:size].tolist()
+
+    scalar = best_of(lambda: [scalar_alerts(values[slot], limits[slot]) for slot in range(size)])
+    vectorized = best_of(lambda: evaluate_engine_alerts(fleet))
+    print(f"{size:,} vessels: scalar {scalar * 1e3:.1f} ms, numpy {vectorized * 1e3:.1f} ms, "
+          f"{scalar / vectorized:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
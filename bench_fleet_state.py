@@ -0,0 +1,38 @@
+"""Benchmark one fleet-wide position update through MarineTrafficAPI.
+
+Usage: python bench_fleet_state.py [repeats]
+"""
+import sys
+import time
+
+from src.models.fleet_state import FleetState
+from src.utils.api_handler import MarineTrafficAPI
+
+FLEET_SIZES = (5_000, 50_000, 200_000)
+
+
+def bench(size: int, repeats: int) -> float:
+    """Best wall time of one update_fleet_positions call, in seconds"""
+    fleet = FleetState(capacity=size)
+    for i in range(size):
+        fleet.add(37.0 + i * 1e-5, 24.0, speed=12.0)
+    api = MarineTrafficAPI()
+
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        api.update_fleet_positions(fleet=fleet)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'vessels':>10} {'update ms':>10} {'vessel-updates/s':>18}")
+    for size in FLEET_SIZES:
+        elapsed = bench(size, repeats)
+        print(f"{size:>10,} {elapsed * 1e3:>10.1f} {size / elapsed:>18,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark vectorized geodesy against the scalar math path.
+
+Usage: python bench_geo.py [pairs]
+"""
+import math
+import sys
+import time
+
+import numpy as np
+
+from src.utils import geo
+
+
+def scalar_bearing(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    d_lon = lon2 - lon1
+    y = math.sin(d_lon) * math.cos(lat2)
+    x = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(d_lon)
+    return (math.degrees(math.atan2(y, x)) + 360) % 360
+
+
+def scalar_haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * geo.EARTH_RADIUS_NM * math.asin(math.sqrt(a))
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = np.random.default_rng(0)
+    lat1, lat2 = rng.uniform(34, 41, (2, count))
+    lon1, lon2 = rng.uniform(22, 28, (2, count))
+    rows = list(zip(lat1.tolist(), lon1.tolist(), lat2.tolist(), lon2.tolist()))
+
+    print(f"{'function':>12} {'scalar ms':>10} {'numpy ms':>10} {'speedup':>8}  ({count:,} pairs)")
+    for name, scalar, vectorized in (
+        ("bearing", scalar_bearing, geo.initial_bearing),
+        ("haversine", scalar_haversine, geo.haversine_nm),
+    ):
+        slow = timed(lambda: [scalar(*row) for row in rows])
+        fast = timed(lambda: vectorized(lat1, lon1, lat2, lon2))
+        print(f"{name:>12} {slow * 1e3:>10.1f} {fast * 1e3:>10.1f} {slow / fast:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
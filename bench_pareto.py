@@ -0,0 +1,46 @@
+"""Benchmark the Pareto route search across process-pool sizes.
+
+Usage: python bench_pareto.py [max_workers]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+from src.models.pareto import ParetoRouteSearch
+from src.models.route import get_route_graph
+
+ORIGIN = (40.8, 24.0)  # North Aegean
+DESTINATION = (35.0, 24.5)  # South of Crete
+
+
+def storm_band(graph):
+    codes = np.zeros(graph.shape, dtype=np.int8)
+    row_lo, col_lo = graph.cell(36.6, 22.0)
+    row_hi, col_hi = graph.cell(36.9, 25.8)
+    codes[row_lo:row_hi, col_lo:col_hi] = 3
+    return codes
+
+
+def main():
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    weather = storm_band(get_route_graph())
+
+    print(f"{'workers':>8} {'seconds':>8} {'speedup':>8} {'options':>8}")
+    baseline = None
+    workers = 1
+    while workers <= max_workers:
+        with ParetoRouteSearch(workers=workers) as search:
+            if workers > 1:
+                search.search(ORIGIN, DESTINATION, speeds=[12.0], weights=[(1, 0, 0, 0)])  # Start the pool
+            start = time.perf_counter()
+            options = search.search(ORIGIN, DESTINATION, weather=weather)
+            elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>8.2f} {baseline / elapsed:>7.1f}x {len(options):>8}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Benchmark route graph construction, A* route queries and the route cache tiers.
+
+Usage: python bench_route.py [queries]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.database.db_manager import DatabaseManager
+from src.database.route_cache import RouteCache
+from src.models.route import RouteGraph, RoutePlanner
+
+QUERIES = (
+    ("Piraeus", "Santorini", "Time"),
+    ("Piraeus", "Heraklion", "Fuel"),
+    ((40.8, 24.0), (35.9, 27.5), "Cost"),
+    ((40.5, 25.5), (34.8, 25.0), "Weather"),
+)
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    start = time.perf_counter()
+    graph = RouteGraph()
+    print(f"graph build: {time.perf_counter() - start:.2f} s ({int(graph.sea.sum()):,} sea nodes)")
+
+    planner = RoutePlanner(graph)
+    print(f"{'query':>30} {'ms':>8} {'expanded':>9}")
+    for origin, destination, priority in QUERIES:
+        start = time.perf_counter()
+        for _ in range(repeats):
+            plan = planner.plan(origin, destination, priority)
+        elapsed = (time.perf_counter() - start) / repeats * 1e3
+        name = f"{origin} -> {destination}"
+        print(f"{name:>30} {elapsed:>8.1f} {plan.nodes_expanded:>9,}")
+
+    with tempfile.TemporaryDirectory() as folder:
+        db = DatabaseManager(str(Path(folder) / "routes.db"))
+        print(f"{'cache tier':>30} {'ms':>8}")
+        first, second = RouteCache(planner, db), RouteCache(planner, db)
+        for cache in (first, second, second):  # Planner, then the shared database, then memory
+            start = time.perf_counter()
+            _, source = cache.plan("Piraeus", "Heraklion", "Fuel")
+            print(f"{source:>30} {(time.perf_counter() - start) * 1e3:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
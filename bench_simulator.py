@@ -0,0 +1,33 @@
+"""Benchmark FleetSimulator ticks per second for growing fleet sizes.
+
+Usage: python bench_simulator.py [ticks]
+"""
+import sys
+import time
+
+from src.models.fleet_state import FleetState
+from src.utils.fleet_simulator import FleetSimulator
+
+FLEET_SIZES = (1_000, 10_000, 100_000)
+
+
+def bench(size: int, ticks: int) -> float:
+    simulator = FleetSimulator(FleetState(capacity=size, track_size=1_000), seed=42)
+    simulator.populate(size)
+    simulator.step()  # Warm-up
+
+    start = time.perf_counter()
+    simulator.run(ticks)
+    return ticks / (time.perf_counter() - start)
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    print(f"{'vessels':>10} {'ticks/s':>10} {'vessel-updates/s':>18}")
+    for size in FLEET_SIZES:
+        rate = bench(size, ticks)
+        print(f"{size:>10,} {rate:>10.1f} {rate * size:>18,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Benchmark SpatialIndex proximity queries against brute-force distance scans.
+
+Usage: python bench_spatial_index.py [vessels] [queries]
+"""
+import sys
+import time
+
+import numpy as np
+
+from src.models.fleet_state import FleetState
+from src.models.spatial_index import SpatialIndex
+from src.utils.fleet_simulator import FleetSimulator
+from src.utils.geo import haversine_nm
+
+
+def timed(function, repeats: int) -> float:
+    """Mean wall time of one call, in milliseconds"""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats * 1e3
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    simulator = FleetSimulator(FleetState(capacity=size), seed=9)
+    simulator.populate(size, bounds=(34.0, 22.0, 41.0, 29.0))
+    fleet = simulator.fleet
+    slots = fleet.slots
+    index = SpatialIndex(fleet)
+    lat, lon = 37.5, 25.0
+
+    def distances():
+        return haversine_nm(lat, lon, fleet.lat[slots], fleet.lon[slots])
+
+    print(f"{'query':>14} {'index ms':>9} {'brute ms':>9} {'speedup':>8}  ({size:,} vessels)")
+    for name, indexed, brute in (
+        ("radius 10 nm", lambda: index.radius(lat, lon, 10.0), lambda: slots[distances() <= 10.0]),
+        ("nearest 10", lambda: index.nearest(lat, lon, k=10), lambda: slots[np.argpartition(distances(), 10)[:10]]),
+    ):
+        fast, slow = timed(indexed, queries), timed(brute, queries)
+        print(f"{name:>14} {fast:>9.2f} {slow:>9.2f} {slow / fast:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark fleet-wide weather refresh against a local stand-in for Stormglass.
+
+Every request is delayed by the injected latency, so refresh time should
+follow ceil(tiles / concurrency) round-trips rather than the fleet size.
+
+Usage: python bench_weather.py [vessels] [latency_seconds]
+"""
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+import src.models.vessel  # noqa: F401  (loads the models package before weather_api)
+from src.utils.weather_api import WeatherAPI
+from src.utils.weather_cache import WeatherTileCache
+
+CONCURRENCY = (1, 4, 16, 64)
+
+
+def serve(latency):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query)
+            time.sleep(latency)
+            body = json.dumps({
+                'hours': [{'time': '2024-01-01T%02d:00:00+00:00' % h,
+                           'waveHeight': {'noaa': 1.2}, 'windSpeed': {'noaa': 6.0}} for h in range(24)],
+                'meta': {'lat': query['lat'][0], 'lng': query['lng'][0]}
+            }).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    server.request_queue_size = 128
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    vessels = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+    rng = np.random.default_rng(3)
+    positions = [tuple(p) for p in rng.uniform((34.0, 22.0), (41.0, 29.0), (vessels, 2))]
+
+    server = serve(latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"{vessels} vessels, {latency * 1000:.0f} ms per request")
+    print(f"{'concurrency':>11} {'tiles':>6} {'seconds':>8} {'ok':>5}")
+    try:
+        for concurrency in CONCURRENCY:
+            api = WeatherAPI(api_key="bench", cache=WeatherTileCache(directory=None))
+            api.base_url = base_url
+            tiles = len({api.cache.key(lat, lon) for lat, lon in positions})
+            started = time.perf_counter()
+            results = asyncio.run(api.fetch_fleet_weather(positions, concurrency=concurrency, timeout=30.0))
+            elapsed = time.perf_counter() - started
+            ok = sum(result is not None for result in results)
+            print(f"{concurrency:>11} {tiles:>6} {elapsed:>8.2f} {ok:>5}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
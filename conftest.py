@@ -0,0 +1,11 @@
+import pytest
+
+from src.models import port_distances
+
+
+@pytest.fixture(autouse=True, scope="session")
+def port_distances_in_tmp(tmp_path_factory):
+    """Build the process-wide port distance matrix in a temporary directory, not the working tree"""
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(port_distances, "DEFAULT_PATH", tmp_path_factory.mktemp("port_distances"))
+        yield
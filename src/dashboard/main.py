@@ -13,9 +13,22 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 from src.utils.api_handler import MarineTrafficAPI
 from route_optimizer_page import RouteOptimizerPage
 from src.models.types import PortCongestion
+from src.models.engine_monitor import evaluate_engine_alerts
+from src.models.cost_engine import voyage_cost_table, monthly_cost_summary
+from src.models.port_distances import get_port_distances
+from src.models.delay_ledger import fleet_delay_costs
 from src.database.db_manager import DatabaseManager
+from src.utils.config import STORMGLASS_API_KEY
 
 class Dashboard:
+    # Engine reading columns for each trend option
+    TREND_COLUMNS = {
+        "RPM": "rpm",
+        "Load": "load",
+        "Pressure": "pressure",
+        "Temperature": "temp"
+    }
+
     def __init__(self):
         self.api = MarineTrafficAPI("test_key")
         self.route_optimizer = RouteOptimizerPage()
@@ -44,6 +57,9 @@ class Dashboard:
             if not vessels:
                 st.error("No vessel data available")
                 return
+            if STORMGLASS_API_KEY:
+                # Live weather for the whole fleet, one request per weather tile
+                self.api.refresh_fleet_weather(vessels)
         except Exception as e:
             st.error(f"Error loading vessel data: {str(e)}")
             return
@@ -74,8 +90,9 @@ class Dashboard:
 
         with map_col:
             # Create map
+            zoom = 9
             m = folium.Map(location=[37.9838, 23.7275],
-                           zoom_start=9,
+                           zoom_start=zoom,
                            tiles="OpenStreetMap")
 
             # Add vessels to map with interactive popups
@@ -83,10 +100,11 @@ class Dashboard:
                 status_info = vessel.get_status_info()
                 popup_content = self._create_enhanced_popup(vessel, status_info)
 
-                # Add vessel track history
-                if vessel.track_history:
+                # Add vessel track history, simplified to the map zoom
+                track = vessel.simplified_track(zoom)
+                if len(track):
                     folium.PolyLine(
-                        vessel.track_history,
+                        track.tolist(),
                         weight=2,
                         color='blue',
                         opacity=0.8
@@ -124,7 +142,7 @@ class Dashboard:
             # Sort vessels
             sort_by = st.selectbox(
                 "Sort vessels by",
-                ["Name", "Status", "Delay Time", "ETA"]
+                ["Name", "Status", "Delay Time", "ETA", "Speed", "Fuel Level"]
             )
             vessels = self._sort_vessels(vessels, sort_by)
 
@@ -155,7 +173,7 @@ class Dashboard:
                 self._display_weather_info(weather_info)
 
                 # Add speed history graph
-                if vessel.speed_history:
+                if len(vessel.speed_history):
                     st.line_chart(vessel.speed_history)
 
                 # Action buttons
@@ -270,23 +288,20 @@ class Dashboard:
             help="Select time range in hours"
         )
 
-        if vessel.engine.readings_history:
-            history_df = pd.DataFrame(vessel.engine.readings_history)
-
-            # Filter data based on selected time range
-            history_df = history_df.tail(int(time_range * 3600 / 5))  # Assuming 5-second intervals
+        if len(vessel.engine.readings):
+            # Zero-copy views of the selected time range
+            history = vessel.engine.readings.window(int(time_range * 3600 / 5))  # Assuming 5-second intervals
 
             fig = go.Figure()
 
             for param in trend_options:
-                param_lower = param.lower()
-                if param_lower in history_df.columns:
-                    fig.add_trace(go.Scatter(
-                        x=list(range(len(history_df))),
-                        y=history_df[param_lower],
-                        name=param,
-                        mode='lines'
-                    ))
+                values = history[self.TREND_COLUMNS[param]]
+                fig.add_trace(go.Scatter(
+                    x=list(range(len(values))),
+                    y=values,
+                    name=param,
+                    mode='lines'
+                ))
 
             fig.update_layout(
                 title='Engine Parameters History',
@@ -329,6 +344,15 @@ class Dashboard:
                     Time: {alert.get('timestamp', 'N/A')}
                 """)
 
+        # Drift and spike anomalies from the streaming detector
+        anomaly = vessel.engine.anomaly
+        if anomaly['has_anomaly']:
+            st.warning(f"📈 Engine Trend Anomaly ({anomaly['anomaly_type']})")
+            for item in anomaly['anomalies']:
+                impact = anomaly['contributing_factors'].get(item['parameter'], 0.0)
+                st.write(f"- {item['parameter']}: {item['type']} "
+                         f"(score {item['score']:+.1f}, {impact:+.1f}% vs baseline)")
+
         # Add maintenance recommendations if needed
         if engine_status.get('maintenance_needed'):
             st.info("🔧 Maintenance Recommendations")
@@ -534,11 +558,12 @@ class Dashboard:
                 """)
 
             # Performance Trends
-            if vessel.speed_history:
+            speed_history = vessel.speed_history[-50:]  # Last 50 readings
+            if len(speed_history):
                 st.markdown("### Performance Trends")
                 speed_df = pd.DataFrame({
-                    'Speed': vessel.speed_history[-50:],  # Last 50 readings
-                    'Optimal': [vessel.optimal_speed] * len(vessel.speed_history[-50:])
+                    'Speed': speed_history,
+                    'Optimal': [vessel.optimal_speed] * len(speed_history)
                 })
                 st.line_chart(speed_df)
 
@@ -559,10 +584,12 @@ class Dashboard:
 
             # Hidden ML-specific data
             'features': {
-                'weather_conditions': vessel.weather_forecasts,
-                'engine_parameters': vessel.engine.readings_history,
+                'weather_conditions': list(vessel.weather_forecasts),  # The forecasts, not the store object
+                # Plain lists: copies of the live ring views, and str() would elide long arrays
+                'engine_parameters': {column: values.tolist()
+                                      for column, values in vessel.engine.readings_history.items()},
                 'route_specifics': {
-                    'traffic_density': self._get_route_traffic(),
+                    'traffic_density': self._get_route_traffic(vessel),
                     'seasonal_patterns': self._get_seasonal_data(),
                     'historical_delays': self._get_historical_delays()
                 },
@@ -841,31 +868,18 @@ class Dashboard:
         if not vessel.voyage_history:
             return None
 
-        # Calculates the date one year ago
-        target_date = current_voyage.start_date - timedelta(days=365)
-
-        # Searching for a voyage with similar date and destination
-        for voyage in vessel.voyage_history:
-            if (voyage.origin == current_voyage.origin and
-                    voyage.destination == current_voyage.destination and
-                    abs((voyage.start_date - target_date).days) < 30):
-                return voyage
-
-        return None
+        # Same route, started closest to one year ago and less than 30 days off (route index lookup)
+        return vessel.voyage_history.same_route_last_year(current_voyage)
 
     def _calculate_monthly_averages(self, vessel):
         """Calculate average costs for the current month"""
         if not vessel.voyage_history:
             return None
 
-        current_month = datetime.now().month
-        current_year = datetime.now().year
+        now = datetime.now()
 
-        # filtering current month voyages
-        month_voyages = [
-            v for v in vessel.voyage_history
-            if v.start_date.month == current_month and v.start_date.year == current_year
-        ]
+        # current month voyages from the month index
+        month_voyages = vessel.voyage_history.month(now.year, now.month)
 
         if not month_voyages:
             return None
@@ -885,66 +899,19 @@ class Dashboard:
         if not vessel.voyage_history:
             return None
 
-        # organizing data per month
-        monthly_data = {}
-        for voyage in vessel.voyage_history:
-            month_key = voyage.start_date.strftime('%Y-%m')
-            if month_key not in monthly_data:
-                monthly_data[month_key] = {
-                    'voyages': [],
-                    'total_cost': 0,
-                    'total_distance': 0,
-                    'delays': 0,
-                    'on_time': 0
-                }
+        # One cost table for all voyages, then a single groupby per month
+        monthly = monthly_cost_summary(voyage_cost_table([vessel], get_port_distances()))
 
-            data = monthly_data[month_key]
-            data['voyages'].append(voyage)
-            data['total_cost'] += voyage.total_cost
-            data['total_distance'] += voyage.distance
-
-            if voyage.actual_arrival_time and voyage.actual_arrival_time <= voyage.end_date:
-                data['on_time'] += 1
-            else:
-                data['delays'] += 1
-
-        # calculating statistics
-        stats = {
-            'months': list(monthly_data.keys()),
-            'cost_per_mile': [],
-            'total_voyages': [],
-            'on_time_rate': [],
-            'avg_delay_cost': []
+        return {
+            'months': monthly.index.tolist(),
+            'cost_per_mile': monthly['cost_per_mile'].tolist(),
+            'avg_cost_per_mile': float(monthly['cost_per_mile'].mean()),
+            'total_voyages': int(monthly['total_voyages'].sum()),
+            'on_time_rate': float(monthly['on_time_rate'].mean()),
+            'avg_delay_cost': float(monthly['avg_delay_cost'].mean()),
+            'route_efficiency': float(monthly['route_efficiency'].mean())
         }
 
-        for month, data in monthly_data.items():
-            total_voyages = len(data['voyages'])
-            stats['total_voyages'].append(total_voyages)
-
-            cost_per_mile = data['total_cost'] / data['total_distance'] if data['total_distance'] > 0 else 0
-            stats['cost_per_mile'].append(cost_per_mile)
-
-            on_time_rate = (data['on_time'] / total_voyages * 100) if total_voyages > 0 else 0
-            stats['on_time_rate'].append(on_time_rate)
-
-            total_delay_cost = sum(
-                (costs := vessel.calculate_voyage_costs(v))['port_delay_costs'] +
-                costs['schedule_deviation_costs']
-                for v in data['voyages']
-            )
-            avg_delay_cost = total_delay_cost / total_voyages if total_voyages > 0 else 0
-            stats['avg_delay_cost'].append(avg_delay_cost)
-
-        # Adding sum averages
-        stats['avg_cost_per_mile'] = sum(stats['cost_per_mile']) / len(stats['cost_per_mile']) if stats[
-            'cost_per_mile'] else 0
-        stats['total_voyages'] = sum(stats['total_voyages'])
-        stats['on_time_rate'] = sum(stats['on_time_rate']) / len(stats['on_time_rate']) if stats['on_time_rate'] else 0
-        stats['avg_delay_cost'] = sum(stats['avg_delay_cost']) / len(stats['avg_delay_cost']) if stats[
-            'avg_delay_cost'] else 0
-
-        return stats
-
     def _calculate_voyage_progress(self, voyage):
         """Calculate voyage progress as a percentage"""
         now = datetime.now()
@@ -1033,6 +1000,12 @@ class Dashboard:
             return sorted(vessels, key=lambda x: x.current_delay.total_seconds(), reverse=True)
         elif sort_by == "ETA":
             return sorted(vessels, key=lambda x: x.current_eta)
+        elif sort_by in ("Speed", "Fuel Level") and vessels:
+            # Vectorized sort over the shared fleet state columns
+            by_slot = {v.slot: v for v in vessels}
+            field = "speed" if sort_by == "Speed" else "fuel_level"
+            order = vessels[0].fleet.sort(field, slots=list(by_slot), descending=True)
+            return [by_slot[slot] for slot in order]
         else:
             return vessels  # Return unsorted if no valid sort criteria
 
@@ -1042,13 +1015,25 @@ class Dashboard:
         delayed_vessels = sum(1 for v in vessels if v.is_delayed())
         total_delay_cost = sum(v.total_delay_cost for v in vessels)
 
-        col1, col2, col3 = st.columns(3)
+        # One vectorized pass over the fleet engine columns
+        engine_alerts = evaluate_engine_alerts(vessels[0].fleet, [v.slot for v in vessels]) if vessels else []
+
+        col1, col2, col3, col4 = st.columns(4)
         with col1:
             st.metric("Total Vessels", total_vessels)
         with col2:
             st.metric("Delayed Vessels", delayed_vessels)
         with col3:
             st.metric("Total Delay Cost", f"${total_delay_cost:,.2f}")
+        with col4:
+            st.metric("Engine Alerts", len(engine_alerts))
+
+        # Fleet roll-up of the per-vessel delay ledgers
+        delay_costs = fleet_delay_costs((v.delays for v in vessels),
+                                        since=datetime.now() - timedelta(days=30))
+        if delay_costs:
+            with st.expander("Delay Cost by Cause (last 30 days)"):
+                st.bar_chart(pd.Series(delay_costs, name="Cost (USD)"))
 
     def _show_vessel_card(self, vessel):
         """Display individual vessel information card"""
@@ -1078,6 +1063,10 @@ class Dashboard:
                     - Queue Position: {vessel.port_status['queue_position'] or 'N/A'}
                     - Estimated Waiting: {vessel.port_status['estimated_waiting_time']}
                 """)
+            if vessel.jit_speed is not None:
+                st.info(f"⏱️ Just-in-time speed: {vessel.jit_speed:.1f} knots "
+                        f"(berth in {vessel.port_status['berth_available_in']}, "
+                        f"saves {vessel.port_status['jit_fuel_saving']:.1f} t fuel)")
 
             # Performance Metrics
             st.write("📊 **Performance**")
@@ -1091,7 +1080,7 @@ class Dashboard:
                 st.metric("Engine Temp", f"{engine_status['current_values']['temperature']:.1f}°C")
 
             # Speed History
-            if vessel.speed_history:
+            if len(vessel.speed_history):
                 st.write("📈 **Speed History**")
                 st.line_chart(vessel.speed_history)
 
@@ -1119,12 +1108,21 @@ class Dashboard:
         # This method will be called when the "Show All Tracks" button is clicked
         pass  # For now, we'll just pass as we need to implement track toggling
 
-    def _get_route_traffic(self):
-        """Get route traffic data"""
-        # Προσωρινή υλοποίηση
+    # Nearby-vessel counts (within TRAFFIC_RADIUS_NM) for each density label
+    TRAFFIC_RADIUS_NM = 20.0
+    TRAFFIC_LEVELS = ((2, 'low'), (6, 'medium'))
+
+    def _get_route_traffic(self, vessel):
+        """Get traffic around the vessel from the spatial index of the fleet"""
+        index = self.api.spatial_index
+        if index.fleet is not vessel.fleet:
+            return {'density': 'unknown', 'vessels_nearby': 0}
+
+        nearby = index.count_within(*vessel.position, self.TRAFFIC_RADIUS_NM) - 1  # Excluding itself
+        density = next((label for limit, label in self.TRAFFIC_LEVELS if nearby <= limit), 'high')
         return {
-            'density': 'medium',
-            'vessels_nearby': 5
+            'density': density,
+            'vessels_nearby': nearby
         }
 
     def _get_seasonal_data(self):
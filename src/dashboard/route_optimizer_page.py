@@ -2,12 +2,22 @@ import streamlit as st
 import pandas as pd
 from typing import Dict
 from src.database.db_manager import DatabaseManager  # Διορθωμένο import
+from src.database.route_cache import get_route_cache
+from src.models.pareto import get_pareto_search
+from src.models.route import PRIORITIES
+from src.utils.http_client import get_http_client
+from src.utils.singleflight import singleflight_report
+from src.utils.ttl_cache import ttl_cache_report
 
 
 
 class RouteOptimizerPage:
     def __init__(self):
         self.db = DatabaseManager()
+        # Shared by every session and rerun: one graph copy and one worker pool per process
+        self.pareto = get_pareto_search()
+        self.planner = self.pareto.planner
+        self.route_cache = get_route_cache()
 
     def show(self):
         st.title("Route Optimization")
@@ -32,22 +42,26 @@ class RouteOptimizerPage:
         col1, col2 = st.columns(2)
 
         with col1:
-            origin = st.selectbox("Origin Port", ["Port A", "Port B", "Port C"])
-            destination = st.selectbox("Destination Port", ["Port A", "Port B", "Port C"])
+            ports = list(self.planner.registry.names)
+            origin = st.selectbox("Origin Port", ports)
+            destination = st.selectbox("Destination Port", ports, index=min(1, len(ports) - 1))
 
         with col2:
             optimization_type = st.radio(
                 "Optimization Priority",
-                ["Time", "Fuel", "Cost", "Weather"]
+                list(PRIORITIES)
             )
+            speed = st.number_input("Service Speed (knots)", min_value=4.0, max_value=25.0, value=12.0)
 
         if st.button("Calculate Optimal Route"):
-            # Here we would call the actual optimization logic
             optimized_route = self._calculate_optimal_route(
-                origin, destination, optimization_type
+                origin, destination, optimization_type, speed
             )
             self._display_optimization_results(optimized_route)
 
+        if st.button("Compare Trade-offs"):
+            self._display_trade_offs(origin, destination)
+
     def _show_optimization_history(self):
         history = self.db.get_route_history()
         if history:
@@ -56,24 +70,41 @@ class RouteOptimizerPage:
 
     def _show_analytics(self):
         st.subheader("Optimization Analytics")
-        # Add analytics visualizations here
 
-    def _calculate_optimal_route(self, origin: str, destination: str, optimization_type: str) -> dict:
+        stats = self.route_cache.stats()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Route Cache Hit Rate", f"{stats['overall']['hit_rate']:.0%}")
+        col2.metric("Memory Hits", stats['memory']['hits'])
+        col3.metric("Database Hits", stats['database']['hits'])
+
+        latency = get_http_client().latency_report()
+        if latency:
+            st.subheader("External API Latency")
+            st.dataframe(pd.DataFrame.from_dict(latency, orient='index'))
+
+        coalescing = singleflight_report()
+        if coalescing:
+            st.subheader("Request Coalescing")
+            st.dataframe(pd.DataFrame.from_dict(coalescing, orient='index'))
+
+        freshness = ttl_cache_report()
+        if freshness:
+            st.subheader("Data Caches")
+            st.dataframe(pd.DataFrame.from_dict(freshness, orient='index'))
+
+    def _calculate_optimal_route(self, origin: str, destination: str, optimization_type: str,
+                                 speed: float = 12.0) -> dict:
         """Calculate optimal route based on selected criteria"""
-        # Simulate route optimization
+        plan, _ = self.route_cache.plan(origin, destination, optimization_type, speed)
         return {
             'origin': origin,
             'destination': destination,
-            'distance': 450.5,  # Nautical miles
-            'estimated_time': 36.5,  # Hours
-            'fuel_consumption': 125.3,  # Tons
-            'total_cost': 28500.0,  # USD
-            'waypoints': [
-                (37.9838, 23.7275),  # Example coordinates
-                (37.4446, 24.9468),
-                (36.9980, 25.9120)
-            ],
-            'weather_risk': 'Low',
+            'distance': round(plan.distance, 1),  # Nautical miles
+            'estimated_time': round(plan.estimated_time, 1),  # Hours
+            'fuel_consumption': round(plan.fuel_consumption, 1),  # Tons
+            'total_cost': plan.total_cost,  # USD
+            'waypoints': plan.waypoints,
+            'weather_risk': plan.weather_risk,
             'optimization_type': optimization_type
         }
 
@@ -89,3 +120,17 @@ class RouteOptimizerPage:
         with col2:
             st.metric("Total Cost", f"${route['total_cost']:,.2f}")
             st.metric("Weather Risk", route['weather_risk'])
+
+    def _display_trade_offs(self, origin: str, destination: str):
+        """Display the non-dominated routes over time, fuel, cost and weather"""
+        options = self.pareto.search(origin, destination)
+        st.subheader("Route Trade-offs")
+        st.dataframe(pd.DataFrame([{
+            'Priority': plan.priority,
+            'Speed (knots)': plan.speed,
+            'Distance (nm)': round(plan.distance, 1),
+            'Time (hours)': round(plan.estimated_time, 1),
+            'Fuel (tons)': round(plan.fuel_consumption, 1),
+            'Cost (USD)': round(plan.total_cost),
+            'Weather Risk': plan.weather_risk
+        } for plan in options]))
@@ -1,8 +1,21 @@
 import sqlite3
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 class DatabaseManager:
+    # Route cache columns added to the original routes table (see _migrate)
+    ROUTE_CACHE_COLUMNS = {
+        'cache_key': 'TEXT',
+        'optimization_type': 'TEXT',
+        'vessel_class': 'TEXT',
+        'speed': 'REAL',
+        'weather_epoch': 'TEXT',
+        'total_cost': 'REAL',
+        'weather_risk': 'TEXT',
+        'weather_exposure': 'REAL',
+        'waypoints': 'TEXT'
+    }
+
     def __init__(self, db_path: str = "fleet_monitor.db"):
         self.db_path = db_path
         self.init_database()
@@ -11,26 +24,38 @@ class DatabaseManager:
         with sqlite3.connect(self.db_path) as conn:
             with open('src/database/schema.sql') as f:
                 conn.executescript(f.read())
+            self._migrate(conn)
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """Add route cache columns to databases created before they existed"""
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(routes)")}
+        for column, column_type in self.ROUTE_CACHE_COLUMNS.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE routes ADD COLUMN {column} {column_type}")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_routes_cache_key ON routes (cache_key)")
 
     def save_route(self, route_data: Dict):
+        columns = ['origin', 'destination', 'distance', 'estimated_time',
+                   'fuel_consumption', 'weather_conditions']
+        columns += [c for c in self.ROUTE_CACHE_COLUMNS if c in route_data]
+        values = [route_data[c] for c in columns] + [datetime.now()]
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO routes (
-                    origin, destination, distance, estimated_time,
-                    fuel_consumption, weather_conditions, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                route_data['origin'],
-                route_data['destination'],
-                route_data['distance'],
-                route_data['estimated_time'],
-                route_data['fuel_consumption'],
-                route_data['weather_conditions'],
-                datetime.now()
-            ))
+            cursor.execute(f"""
+                INSERT INTO routes ({', '.join(columns)}, created_at)
+                VALUES ({', '.join('?' * (len(columns) + 1))})
+            """, values)
             return cursor.lastrowid
 
+    def get_cached_route(self, cache_key: str) -> Optional[Dict]:
+        """Latest stored route for a cache key, or None"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute(
+                "SELECT * FROM routes WHERE cache_key = ? ORDER BY id DESC LIMIT 1", (cache_key,)
+            ).fetchone()
+            return dict(row) if row else None
+
     def get_route_history(self) -> List[Dict]:
         with sqlite3.connect(self.db_path) as conn:
             conn.row_factory = sqlite3.Row
@@ -0,0 +1,182 @@
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from src.database.db_manager import DatabaseManager
+from src.models.port_distances import get_route_planner
+from src.models.route import RoutePlan, RoutePlanner
+from src.models.view_cache import format_cache_stats
+
+logger = logging.getLogger(__name__)
+
+CALM_EPOCH = "calm"
+
+# Bucket widths for the vessel inputs of the consumption model in cache keys
+LOAD_BUCKET = 5.0  # Percent
+FUEL_PRICE_BUCKET = 10.0  # USD per ton
+
+
+def weather_epoch(codes: Optional[np.ndarray]) -> str:
+    """Identifier of a weather condition grid.
+
+    Only changes of condition category in some cell produce a new epoch, so
+    forecast updates that do not change any condition keep cached routes.
+    """
+    if codes is None or not np.any(codes):
+        return CALM_EPOCH
+    return hashlib.sha1(np.ascontiguousarray(codes, dtype=np.int8).tobytes()).hexdigest()[:16]
+
+
+def vessel_profile(vessel) -> str:
+    """Key part for the vessel inputs RoutePlanner.plan uses, rounded into buckets.
+
+    Vessels of one class whose load, hull efficiency, consumption multiplier
+    and fuel price fall in the same buckets share cached routes.
+    """
+    if vessel is None:
+        return "Generic"
+    return "%s:%g:%.2f:%.2f:%g" % (
+        type(vessel).__name__,
+        round(vessel.load_percentage / LOAD_BUCKET) * LOAD_BUCKET,
+        vessel.hull_efficiency,
+        vessel.consumption_multiplier(),
+        round(vessel.fuel_cost_per_ton / FUEL_PRICE_BUCKET) * FUEL_PRICE_BUCKET
+    )
+
+
+class RouteCache:
+    """Two-tier cache of planned routes: an in-process LRU over the SQLite routes table.
+
+    Routes are keyed by origin, destination, optimization type, vessel profile,
+    speed and weather epoch. A miss in memory falls back to the database, so
+    results computed by other sessions are reused; a miss in both plans the
+    route and stores it in both tiers. The memory tier and counters are
+    guarded by a lock, so one cache can serve every dashboard session.
+    """
+
+    def __init__(self, planner: Optional[RoutePlanner] = None, db: Optional[DatabaseManager] = None,
+                 maxsize: int = 256):
+        self.planner = planner if planner is not None else RoutePlanner()
+        self.db = db if db is not None else DatabaseManager()
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[str, RoutePlan]' = OrderedDict()
+        self._stats: Dict[str, list] = {'memory': [0, 0], 'database': [0, 0]}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(origin: str, destination: str, priority: str, profile: str, speed: float,
+            epoch: str) -> str:
+        return "|".join((origin, destination, priority, profile, f"{speed:.1f}", epoch))
+
+    def _remember(self, key: str, plan: RoutePlan) -> None:
+        with self._lock:
+            self._entries[key] = plan
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _count(self, tier: str, hit: bool) -> None:
+        with self._lock:
+            self._stats[tier][0 if hit else 1] += 1
+
+    def plan(self, origin: str, destination: str, priority: str = "Time", speed: float = 12.0,
+             weather=None, vessel=None) -> Tuple[RoutePlan, str]:
+        """Route from the cache or the planner, with the tier that answered ('memory', 'database' or 'planner')"""
+        codes = weather
+        if weather is not None and not isinstance(weather, np.ndarray):
+            codes = self.planner.graph.weather_codes(weather)
+        vessel_class = type(vessel).__name__ if vessel is not None else "Generic"
+        key = self.key(origin, destination, priority, vessel_profile(vessel), speed, weather_epoch(codes))
+
+        with self._lock:
+            plan = self._entries.get(key)
+            if plan is not None:
+                self._entries.move_to_end(key)
+        self._count('memory', plan is not None)
+        if plan is not None:
+            return plan, 'memory'
+
+        row = self.db.get_cached_route(key)
+        self._count('database', row is not None)
+        if row is not None:
+            plan = self._from_row(row)
+            self._remember(key, plan)
+            return plan, 'database'
+
+        plan = self.planner.plan(origin, destination, priority, speed, codes, vessel)
+        self._remember(key, plan)
+        try:
+            self.db.save_route(self._to_row(key, origin, destination, vessel_class, codes, plan))
+        except Exception as e:
+            logger.error(f"Error storing route {key}: {str(e)}")
+        return plan, 'planner'
+
+    @staticmethod
+    def _to_row(key: str, origin: str, destination: str, vessel_class: str, codes,
+                plan: RoutePlan) -> Dict:
+        return {
+            'origin': origin,
+            'destination': destination,
+            'distance': plan.distance,
+            'estimated_time': plan.estimated_time,
+            'fuel_consumption': plan.fuel_consumption,
+            'weather_conditions': json.dumps(plan.leg_conditions),
+            'cache_key': key,
+            'optimization_type': plan.priority,
+            'vessel_class': vessel_class,
+            'speed': plan.speed,
+            'weather_epoch': weather_epoch(codes),
+            'total_cost': plan.total_cost,
+            'weather_risk': plan.weather_risk,
+            'weather_exposure': plan.weather_exposure,
+            'waypoints': json.dumps(plan.waypoints)
+        }
+
+    @staticmethod
+    def _from_row(row: Dict) -> RoutePlan:
+        return RoutePlan(
+            waypoints=[tuple(point) for point in json.loads(row['waypoints'])],
+            distance=row['distance'],
+            estimated_time=row['estimated_time'],
+            fuel_consumption=row['fuel_consumption'],
+            total_cost=row['total_cost'],
+            weather_risk=row['weather_risk'],
+            priority=row['optimization_type'],
+            leg_conditions=json.loads(row['weather_conditions'] or '[]'),
+            speed=row['speed'],
+            weather_exposure=row['weather_exposure'] or 0.0
+        )
+
+    def clear(self) -> None:
+        """Drop the in-memory tier; stored routes stay in the database"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-tier hits, misses and hit rates, plus the overall hit rate"""
+        with self._lock:
+            counts = {tier: list(values) for tier, values in self._stats.items()}
+        stats = format_cache_stats(counts)
+        lookups = sum(counts['memory'])
+        hits = counts['memory'][0] + counts['database'][0]
+        stats['overall'] = {'hits': hits, 'misses': lookups - hits,
+                            'hit_rate': hits / lookups if lookups else 0.0}
+        return stats
+
+
+_ROUTE_CACHE: Optional[RouteCache] = None
+_ROUTE_CACHE_LOCK = threading.Lock()
+
+
+def get_route_cache() -> RouteCache:
+    """Process-wide route cache on the shared planner, kept across dashboard reruns and sessions"""
+    global _ROUTE_CACHE
+    with _ROUTE_CACHE_LOCK:
+        if _ROUTE_CACHE is None:
+            _ROUTE_CACHE = RouteCache(get_route_planner())
+        return _ROUTE_CACHE
@@ -9,7 +9,16 @@ CREATE TABLE IF NOT EXISTS routes (
     created_at TIMESTAMP NOT NULL,
     actual_time REAL,
     actual_fuel_consumption REAL,
-    status TEXT DEFAULT 'planned'
+    status TEXT DEFAULT 'planned',
+    cache_key TEXT,
+    optimization_type TEXT,
+    vessel_class TEXT,
+    speed REAL,
+    weather_epoch TEXT,
+    total_cost REAL,
+    weather_risk TEXT,
+    weather_exposure REAL,
+    waypoints TEXT
 );
 
 CREATE TABLE IF NOT EXISTS route_optimization_history (
@@ -0,0 +1,91 @@
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Daily consumption in tons at the reference speed, in calm weather at 70% load
+BASE_DAILY_CONSUMPTION = 30.0
+REFERENCE_SPEED = 12.0
+REFERENCE_LOAD = 70.0
+
+# Weather multipliers by condition name, same values as BaseVessel.WEATHER_IMPACT
+WEATHER_CONDITIONS = ('CALM', 'MODERATE', 'ROUGH', 'SEVERE')
+WEATHER_FACTORS = np.array([1.0, 1.15, 1.3, 1.5])
+
+
+def weather_factors(conditions: Iterable) -> np.ndarray:
+    """Weather multipliers for a sequence of WeatherCondition members"""
+    return WEATHER_FACTORS[[WEATHER_CONDITIONS.index(c.name) for c in conditions]]
+
+
+def daily_consumption(speed, weather_factor=1.0, load_percentage=REFERENCE_LOAD,
+                      hull_efficiency=95.0, multiplier=1.0) -> np.ndarray:
+    """Daily fuel consumption in tons; all arguments broadcast against each other"""
+    speed_factor = (np.asarray(speed, dtype=np.float64) / REFERENCE_SPEED) ** 3
+    load_factor = 1 + (np.asarray(load_percentage) - REFERENCE_LOAD) / 100 * 0.2
+    hull_factor = 100 / np.asarray(hull_efficiency)
+    return (BASE_DAILY_CONSUMPTION * speed_factor * np.asarray(weather_factor)
+            * load_factor * hull_factor * np.asarray(multiplier))
+
+
+def consumption_per_mile(speed, weather_factor=1.0, load_percentage=REFERENCE_LOAD,
+                         hull_efficiency=95.0, multiplier=1.0) -> np.ndarray:
+    """Fuel consumption per nautical mile in tons, zero for stopped vessels"""
+    speed = np.asarray(speed, dtype=np.float64)
+    daily = daily_consumption(speed, weather_factor, load_percentage, hull_efficiency, multiplier)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(speed > 0, daily / (speed * 24), 0.0)
+
+
+def consumption_grid(vessels: Sequence, speeds, conditions: Optional[Sequence] = None,
+                     loads=None, per_mile: bool = False) -> np.ndarray:
+    """Evaluate every vessel x speed x weather x load scenario in one call.
+
+    Returns an array of shape (vessels, speeds, conditions, loads). Without
+    conditions or loads, the vessels' current weather and load are used and
+    the corresponding axis has length one.
+    """
+    hull = np.array([v.hull_efficiency for v in vessels], dtype=np.float64)
+    multiplier = np.array([v.consumption_multiplier() for v in vessels], dtype=np.float64)
+
+    if conditions is None:
+        weather = weather_factors([v.current_weather for v in vessels])[:, None]
+    else:
+        weather = weather_factors(conditions)[None, :]
+    if loads is None:
+        load = np.array([v.load_percentage for v in vessels], dtype=np.float64)[:, None]
+    else:
+        load = np.asarray(loads, dtype=np.float64)[None, :]
+
+    evaluate = consumption_per_mile if per_mile else daily_consumption
+    return evaluate(
+        np.asarray(speeds, dtype=np.float64)[None, :, None, None],
+        weather[:, None, :, None],
+        load[:, None, None, :],
+        hull[:, None, None, None],
+        multiplier[:, None, None, None]
+    )
+
+
+def what_if_table(vessels: Sequence, speeds, conditions: Sequence, loads) -> pd.DataFrame:
+    """Long-format fleet table of daily and per-mile consumption for all scenarios"""
+    speeds = np.asarray(speeds, dtype=np.float64)
+    loads = np.asarray(loads, dtype=np.float64)
+    daily = consumption_grid(vessels, speeds, conditions, loads)
+    shape = daily.shape
+
+    vessel_idx, speed_idx, weather_idx, load_idx = np.indices(shape).reshape(4, -1)
+    speed = speeds[speed_idx]
+    daily = daily.ravel()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        per_mile = np.where(speed > 0, daily / (speed * 24), 0.0)
+
+    return pd.DataFrame({
+        'vessel': np.array([v.name for v in vessels], dtype=object)[vessel_idx],
+        'speed': speed,
+        'weather': np.array([c.value for c in conditions], dtype=object)[weather_idx],
+        'load_percentage': loads[load_idx],
+        'daily_consumption': daily,
+        'consumption_per_mile': per_mile
+    })
+
@@ -0,0 +1,167 @@
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .port_registry import PortCostsView
+from .voyage_history import voyage_columns
+
+PORT_DELAY_HOURLY_COST = 500.0  # USD per hour waiting in port
+SCHEDULE_DELAY_HOURLY_COST = 750.0  # Higher rate for overall delay
+COST_COLUMNS = ('fuel_cost', 'port_costs', 'port_delay_costs', 'schedule_deviation_costs', 'total_cost',
+                'cost_per_mile')
+
+
+def _port_fees(port_costs, ports: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Docking fee, daily rate and has-tariff flag for every entry of an array of port names.
+
+    Each distinct port is looked up once and the result is spread back with
+    the ``np.unique`` inverse index.
+    """
+    if not len(ports):
+        empty = np.zeros(0)
+        return empty, empty, np.zeros(0, dtype=bool)
+    names, inverse = np.unique(ports, return_inverse=True)
+    if isinstance(port_costs, PortCostsView):
+        # Registry tariffs, read as whole columns
+        registry = port_costs.registry
+        ids = registry.ids(names)
+        known = ids >= 0
+        docking = np.where(known, registry.docking[ids], 0.0)
+        daily_rate = np.where(known, registry.daily_rate[ids], 0.0)
+    else:
+        known = np.array([name in port_costs for name in names], dtype=bool)
+        docking = np.array([port_costs[name]["docking"] if ok else 0.0 for name, ok in zip(names, known)])
+        daily_rate = np.array([port_costs[name]["daily_rate"] if ok else 0.0 for name, ok in zip(names, known)])
+    return docking[inverse], daily_rate[inverse], known[inverse]
+
+
+def costs_from_columns(columns: Dict[str, np.ndarray], fuel_price: float,
+                       port_costs: Dict[str, Dict[str, float]]) -> Dict[str, np.ndarray]:
+    """Cost columns for one vessel's voyage_columns, one entry per voyage.
+
+    Port visits are priced as arrays and summed back per voyage with
+    ``np.bincount``.
+    """
+    n = len(columns['fuel'])
+    docking, daily_rate, known = _port_fees(port_costs, columns['visit_port'])
+    visit_voyage = columns['visit_voyage'][known]
+    wait = columns['visit_wait'][known]
+
+    port_costs_total = np.bincount(visit_voyage, weights=docking[known] + daily_rate[known] * wait / 24,
+                                   minlength=n)
+    port_delay_costs = np.bincount(visit_voyage, weights=wait * PORT_DELAY_HOURLY_COST, minlength=n)
+
+    # Schedule deviation if the voyage arrived after its planned end
+    arrival = columns['arrival']
+    late_hours = (arrival - columns['end']).astype(np.float64) / 3.6e9  # Microseconds to hours
+    late_hours = np.where(np.isnat(arrival) | (late_hours <= 0), 0.0, late_hours)
+    schedule_deviation_costs = late_hours * SCHEDULE_DELAY_HOURLY_COST
+
+    fuel_cost = columns['fuel'] * fuel_price
+    total_cost = fuel_cost + port_costs_total + port_delay_costs + schedule_deviation_costs
+    distance = columns['distance']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cost_per_mile = np.where(distance > 0, total_cost / distance, 0.0)
+
+    return {
+        'fuel_cost': fuel_cost,
+        'port_costs': port_costs_total,
+        'port_delay_costs': port_delay_costs,
+        'schedule_deviation_costs': schedule_deviation_costs,
+        'total_cost': total_cost,
+        'cost_per_mile': cost_per_mile
+    }
+
+
+def compute_voyage_costs(pairs: Sequence[Tuple[object, object]]) -> Dict[str, np.ndarray]:
+    """Cost columns for arbitrary (vessel, voyage) pairs, one entry per pair"""
+    groups: Dict[int, Tuple[object, List[int]]] = {}
+    for i, (vessel, _) in enumerate(pairs):
+        groups.setdefault(id(vessel), (vessel, []))[1].append(i)
+
+    result = {column: np.zeros(len(pairs)) for column in COST_COLUMNS}
+    for vessel, rows in groups.values():
+        columns = voyage_columns([pairs[i][1] for i in rows])
+        for column, values in costs_from_columns(columns, vessel.fuel_cost_per_ton, vessel.port_costs).items():
+            result[column][rows] = values
+    return result
+
+
+def fleet_voyage_costs(vessels: Iterable) -> Dict[str, np.ndarray]:
+    """Cost columns for every voyage of every vessel, in voyage history order.
+
+    Uses the columns each VoyageHistory keeps, so no voyage objects are
+    walked unless a history changed since the last call.
+    """
+    parts = [costs_from_columns(vessel.voyage_history.columns(), vessel.fuel_cost_per_ton, vessel.port_costs)
+             for vessel in vessels]
+    return {column: np.concatenate([part[column] for part in parts]) if parts else np.zeros(0)
+            for column in COST_COLUMNS}
+
+
+def planned_distances(voyages: Sequence, distances) -> np.ndarray:
+    """Sea distance of each voyage's port sequence from a PortDistanceMatrix, NaN for unknown ports"""
+    leg_voyage: List[int] = []
+    leg_from: List[str] = []
+    leg_to: List[str] = []
+    for i, voyage in enumerate(voyages):
+        ports = [voyage.origin] + voyage.intermediate_stops + [voyage.destination]
+        leg_voyage.extend([i] * (len(ports) - 1))
+        leg_from.extend(ports[:-1])
+        leg_to.extend(ports[1:])
+    legs = distances.lookup(leg_from, leg_to)
+    return np.bincount(np.asarray(leg_voyage, dtype=np.intp), weights=legs, minlength=len(voyages))
+
+
+def voyage_cost_table(vessels: Iterable, distances=None) -> pd.DataFrame:
+    """Fleet-wide table with one row per voyage and the computed cost columns.
+
+    With a PortDistanceMatrix, ``planned_distance`` (sea distance between the
+    voyage's ports) and ``route_efficiency`` (planned over sailed) are added.
+    """
+    vessels = list(vessels)
+    pairs = [(vessel, voyage) for vessel in vessels for voyage in vessel.voyage_history]
+    voyages = [voyage for _, voyage in pairs]
+
+    table = pd.DataFrame({
+        'vessel': [vessel.name for vessel, _ in pairs],
+        'voyage_id': [v.voyage_id for v in voyages],
+        'start_date': pd.to_datetime([v.start_date for v in voyages]),
+        'origin': [v.origin for v in voyages],
+        'destination': [v.destination for v in voyages],
+        'distance': np.array([v.distance for v in voyages], dtype=np.float64),
+        'recorded_cost': np.array([v.total_cost for v in voyages], dtype=np.float64),
+        'on_time': [bool(v.actual_arrival_time and v.actual_arrival_time <= v.end_date)
+                    for v in voyages]
+    })
+    for column, values in fleet_voyage_costs(vessels).items():
+        table[column] = values
+    if distances is not None:
+        table['planned_distance'] = planned_distances(voyages, distances)
+        table['route_efficiency'] = (table['planned_distance'] / table['distance']).where(
+            table['distance'] > 0)
+    return table
+
+
+def monthly_cost_summary(table: pd.DataFrame) -> pd.DataFrame:
+    """Per-month voyage count, cost per mile, on-time rate and average delay cost"""
+    grouped = table.assign(
+        month=table['start_date'].dt.strftime('%Y-%m'),
+        delay_cost=table['port_delay_costs'] + table['schedule_deviation_costs']
+    ).groupby('month', sort=True)
+
+    summary = grouped.agg(
+        total_voyages=('voyage_id', 'size'),
+        recorded_cost=('recorded_cost', 'sum'),
+        distance=('distance', 'sum'),
+        on_time_rate=('on_time', 'mean'),
+        avg_delay_cost=('delay_cost', 'mean')
+    )
+    summary['cost_per_mile'] = (summary['recorded_cost'] / summary['distance']).where(
+        summary['distance'] > 0, 0.0)
+    summary['on_time_rate'] *= 100
+    if 'planned_distance' in table:
+        planned = grouped['planned_distance'].sum()
+        summary['route_efficiency'] = (planned / summary['distance']).where(summary['distance'] > 0)
+    return summary
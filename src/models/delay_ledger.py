@@ -0,0 +1,185 @@
+import time
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Type
+
+import numpy as np
+
+DELAY_DTYPE = np.dtype([
+    ('timestamp', np.float64),  # epoch seconds
+    ('duration', np.float64),  # seconds
+    ('reason', np.int32),
+    ('cost', np.float64),
+    ('weather', np.int8),
+])
+
+WEATHER_CONDITIONS = ('CALM', 'MODERATE', 'ROUGH', 'SEVERE')
+SECONDS_PER_DAY = 86400
+
+
+class ReasonCodes:
+    """Process-wide interning of delay reasons to small integer codes"""
+
+    def __init__(self):
+        self.names: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def code(self, reason: str) -> int:
+        code = self._codes.get(reason)
+        if code is None:
+            code = self._codes[reason] = len(self.names)
+            self.names.append(reason)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+REASONS = ReasonCodes()
+
+
+def _epoch(point) -> float:
+    return point.timestamp() if isinstance(point, datetime) else float(point)
+
+
+class DelayLedger:
+    """Append-only delay ledger with bounded memory and running aggregates.
+
+    The latest ``detail_size`` delays are kept as a structured ring array.
+    Costs and durations are also accumulated into per-day, per-reason buckets
+    covering the last ``days`` days, and into lifetime totals per reason and
+    per weather condition. Memory stays flat however many delays accumulate.
+
+    Weather is stored by condition name; with ``conditions`` (an Enum with
+    those member names) ``entries`` reports it as that enum's members. The
+    detail ring and the daily buckets are allocated by the first ``add``, so
+    vessels that never record a delay hold no storage for them.
+    """
+
+    def __init__(self, detail_size: int = 1000, days: int = 400, reasons: ReasonCodes = REASONS,
+                 conditions: Optional[Type[Enum]] = None):
+        self.reasons = reasons
+        self.conditions = conditions
+        self.detail_size = detail_size
+        self.detail = np.zeros(0, dtype=DELAY_DTYPE)
+        self._head = 0
+        self.count = 0  # Lifetime number of delays
+
+        # Daily buckets, row = day % days, with the day each row currently holds
+        self.days = days
+        self.bucket_day = np.full(0, -1, dtype=np.int64)
+        self.bucket_cost = np.zeros((0, 0))
+        self.bucket_duration = np.zeros((0, 0))
+
+        # Lifetime totals
+        self.reason_cost = np.zeros(0)
+        self.reason_duration = np.zeros(0)
+        self.reason_count = np.zeros(0, dtype=np.int64)
+        self.weather_cost = np.zeros(len(WEATHER_CONDITIONS))
+        self.weather_duration = np.zeros(len(WEATHER_CONDITIONS))
+        self.total_cost = 0.0
+        self.total_duration = timedelta(0)
+
+    def _allocate(self) -> None:
+        """Full-size detail ring and daily buckets, made on the first delay"""
+        self.detail = np.zeros(self.detail_size, dtype=DELAY_DTYPE)
+        self.bucket_day = np.full(self.days, -1, dtype=np.int64)
+        self.bucket_cost = np.zeros((self.days, len(self.reason_cost)))
+        self.bucket_duration = np.zeros((self.days, len(self.reason_cost)))
+
+    def _ensure_reasons(self, size: int) -> None:
+        """Widen the per-reason columns to cover newly interned reasons"""
+        extra = size - len(self.reason_cost)
+        if extra <= 0:
+            return
+        self.bucket_cost = np.pad(self.bucket_cost, ((0, 0), (0, extra)))
+        self.bucket_duration = np.pad(self.bucket_duration, ((0, 0), (0, extra)))
+        self.reason_cost = np.pad(self.reason_cost, (0, extra))
+        self.reason_duration = np.pad(self.reason_duration, (0, extra))
+        self.reason_count = np.pad(self.reason_count, (0, extra))
+
+    def add(self, duration: timedelta, reason: str, cost: float, weather=None,
+            timestamp: Optional[datetime] = None) -> None:
+        """Record a delay event and update all aggregates"""
+        ts = time.time() if timestamp is None else _epoch(timestamp)
+        seconds = duration.total_seconds()
+        code = self.reasons.code(reason)
+        weather_code = WEATHER_CONDITIONS.index(weather.name) if weather is not None else 0
+        if not len(self.detail):
+            self._allocate()
+        self._ensure_reasons(len(self.reasons))
+
+        self.detail[self._head] = (ts, seconds, code, cost, weather_code)
+        self._head = (self._head + 1) % len(self.detail)
+        self.count += 1
+
+        day = int(ts // SECONDS_PER_DAY)
+        row = day % self.days
+        if self.bucket_day[row] < day:
+            # Recycle the bucket of a day that fell out of the window
+            self.bucket_day[row] = day
+            self.bucket_cost[row] = 0.0
+            self.bucket_duration[row] = 0.0
+        if self.bucket_day[row] == day:  # Delays older than the window only count in totals
+            self.bucket_cost[row, code] += cost
+            self.bucket_duration[row, code] += seconds
+
+        self.reason_cost[code] += cost
+        self.reason_duration[code] += seconds
+        self.reason_count[code] += 1
+        self.weather_cost[weather_code] += cost
+        self.weather_duration[weather_code] += seconds
+        self.total_cost += cost
+        self.total_duration += duration
+
+    def __len__(self) -> int:
+        return min(self.count, len(self.detail))
+
+    def recent(self) -> np.ndarray:
+        """Retained delay records, oldest first"""
+        if self.count <= len(self.detail):
+            return self.detail[:self.count].copy()
+        return np.concatenate((self.detail[self._head:], self.detail[:self._head]))
+
+    def entries(self) -> List[Dict]:
+        """Retained delays in the old delay_history dict format"""
+        weather = [self.conditions[name] for name in WEATHER_CONDITIONS] if self.conditions else WEATHER_CONDITIONS
+        return [
+            {
+                'timestamp': datetime.fromtimestamp(record['timestamp']),
+                'duration': timedelta(seconds=float(record['duration'])),
+                'reason': self.reasons.names[record['reason']],
+                'cost': float(record['cost']),
+                'weather': weather[record['weather']]
+            } for record in self.recent()
+        ]
+
+    def _window_rows(self, since, until=None) -> np.ndarray:
+        """Bucket rows holding days within [since, until]"""
+        first = int(_epoch(since) // SECONDS_PER_DAY)
+        last = int(_epoch(until) // SECONDS_PER_DAY) if until is not None else np.iinfo(np.int64).max
+        return (self.bucket_day >= first) & (self.bucket_day <= last)
+
+    def cost_by_reason_array(self, since=None, until=None) -> np.ndarray:
+        """Cost per reason code, lifetime or over whole days in a window"""
+        if since is None and until is None:
+            return self.reason_cost
+        rows = self._window_rows(since if since is not None else 0, until)
+        return self.bucket_cost[rows].sum(axis=0)
+
+    def cost_by_reason(self, since=None, until=None) -> Dict[str, float]:
+        costs = self.cost_by_reason_array(since, until)
+        return {self.reasons.names[code]: float(costs[code]) for code in np.flatnonzero(costs)}
+
+    def cost_by_weather(self) -> Dict[str, float]:
+        return dict(zip(WEATHER_CONDITIONS, self.weather_cost.tolist()))
+
+
+def fleet_delay_costs(ledgers: Iterable[DelayLedger], since=None, until=None,
+                      reasons: ReasonCodes = REASONS) -> Dict[str, float]:
+    """Delay cost by reason summed over a fleet of ledgers sharing reason codes"""
+    total = np.zeros(len(reasons))
+    for ledger in ledgers:
+        costs = ledger.cost_by_reason_array(since, until)
+        total[:len(costs)] += costs
+    return {reasons.names[code]: float(total[code]) for code in np.flatnonzero(total)}
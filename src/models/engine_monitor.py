@@ -0,0 +1,184 @@
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .fleet_state import FleetState
+
+# Display names, in FleetState.ENGINE_PARAMETERS column order
+PARAMETER_NAMES = ('RPM', 'Engine Load', 'Fuel Pressure', 'Temperature')
+SEVERITIES = ('medium', 'high')
+
+# One row per out-of-range engine value
+ALERT_DTYPE = np.dtype([
+    ('vessel', np.int64),  # Fleet slot
+    ('parameter', np.int8),  # Index into PARAMETER_NAMES
+    ('value', np.float64),
+    ('severity', np.int8)  # Index into SEVERITIES
+])
+
+
+def evaluate_engine_alerts(fleet: FleetState, slots: Optional[Sequence[int]] = None) -> np.ndarray:
+    """Check the current engine values of many vessels against their normal ranges.
+
+    All comparisons run as NumPy operations over the fleet columns in one
+    pass; the result is a compact ALERT_DTYPE table ordered by vessel and
+    parameter.
+    """
+    if slots is None and fleet.active[:fleet.size].all():
+        # Whole fleet: slice views instead of fancy-indexed copies
+        index = slice(0, fleet.size)
+        slots = np.arange(fleet.size)
+    else:
+        index = slots = fleet.resolve_slots(slots)
+
+    values = fleet.engine[index]
+    low = fleet.engine_limits[index, :, 0]
+    high = fleet.engine_limits[index, :, 1]
+
+    rows, parameters = np.nonzero((values < low) | (values > high))
+    value = values[rows, parameters]
+    row_low = low[rows, parameters]
+    row_high = high[rows, parameters]
+
+    # Per-parameter severity rules, evaluated for the alert rows only
+    is_high = np.select(
+        [parameters == 0, parameters == 1, parameters == 2],
+        [
+            np.abs(value - (row_low + row_high) / 2) > 15,  # RPM far from midpoint
+            value > 90,  # Engine overload
+            True  # Any fuel pressure deviation
+        ],
+        default=value > row_high + 10  # Overheating
+    )
+
+    alerts = np.empty(len(rows), dtype=ALERT_DTYPE)
+    alerts['vessel'] = slots[rows]
+    alerts['parameter'] = parameters
+    alerts['value'] = value
+    alerts['severity'] = is_high
+    return alerts
+
+
+def format_alerts(fleet: FleetState, alerts: np.ndarray) -> List[Dict]:
+    """Expand alert table rows into the dicts used by the dashboard"""
+    return [
+        {
+            'parameter': PARAMETER_NAMES[parameter],
+            'value': float(value),
+            'normal_range': tuple(fleet.engine_limits[vessel, parameter].tolist()),
+            'severity': SEVERITIES[severity]
+        }
+        for vessel, parameter, value, severity in alerts.tolist()
+    ]
+
+
+class StreamingAnomalyDetector:
+    """Constant-time, constant-memory anomaly detector for engine readings.
+
+    Per parameter it keeps an exponentially weighted mean and variance (fast
+    baseline) and running sums over a fixed window of samples (slow baseline).
+    A sample far from the EWMA mean, in EWMA standard deviations, is a spike.
+    An EWMA mean that has moved away from the rolling window mean, in units of
+    its expected noise, is a drift, which catches gradual degradation.
+    """
+
+    def __init__(self, parameters: Sequence[str] = FleetState.ENGINE_PARAMETERS,
+                 alpha: float = 0.1, window: int = 100, spike_threshold: float = 4.0,
+                 drift_threshold: float = 4.0, warmup: int = 10):
+        if not 0 < alpha < 1:
+            raise ValueError("alpha must be between 0 and 1")
+        if window < 2:
+            raise ValueError("window must hold at least 2 samples")
+
+        self.parameters = tuple(parameters)
+        self.alpha = alpha
+        self.window = window
+        self.spike_threshold = spike_threshold
+        self.drift_threshold = drift_threshold
+        self.warmup = max(2, warmup)
+
+        size = len(self.parameters)
+        self.mean = np.zeros(size)
+        self.var = np.zeros(size)
+        self._samples = np.zeros((window, size))
+        self._sum = np.zeros(size)
+        self._sum_sq = np.zeros(size)
+        self._head = 0
+        self.count = 0
+
+        # Standard deviation of an EWMA of white noise, relative to the noise
+        self._ewma_noise = np.sqrt(alpha / (2 - alpha))
+        self.last_report = self._report(None, None, None)
+
+    def update(self, values: Sequence[float]) -> Dict:
+        """Feed one sample (in parameter order) and return the anomaly report"""
+        x = np.asarray(values, dtype=np.float64)
+
+        # Spike score against the state before this sample
+        spike_z = None
+        if self.count >= self.warmup:
+            spike_z = self._safe_ratio(x - self.mean, np.sqrt(self.var))
+
+        # Incremental EWMA mean and variance
+        if self.count == 0:
+            self.mean[:] = x
+        else:
+            diff = x - self.mean
+            increment = self.alpha * diff
+            self.mean += increment
+            self.var = (1 - self.alpha) * (self.var + diff * increment)
+
+        # Rolling window sums, evicting the oldest sample once full
+        if self.count >= self.window:
+            oldest = self._samples[self._head]
+            self._sum -= oldest
+            self._sum_sq -= oldest * oldest
+        self._samples[self._head] = x
+        self._sum += x
+        self._sum_sq += x * x
+        self._head = (self._head + 1) % self.window
+        self.count += 1
+
+        n = min(self.count, self.window)
+        rolling_mean = self._sum / n
+        rolling_std = np.sqrt(np.maximum(self._sum_sq / n - rolling_mean ** 2, 0.0))
+
+        drift_z = None
+        if self.count >= self.warmup:
+            drift_z = self._safe_ratio(self.mean - rolling_mean, rolling_std * self._ewma_noise)
+
+        self.last_report = self._report(spike_z, drift_z, rolling_mean)
+        return self.last_report
+
+    @staticmethod
+    def _safe_ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+        return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 1e-9)
+
+    def _report(self, spike_z: Optional[np.ndarray], drift_z: Optional[np.ndarray],
+                rolling_mean: Optional[np.ndarray]) -> Dict:
+        """Build the anomaly report for the latest sample"""
+        anomalies = []
+        contributing_factors = {}
+
+        for kind, scores, threshold in (('spike', spike_z, self.spike_threshold),
+                                        ('drift', drift_z, self.drift_threshold)):
+            if scores is None or np.abs(scores).max() < threshold:
+                continue
+            for i in np.flatnonzero(np.abs(scores) >= threshold):
+                name = self.parameters[i]
+                anomalies.append({'parameter': name, 'type': kind, 'score': float(scores[i])})
+                # Deviation of the latest level from the rolling baseline, in percent
+                level = self._samples[self._head - 1, i] if kind == 'spike' else self.mean[i]
+                if rolling_mean[i]:
+                    deviation = (level - rolling_mean[i]) / abs(rolling_mean[i]) * 100
+                    if abs(deviation) > abs(contributing_factors.get(name, 0.0)):
+                        contributing_factors[name] = float(deviation)
+
+        kinds = sorted({anomaly['type'] for anomaly in anomalies})
+        return {
+            'has_anomaly': bool(anomalies),
+            'anomaly_type': '+'.join(kinds) if kinds else None,
+            'anomalies': anomalies,
+            'contributing_factors': contributing_factors,
+            'samples': self.count
+        }
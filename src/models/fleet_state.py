@@ -0,0 +1,270 @@
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class HistoryRing:
+    """Per-slot ring buffers holding the recent history of a fleet field.
+
+    Samples are stored in chunks of ``chunk_length`` rows taken from one
+    shared ``pool``; ``chunks[slot, i]`` is the pool row holding samples
+    ``i * chunk_length`` onwards of that slot's ring, or -1 while unused. A
+    slot is given its next chunk only when its own ring reaches it, so a
+    vessel with a long track costs memory for that track alone. ``head`` is
+    the next write position and ``count`` the number of valid samples.
+    Appends for any set of slots are a single vectorized assignment. A reset
+    slot keeps its chunks for the next history.
+    """
+
+    def __init__(self, capacity: int, length: int, shape: Tuple[int, ...] = (),
+                 dtype=np.float32, chunk_length: Optional[int] = None):
+        self.length = length
+        self.shape = shape
+        self.chunk_length = length if chunk_length is None else max(1, min(chunk_length, length))
+        self.chunks = np.full((capacity, -(-length // self.chunk_length)), -1, dtype=np.int64)
+        self.pool = np.zeros((0, self.chunk_length) + shape, dtype=dtype)
+        self.used = 0  # Pool rows handed out
+        self.head = np.zeros(capacity, dtype=np.int64)
+        self.count = np.zeros(capacity, dtype=np.int64)
+
+    def allocated(self, slots=slice(None)) -> np.ndarray:
+        """Samples allocated to each of the given slots"""
+        return np.minimum((self.chunks[slots] >= 0).sum(axis=-1) * self.chunk_length, self.length)
+
+    def grow(self, capacity: int) -> None:
+        """Reallocate for a larger number of slots, keeping existing rows"""
+        old = len(self.head)
+        self.chunks = np.concatenate((self.chunks, np.full((capacity - old, self.chunks.shape[1]), -1,
+                                                           dtype=np.int64)))
+        self.head = np.concatenate((self.head, np.zeros(capacity - old, dtype=np.int64)))
+        self.count = np.concatenate((self.count, np.zeros(capacity - old, dtype=np.int64)))
+
+    def _take(self, count: int) -> np.ndarray:
+        """Hand out count unused pool rows, doubling the pool when it runs out"""
+        needed = self.used + count
+        if needed > len(self.pool):
+            pool = np.zeros((max(needed, 2 * len(self.pool)),) + self.pool.shape[1:], dtype=self.pool.dtype)
+            pool[:self.used] = self.pool[:self.used]
+            self.pool = pool
+        rows = np.arange(self.used, needed)
+        self.used = needed
+        return rows
+
+    def append(self, slots: np.ndarray, values: np.ndarray) -> None:
+        """Append one sample to each of the given (unique) slots"""
+        head = self.head[slots]
+        index, offset = np.divmod(head, self.chunk_length)
+        rows = self.chunks[slots, index]
+        missing = rows < 0
+        if missing.any():
+            rows[missing] = self._take(int(missing.sum()))
+            self.chunks[slots[missing], index[missing]] = rows[missing]
+        self.pool[rows, offset] = values
+        self.head[slots] = (head + 1) % self.length
+        self.count[slots] = np.minimum(self.count[slots] + 1, self.length)
+
+    def reset(self, slots) -> None:
+        """Drop the history of the given slots"""
+        self.head[slots] = 0
+        self.count[slots] = 0
+
+    def window(self, slots) -> np.ndarray:
+        """Ring cells of many slots as one dense (slots, depth) + shape array.
+
+        ``depth`` covers the most allocated slot, and is ``length`` once any
+        ring is full; cells of unallocated chunks are zero.
+        """
+        slots = np.asarray(slots, dtype=np.intp)
+        used_chunks = int((self.chunks[slots] >= 0).sum(axis=1).max(initial=0))
+        if not used_chunks:
+            return np.zeros((len(slots), 0) + self.shape, dtype=self.pool.dtype)
+        rows = self.chunks[slots, :used_chunks]
+        data = self.pool[np.maximum(rows, 0)]
+        data[rows < 0] = 0
+        data = data.reshape((len(slots), used_chunks * self.chunk_length) + self.shape)
+        return data[:, :self.length]
+
+    def get(self, slot: int) -> np.ndarray:
+        """Get the history of one slot, oldest first, as a new array"""
+        count = self.count[slot]
+        rows = self.chunks[slot]
+        data = self.pool[rows[rows >= 0]].reshape((-1,) + self.shape)
+        if count < self.length:
+            return data[:count]
+        head = self.head[slot]
+        return np.concatenate((data[head:self.length], data[:head]))
+
+
+class FleetState:
+    """Struct-of-arrays store for the kinematics and engine state of a whole fleet.
+
+    Every vessel owns one slot (row index). Positions, speeds, headings, fuel
+    levels and engine values live in parallel NumPy arrays, so fleet-wide updates, filters
+    and sorts are single vectorized operations. Vessel objects are thin views
+    over their row.
+    """
+
+    FIELDS = ('lat', 'lon', 'speed', 'max_speed', 'heading', 'fuel_level')
+
+    # Engine columns and their default normal (low, high) ranges
+    ENGINE_PARAMETERS = ('rpm', 'load', 'pressure', 'temp')
+    DEFAULT_ENGINE_LIMITS = ((70, 90), (60, 85), (7.5, 8.5), (75, 85))
+
+    # Track retention, e.g. several days of per-minute positions, allocated per vessel in chunks
+    TRACK_SIZE = 10_000
+    TRACK_CHUNK_SIZE = 64
+
+    def __init__(self, capacity: int = 64, history_size: int = 100,
+                 track_size: int = TRACK_SIZE):
+        capacity = max(1, capacity)
+        self.history_size = history_size
+        self.track_size = track_size
+        self.size = 0  # High-water mark of allocated slots
+        self._free: List[int] = []
+
+        for name in self.FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype=np.float64))
+        self.active = np.zeros(capacity, dtype=bool)
+        # Bumped on every write to a row, used to invalidate cached vessel views
+        self.version = np.zeros(capacity, dtype=np.uint64)
+
+        # Current engine values and normal ranges, one row per slot
+        self.engine = np.zeros((capacity, len(self.ENGINE_PARAMETERS)), dtype=np.float64)
+        self.engine_limits = np.zeros((capacity, len(self.ENGINE_PARAMETERS), 2), dtype=np.float64)
+
+        self.track = HistoryRing(capacity, track_size, shape=(2,),
+                                 chunk_length=self.TRACK_CHUNK_SIZE)
+        self.speed_history = HistoryRing(capacity, history_size)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.active)
+
+    def __len__(self) -> int:
+        return self.size - len(self._free)
+
+    def _grow(self, capacity: int) -> None:
+        """Reallocate all columns for at least the given number of slots"""
+        old = self.capacity
+        for name in self.FIELDS:
+            column = np.zeros(capacity, dtype=np.float64)
+            column[:old] = getattr(self, name)
+            setattr(self, name, column)
+        active = np.zeros(capacity, dtype=bool)
+        active[:old] = self.active
+        self.active = active
+        version = np.zeros(capacity, dtype=np.uint64)
+        version[:old] = self.version
+        self.version = version
+
+        engine = np.zeros((capacity,) + self.engine.shape[1:], dtype=np.float64)
+        engine[:old] = self.engine
+        self.engine = engine
+        engine_limits = np.zeros((capacity,) + self.engine_limits.shape[1:], dtype=np.float64)
+        engine_limits[:old] = self.engine_limits
+        self.engine_limits = engine_limits
+
+        self.track.grow(capacity)
+        self.speed_history.grow(capacity)
+
+    def add(self, lat: float, lon: float, speed: float = 12.0, max_speed: float = 20.0,
+            heading: float = 0.0, fuel_level: float = 0.0) -> int:
+        """Allocate a slot for a new vessel and return its index"""
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self.size == self.capacity:
+                self._grow(2 * self.capacity)  # Amortized O(1) growth
+            slot = self.size
+            self.size += 1
+
+        self.lat[slot] = lat
+        self.lon[slot] = lon
+        self.speed[slot] = speed
+        self.max_speed[slot] = max_speed
+        self.heading[slot] = heading
+        self.fuel_level[slot] = fuel_level
+        self.engine[slot] = 0.0
+        self.engine_limits[slot] = self.DEFAULT_ENGINE_LIMITS
+        self.active[slot] = True
+        self.version[slot] += 1
+        self.track.reset(slot)
+        self.speed_history.reset(slot)
+        return slot
+
+    def add_many(self, lat: np.ndarray, lon: np.ndarray, speed=12.0, max_speed=20.0,
+                 heading=0.0, fuel_level=0.0) -> np.ndarray:
+        """Allocate slots for many new vessels at once (after the high-water mark)"""
+        count = len(lat)
+        start = self.size
+        if start + count > self.capacity:
+            self._grow(max(2 * self.capacity, start + count))
+        slots = np.arange(start, start + count)
+        self.size += count
+
+        self.lat[slots] = lat
+        self.lon[slots] = lon
+        self.speed[slots] = speed
+        self.max_speed[slots] = max_speed
+        self.heading[slots] = heading
+        self.fuel_level[slots] = fuel_level
+        self.engine[slots] = 0.0
+        self.engine_limits[slots] = self.DEFAULT_ENGINE_LIMITS
+        self.active[slots] = True
+        self.version[slots] += 1
+        self.track.reset(slots)
+        self.speed_history.reset(slots)
+        return slots
+
+    def remove(self, slot: int) -> None:
+        """Release a slot so it can be reused by a new vessel"""
+        if not self.active[slot]:
+            return
+        self.active[slot] = False
+        self._free.append(slot)
+
+    @property
+    def slots(self) -> np.ndarray:
+        """Indices of all active slots"""
+        return np.flatnonzero(self.active[:self.size])
+
+    def resolve_slots(self, slots: Optional[Sequence[int]] = None) -> np.ndarray:
+        """Normalize a slot selection, None meaning all active slots"""
+        return self.slots if slots is None else np.asarray(slots, dtype=np.intp)
+
+    def touch(self, slots) -> None:
+        """Mark rows as modified after writing to the columns directly"""
+        self.version[slots] += 1
+
+    def move(self, slots: Optional[Sequence[int]], lat: np.ndarray, lon: np.ndarray,
+             record: bool = True) -> None:
+        """Set new positions for the given slots and append them to the tracks"""
+        slots = self.resolve_slots(slots)
+        self.version[slots] += 1
+        self.lat[slots] = lat
+        self.lon[slots] = lon
+        if record:
+            self.track.append(slots, np.column_stack((self.lat[slots], self.lon[slots])))
+
+    def set_speed(self, slots: Optional[Sequence[int]], speed: np.ndarray,
+                  record: bool = True) -> None:
+        """Set new speeds for the given slots and append them to the speed history"""
+        slots = self.resolve_slots(slots)
+        self.version[slots] += 1
+        self.speed[slots] = speed
+        if record:
+            self.speed_history.append(slots, self.speed[slots])
+
+    def filter(self, mask: np.ndarray, slots: Optional[Sequence[int]] = None) -> np.ndarray:
+        """Return the slots for which a boolean mask over the fleet columns holds"""
+        slots = self.resolve_slots(slots)
+        return slots[np.asarray(mask)[slots]]
+
+    def sort(self, field: str, slots: Optional[Sequence[int]] = None,
+             descending: bool = False) -> np.ndarray:
+        """Return slots ordered by one of the fleet columns"""
+        slots = self.resolve_slots(slots)
+        order = np.argsort(getattr(self, field)[slots], kind='stable')
+        if descending:
+            order = order[::-1]
+        return slots[order]
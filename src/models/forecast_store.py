@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List, Union
+
+import numpy as np
+
+TimePoint = Union[datetime, float, None]
+
+
+class ForecastStore:
+    """Timestamp-sorted weather forecasts with binary-search window queries.
+
+    Forecast times are kept as epoch seconds in a NumPy array next to the
+    forecast objects, so time windows resolve with ``searchsorted``. The delay
+    contribution of every forecast is accumulated into a prefix sum, which
+    makes the weather delay of any window O(log n).
+    """
+
+    # Condition codes by enum member name, shared by both WeatherCondition enums
+    CONDITIONS = ('CALM', 'MODERATE', 'ROUGH', 'SEVERE')
+    ALERT_CODE = CONDITIONS.index('ROUGH')
+    DELAY_MINUTES = np.array([0, 0, 30, 60], dtype=np.int64)
+
+    def __init__(self, forecasts: Iterable = ()):
+        self._forecasts: List = []
+        self.times = np.empty(0, dtype=np.float64)
+        self.codes = np.empty(0, dtype=np.int8)
+        self._delay_prefix = np.zeros(1, dtype=np.int64)
+        self.extend(forecasts)
+
+    def extend(self, forecasts: Iterable) -> None:
+        """Add forecasts and rebuild the sorted index"""
+        forecasts = self._forecasts + list(forecasts)
+        times = np.array([f.timestamp.timestamp() for f in forecasts], dtype=np.float64)
+        order = np.argsort(times, kind='stable')
+
+        self._forecasts = [forecasts[i] for i in order]
+        self.times = times[order]
+        self.codes = np.array([self.CONDITIONS.index(f.condition.name) for f in self._forecasts],
+                              dtype=np.int8)
+        self._delay_prefix = np.concatenate(([0], np.cumsum(self.DELAY_MINUTES[self.codes])))
+
+    def __len__(self) -> int:
+        return len(self._forecasts)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._forecasts)
+
+    def __getitem__(self, index):
+        return self._forecasts[index]
+
+    @staticmethod
+    def _epoch(point: TimePoint, default: float) -> float:
+        if point is None:
+            return default
+        if isinstance(point, datetime):
+            return point.timestamp()
+        return float(point)
+
+    def _bounds(self, start: TimePoint, end: TimePoint):
+        """Index range of forecasts with start <= timestamp <= end"""
+        lo = np.searchsorted(self.times, self._epoch(start, -np.inf), side='left')
+        hi = np.searchsorted(self.times, self._epoch(end, np.inf), side='right')
+        return int(lo), int(max(lo, hi))
+
+    def window(self, start: TimePoint = None, end: TimePoint = None) -> List:
+        """Forecasts between start and end (inclusive), None meaning unbounded"""
+        lo, hi = self._bounds(start, end)
+        return self._forecasts[lo:hi]
+
+    def until(self, end: TimePoint) -> List:
+        """Forecasts up to (and including) the given time, e.g. the ETA"""
+        return self.window(None, end)
+
+    def next_hours(self, hours: float, now: TimePoint = None) -> List:
+        """Forecasts for the next given number of hours"""
+        start = self._epoch(now, datetime.now().timestamp())
+        return self.window(start, start + hours * 3600)
+
+    def alerts(self, start: TimePoint = None, end: TimePoint = None) -> List:
+        """Rough or severe forecasts in the window"""
+        lo, hi = self._bounds(start, end)
+        return [self._forecasts[lo + i]
+                for i in np.flatnonzero(self.codes[lo:hi] >= self.ALERT_CODE)]
+
+    def delay(self, start: TimePoint = None, end: TimePoint = None) -> timedelta:
+        """Expected weather delay of the forecasts in the window"""
+        lo, hi = self._bounds(start, end)
+        return timedelta(minutes=int(self._delay_prefix[hi] - self._delay_prefix[lo]))
+
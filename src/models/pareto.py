@@ -0,0 +1,189 @@
+import atexit
+import functools
+import itertools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.models.port_distances import get_route_planner
+from src.models.route import PRIORITIES, RouteGraph, RoutePlan, RoutePlanner, evaluate_route, get_route_graph
+
+# RoutePlan fields traded off against each other, all minimized
+OBJECTIVES = ('estimated_time', 'fuel_consumption', 'total_cost', 'weather_exposure')
+DEFAULT_SPEEDS = (8.0, 10.0, 12.0, 14.0, 16.0)
+MAX_SHARED_WORKERS = 4  # Worker processes of the process-wide search
+
+
+def default_weights() -> List[Tuple[float, ...]]:
+    """Priority blends to search: each priority alone, every pair and all equally"""
+    n = len(PRIORITIES)
+    weights = [tuple(float(i == k) for i in range(n)) for k in range(n)]
+    weights += [tuple(0.5 if i in pair else 0.0 for i in range(n))
+                for pair in itertools.combinations(range(n), 2)]
+    weights.append(tuple([1.0 / n] * n))
+    return weights
+
+
+def blended_unit_costs(graph: RouteGraph, weights: Sequence[float], speed: float,
+                       weather: np.ndarray, fuel_price: float = 750.0, **consumption) -> np.ndarray:
+    """Weighted sum of the per-priority mile costs, each scaled so its cheapest cell costs 1"""
+    unit = np.zeros(graph.shape)
+    for weight, priority in zip(weights, PRIORITIES):
+        if weight:
+            costs = graph.unit_costs(priority, speed, weather, fuel_price, **consumption)
+            unit += weight * costs / costs[graph.sea].min()
+    return unit
+
+
+def pareto_front(objectives: np.ndarray) -> np.ndarray:
+    """Indices of the non-dominated rows (all columns minimized), first of any duplicates"""
+    objectives = np.asarray(objectives, dtype=np.float64)
+    _, first = np.unique(np.round(objectives, 9), axis=0, return_index=True)
+    candidates = np.sort(first)
+    points = objectives[candidates]
+    no_worse = (points[:, None, :] <= points[None, :, :]).all(axis=2)
+    better = (points[:, None, :] < points[None, :, :]).any(axis=2)
+    dominated = (no_worse & better).any(axis=0)  # Row j is dominated by some row i
+    return candidates[~dominated]
+
+
+def select_spread(objectives: np.ndarray, indices: np.ndarray, count: int) -> np.ndarray:
+    """A well spread subset: the best option per objective, then farthest-point picks"""
+    if len(indices) <= count:
+        return indices
+    points = objectives[indices]
+    span = points.max(axis=0) - points.min(axis=0)
+    scaled = (points - points.min(axis=0)) / np.where(span > 0, span, 1.0)
+
+    chosen = list(dict.fromkeys(int(i) for i in scaled.argmin(axis=0)))[:count]
+    while len(chosen) < count:
+        distance = np.min(np.linalg.norm(scaled[:, None, :] - scaled[None, chosen, :], axis=2), axis=1)
+        chosen.append(int(np.argmax(distance)))
+    return indices[sorted(chosen)]
+
+
+def _weights_label(weights: Sequence[float]) -> str:
+    return " / ".join(f"{name} {weight:.0%}" for name, weight in zip(PRIORITIES, weights) if weight)
+
+
+_WORKER_GRAPH: Optional[RouteGraph] = None
+
+
+def _init_worker(graph: RouteGraph) -> None:
+    global _WORKER_GRAPH
+    _WORKER_GRAPH = graph
+
+
+def _evaluate_candidate(task: Tuple, graph: Optional[RouteGraph] = None) -> List[RoutePlan]:
+    """Search one priority blend and evaluate it at its speeds, on graph or the worker's graph"""
+    start, goal, weights, speeds, weather, fuel_price, consumption = task
+    if graph is None:
+        graph = _WORKER_GRAPH if _WORKER_GRAPH is not None else get_route_graph()
+    unit = blended_unit_costs(graph, weights, speeds[0], weather, fuel_price, **consumption)
+    path, expanded = graph.search(start, goal, unit)
+    waypoints = graph.smooth(path, weather)
+    return [evaluate_route(graph, waypoints, speed, weather, fuel_price, _weights_label(weights),
+                           nodes_expanded=expanded, **consumption) for speed in speeds]
+
+
+class ParetoRouteSearch:
+    """Multi-objective route search over priority blends and service speeds.
+
+    Every priority blend is one A* search on the blended mile costs (one per
+    speed when the blend includes Cost), and every route is evaluated for
+    time, fuel, cost and weather exposure at each speed. Searches are
+    independent, so with ``workers > 1`` they fan out over a
+    ProcessPoolExecutor whose workers each hold a copy of the route graph.
+    Workers are spawned rather than forked, as the dashboard server that owns
+    the pool runs other threads.
+    The non-dominated routes are returned, thinned to a handful of options.
+    """
+
+    def __init__(self, planner: Optional[RoutePlanner] = None, workers: int = 1):
+        self.planner = planner if planner is not None else RoutePlanner()
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context("spawn"),
+                                             initializer=_init_worker, initargs=(self.planner.graph,))
+        return self._pool
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> 'ParetoRouteSearch':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def candidates(self, origin, destination, speeds: Sequence[float] = DEFAULT_SPEEDS,
+                   weights: Optional[Sequence[Sequence[float]]] = None, weather=None,
+                   vessel=None, fuel_price: float = 750.0) -> List[RoutePlan]:
+        """Evaluate every weights x speeds candidate"""
+        planner = self.planner
+        graph = planner.graph
+        if weather is None:
+            codes = np.zeros(graph.shape, dtype=np.int8)
+        elif isinstance(weather, np.ndarray):
+            codes = weather
+        else:
+            codes = graph.weather_codes(weather)
+
+        consumption: Dict[str, float] = {}
+        if vessel is not None:
+            consumption = dict(load_percentage=vessel.load_percentage,
+                               hull_efficiency=vessel.hull_efficiency,
+                               multiplier=vessel.consumption_multiplier())
+            fuel_price = vessel.fuel_cost_per_ton
+
+        start = graph.nearest_sea_node(*planner._position(origin))
+        goal = graph.nearest_sea_node(*planner._position(destination))
+        # Normalized Time, Fuel and Weather mile costs do not depend on speed, so
+        # blends without Cost need one search for all speeds
+        cost_index = PRIORITIES.index("Cost")
+        speeds = [float(speed) for speed in speeds]
+        tasks = []
+        for w in (weights if weights is not None else default_weights()):
+            groups = [[speed] for speed in speeds] if w[cost_index] else [speeds]
+            tasks += [(start, goal, tuple(w), group, codes, fuel_price, consumption) for group in groups]
+
+        if self.workers <= 1:
+            results = map(functools.partial(_evaluate_candidate, graph=graph), tasks)
+        else:
+            chunksize = max(1, len(tasks) // (self.workers * 4))
+            results = self._executor().map(_evaluate_candidate, tasks, chunksize=chunksize)
+        return [plan for plans in results for plan in plans]
+
+    def search(self, origin, destination, speeds: Sequence[float] = DEFAULT_SPEEDS,
+               weights: Optional[Sequence[Sequence[float]]] = None, weather=None, vessel=None,
+               fuel_price: float = 750.0, max_options: int = 5) -> List[RoutePlan]:
+        """Up to max_options non-dominated routes, fastest first"""
+        plans = self.candidates(origin, destination, speeds, weights, weather, vessel, fuel_price)
+        objectives = np.array([[getattr(plan, name) for name in OBJECTIVES] for plan in plans])
+        front = select_spread(objectives, pareto_front(objectives), max_options)
+        return sorted((plans[i] for i in front), key=lambda plan: plan.estimated_time)
+
+
+_PARETO_SEARCH: Optional[ParetoRouteSearch] = None
+_PARETO_LOCK = threading.Lock()
+
+
+def get_pareto_search() -> ParetoRouteSearch:
+    """Process-wide search with a single worker pool, shut down when the process exits"""
+    global _PARETO_SEARCH
+    with _PARETO_LOCK:
+        if _PARETO_SEARCH is None:
+            workers = min(os.cpu_count() or 1, MAX_SHARED_WORKERS)
+            _PARETO_SEARCH = ParetoRouteSearch(get_route_planner(), workers=workers)
+            atexit.register(_PARETO_SEARCH.close)
+        return _PARETO_SEARCH
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+
+from src.models.port_registry import PortKey, PortRegistry, get_port_registry
+from src.models.route import RouteGraph, RoutePlanner, get_route_graph
+from src.utils import geo
+from src.utils.config import PORT_DISTANCES_DIR
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = Path(PORT_DISTANCES_DIR)  # Set PORT_DISTANCES_DIR to move it
+PATH_RULES_VERSION = 2  # Bump when the search rules change, so stored paths are rebuilt
+
+
+class PortDistanceMatrix:
+    """Precomputed sea distances and paths between all registered ports.
+
+    Row/column ``i`` is the port with registry id ``i``. Paths are stored once
+    per port pair, from the lower to the higher id, as spans of one flat
+    waypoint array. With a ``directory`` the arrays are saved as ``.npy``
+    files and memory-mapped on the next start; ports added to the registry
+    later are appended with one Dijkstra run each instead of a rebuild.
+    """
+
+    FILES = ('distances', 'spans', 'waypoints')
+
+    def __init__(self, directory: Optional[Union[str, Path]] = DEFAULT_PATH,
+                 graph: Optional[RouteGraph] = None, registry: Optional[PortRegistry] = None):
+        self.directory = Path(directory) if directory is not None else None
+        self.graph = graph if graph is not None else get_route_graph()
+        self.registry = registry if registry is not None else get_port_registry()
+        self.ports: List[str] = []
+        self.distances = np.zeros((0, 0))
+        self.spans = np.zeros((0, 0, 2), dtype=np.int64)  # [start, end) into waypoints
+        self.waypoints = np.zeros((0, 2))
+        if not self._load():
+            self.sync()
+
+    def _signature(self) -> str:
+        """Identifies the sea graph the stored paths were computed on"""
+        graph = self.graph
+        digest = hashlib.sha1(graph.sea.tobytes())
+        digest.update(np.array([graph.lats[0], graph.lons[0], graph.resolution]).tobytes())
+        digest.update(str(PATH_RULES_VERSION).encode())
+        return digest.hexdigest()
+
+    def _positions(self, names: Iterable[str]) -> List[List[float]]:
+        return [list(self.registry.position(name)) for name in names]
+
+    def _load(self) -> bool:
+        """Memory-map a stored matrix that matches the graph and the registry"""
+        if self.directory is None or not (self.directory / 'ports.json').exists():
+            return False
+        try:
+            meta = json.loads((self.directory / 'ports.json').read_text())
+            ports = meta['ports']
+            if (meta['graph'] != self._signature()
+                    or list(self.registry.names[:len(ports)]) != ports
+                    or meta['positions'] != self._positions(ports)):
+                logger.info("Stored port distances are stale, rebuilding")
+                return False
+            arrays = {name: np.load(self.directory / f'{name}.npy', mmap_mode='r') for name in self.FILES}
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not load port distances: {str(e)}")
+            return False
+
+        self.ports = ports
+        self.distances, self.spans, self.waypoints = (arrays[name] for name in self.FILES)
+        self.sync()
+        return True
+
+    def _save(self) -> None:
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for name in self.FILES:
+            # Write aside and swap in, so a reader never maps a half-written file
+            tmp = self.directory / f'{name}.tmp.npy'
+            np.save(tmp, getattr(self, name))
+            os.replace(tmp, self.directory / f'{name}.npy')
+        meta = {'ports': self.ports, 'positions': self._positions(self.ports), 'graph': self._signature()}
+        (self.directory / 'ports.json').write_text(json.dumps(meta))
+
+    def sync(self) -> int:
+        """Add registry ports missing from the matrix; returns how many were added"""
+        new = list(self.registry.names[len(self.ports):])
+        for name in new:
+            self._add(name)
+        if new:
+            self._save()
+        return len(new)
+
+    def _add(self, name: str) -> None:
+        """Append one port: a single Dijkstra run to every known port"""
+        graph = self.graph
+        n = len(self.ports)
+        nodes = [graph.nearest_sea_node(*self.registry.position(port)) for port in self.ports + [name]]
+        paths = graph.shortest_paths(nodes[-1], nodes)
+
+        distances = np.zeros((n + 1, n + 1))
+        distances[:n, :n] = self.distances
+        spans = np.zeros((n + 1, n + 1, 2), dtype=np.int64)
+        spans[:n, :n] = self.spans
+        chunks = [np.asarray(self.waypoints)]
+        offset = len(self.waypoints)
+
+        zeros = np.zeros(graph.shape, dtype=np.int8)
+        for other, node in enumerate(nodes):
+            # Stored from the lower id (the existing port) to the new one
+            points = np.array(graph.smooth(paths[node][::-1], zeros))
+            distances[other, n] = distances[n, other] = geo.path_length_nm(points)
+            spans[other, n] = spans[n, other] = (offset, offset + len(points))
+            chunks.append(points)
+            offset += len(points)
+
+        self.ports.append(name)
+        self.distances = distances
+        self.spans = spans
+        self.waypoints = np.concatenate(chunks)
+
+    def _index(self, port: PortKey) -> int:
+        index = self.registry.id(port)
+        if index >= len(self.ports):
+            self.sync()
+        return index
+
+    def __contains__(self, port: str) -> bool:
+        return port in self.registry
+
+    def distance(self, origin: PortKey, destination: PortKey) -> float:
+        """Sea distance in nautical miles between two ports"""
+        i, j = self._index(origin), self._index(destination)
+        return float(self.distances[i, j])
+
+    def path(self, origin: PortKey, destination: PortKey) -> np.ndarray:
+        """Waypoints of the sea route between two ports, as an (n, 2) lat/lon array"""
+        i, j = self._index(origin), self._index(destination)
+        start, end = self.spans[i, j]
+        points = np.array(self.waypoints[start:end])
+        return points if i <= j else points[::-1]
+
+    def lookup(self, origins: Iterable[str], destinations: Iterable[str]) -> np.ndarray:
+        """Vectorized distances for paired port names, NaN where a port is unknown"""
+        i = self.registry.ids(origins)
+        j = self.registry.ids(destinations)
+        if len(i) and max(i.max(), j.max()) >= len(self.ports):
+            self.sync()
+        known = (i >= 0) & (j >= 0)
+        result = np.full(len(i), np.nan)
+        result[known] = self.distances[i[known], j[known]]
+        return result
+
+
+_PORT_DISTANCES: Optional[PortDistanceMatrix] = None
+
+
+def get_port_distances() -> PortDistanceMatrix:
+    """Process-wide port distance matrix, loaded from (or built into) DEFAULT_PATH"""
+    global _PORT_DISTANCES
+    if _PORT_DISTANCES is None:
+        _PORT_DISTANCES = PortDistanceMatrix(DEFAULT_PATH)
+    return _PORT_DISTANCES
+
+
+_ROUTE_PLANNER: Optional[RoutePlanner] = None
+
+
+def get_route_planner() -> RoutePlanner:
+    """Process-wide planner on the shared route graph and port distance matrix"""
+    global _ROUTE_PLANNER
+    if _ROUTE_PLANNER is None:
+        _ROUTE_PLANNER = RoutePlanner(distances=get_port_distances())
+    return _ROUTE_PLANNER
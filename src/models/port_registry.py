@@ -0,0 +1,135 @@
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+PortKey = Union[int, str]
+
+# name: (lat, lon, docking fee USD, daily rate USD, total berths)
+DEFAULT_PORTS = {
+    "Piraeus": (37.9420, 23.6465, 1000.0, 500.0, 10),
+    "Santorini": (36.3932, 25.4615, 800.0, 400.0, 4),
+    "Heraklion": (35.3462, 25.1456, 900.0, 450.0, 6),
+}
+
+
+def _frozen(values, dtype) -> np.ndarray:
+    array = np.array(values, dtype=dtype)
+    array.flags.writeable = False
+    return array
+
+
+class PortRegistry:
+    """Process-wide port table (coordinates, tariffs, berths) indexed by integer id.
+
+    Column arrays are read-only snapshots; updates swap in new arrays, so a
+    reader holding a snapshot never sees a partial update. Every port has a
+    version that is bumped when its tariff changes, and the registry has a
+    global version, so cached costs can be invalidated per port.
+    """
+
+    def __init__(self, ports: Optional[Dict[str, Tuple]] = None):
+        ports = DEFAULT_PORTS if ports is None else ports
+        self.names: Tuple[str, ...] = ()
+        self._ids: Dict[str, int] = {}
+        self.lat = _frozen([], np.float64)
+        self.lon = _frozen([], np.float64)
+        self.docking = _frozen([], np.float64)
+        self.daily_rate = _frozen([], np.float64)
+        self.total_berths = _frozen([], np.int64)
+        self.port_version = _frozen([], np.int64)
+        self.version = 0
+        self._costs_view = PortCostsView(self)
+        self.add_ports(ports)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ids
+
+    def id(self, port: PortKey) -> int:
+        """Integer id of a port given by name or id"""
+        return port if isinstance(port, (int, np.integer)) else self._ids[port]
+
+    def ids(self, names: Iterable[str]) -> np.ndarray:
+        """Ids for a sequence of port names, -1 for unknown ports"""
+        return np.array([self._ids.get(name, -1) for name in names], dtype=np.intp)
+
+    def add_ports(self, ports: Dict[str, Tuple]) -> None:
+        """Append new ports given as name: (lat, lon, docking, daily_rate, total_berths)"""
+        new = {name: row for name, row in ports.items() if name not in self._ids}
+        if not new:
+            return
+        for name in new:
+            self._ids[name] = len(self._ids)
+        self.names = self.names + tuple(new)
+
+        columns = list(zip(*new.values()))
+        self.lat = _frozen(np.concatenate((self.lat, columns[0])), np.float64)
+        self.lon = _frozen(np.concatenate((self.lon, columns[1])), np.float64)
+        self.docking = _frozen(np.concatenate((self.docking, columns[2])), np.float64)
+        self.daily_rate = _frozen(np.concatenate((self.daily_rate, columns[3])), np.float64)
+        self.total_berths = _frozen(np.concatenate((self.total_berths, columns[4])), np.int64)
+        self.port_version = _frozen(np.concatenate((self.port_version, np.zeros(len(new)))), np.int64)
+        self.version += 1
+
+    def update_tariffs(self, ports: Sequence[PortKey], docking=None, daily_rate=None) -> None:
+        """Bulk tariff update for a set of ports, bumping only their versions"""
+        ids = np.array([self.id(port) for port in ports], dtype=np.intp)
+        if docking is not None:
+            values = self.docking.copy()
+            values[ids] = docking
+            self.docking = _frozen(values, np.float64)
+        if daily_rate is not None:
+            values = self.daily_rate.copy()
+            values[ids] = daily_rate
+            self.daily_rate = _frozen(values, np.float64)
+
+        versions = self.port_version.copy()
+        versions[ids] += 1
+        self.port_version = _frozen(versions, np.int64)
+        self.version += 1
+
+    def tariff(self, port: PortKey) -> Dict[str, float]:
+        port_id = self.id(port)
+        return {"docking": float(self.docking[port_id]), "daily_rate": float(self.daily_rate[port_id])}
+
+    def position(self, port: PortKey) -> Tuple[float, float]:
+        port_id = self.id(port)
+        return float(self.lat[port_id]), float(self.lon[port_id])
+
+    def versions(self, names: Iterable[str]) -> Tuple[int, ...]:
+        """Tariff versions of the given ports, -1 for unknown ports"""
+        return tuple(int(self.port_version[i]) if i >= 0 else -1 for i in self.ids(names))
+
+    @property
+    def port_costs(self) -> 'PortCostsView':
+        """Read-only ``{port: {'docking', 'daily_rate'}}`` view shared by all vessels"""
+        return self._costs_view
+
+
+class PortCostsView(Mapping):
+    """Dict-like view of the registry tariffs, in the old per-vessel port_costs format"""
+
+    def __init__(self, registry: PortRegistry):
+        self.registry = registry
+
+    def __getitem__(self, port: str) -> Dict[str, float]:
+        if port not in self.registry:
+            raise KeyError(port)
+        return self.registry.tariff(port)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.registry.names)
+
+    def __len__(self) -> int:
+        return len(self.registry)
+
+
+PORT_REGISTRY = PortRegistry()
+
+
+def get_port_registry() -> PortRegistry:
+    """Process-wide port registry"""
+    return PORT_REGISTRY
@@ -0,0 +1,67 @@
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+
+class RingBuffer:
+    """Fixed-capacity columnar ring buffer backed by preallocated NumPy arrays.
+
+    Every sample is written twice, at ``i`` and ``i + capacity``, so the most
+    recent ``capacity`` samples are always contiguous and windows can be
+    returned as views without copying. Views are read-only and live: later
+    appends overwrite the oldest samples they point to.
+    """
+
+    def __init__(self, columns: Sequence[str], capacity: int = 100, dtype=np.float64):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.columns = tuple(columns)
+        self.capacity = capacity
+        self._column_index = {name: i for i, name in enumerate(self.columns)}
+        self._data = np.zeros((len(self.columns), 2 * capacity), dtype=dtype)
+        self._head = 0  # Next write position in [0, capacity)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, values: Sequence[float]) -> None:
+        """Append one sample, given in column order, in O(1)"""
+        self._data[:, self._head] = values
+        self._data[:, self._head + self.capacity] = values
+        self._head = (self._head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def clear(self) -> None:
+        """Drop all samples without releasing the storage"""
+        self._head = 0
+        self._count = 0
+
+    def _bounds(self, n: Optional[int]) -> tuple:
+        """Return the slice bounds of the latest n samples"""
+        n = self._count if n is None else max(0, min(n, self._count))
+        stop = self._head + self.capacity
+        return stop - n, stop
+
+    def column(self, name: str, n: Optional[int] = None) -> np.ndarray:
+        """Get a zero-copy view of the latest n values of a column (oldest first)"""
+        start, stop = self._bounds(n)
+        view = self._data[self._column_index[name], start:stop]
+        view.flags.writeable = False
+        return view
+
+    def window(self, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Get zero-copy views of the latest n samples for every column"""
+        start, stop = self._bounds(n)
+        view = self._data[:, start:stop]
+        view.flags.writeable = False
+        return {name: view[i] for i, name in enumerate(self.columns)}
+
+    def latest(self) -> Optional[Dict[str, float]]:
+        """Get the most recent sample, or None if the buffer is empty"""
+        if not self._count:
+            return None
+        position = self._head + self.capacity - 1
+        return {name: float(self._data[i, position]) for i, name in enumerate(self.columns)}
@@ -0,0 +1,393 @@
+import heapq
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.models.consumption import WEATHER_CONDITIONS, WEATHER_FACTORS, daily_consumption
+from src.models.port_registry import get_port_registry
+from src.utils import geo
+
+# Area covered by the route graph: (min_lat, min_lon, max_lat, max_lon)
+AEGEAN_BOUNDS = (34.5, 22.0, 41.0, 28.5)
+GRID_RESOLUTION = 0.05  # Degrees between graph nodes
+
+# Coarse coastlines as (lat, lon) polygons; enough to keep routes off land
+# at the grid resolution, not for navigation
+AEGEAN_LAND = {
+    "Mainland Greece": [
+        (41.5, 21.0), (41.5, 26.6), (40.85, 26.05), (40.95, 25.3), (40.9, 24.4),
+        (40.7, 23.9), (40.2, 23.8), (40.0, 23.4), (40.6, 22.95), (40.2, 22.6),
+        (39.35, 22.95), (39.15, 23.3), (38.95, 22.9), (38.4, 23.6), (38.2, 24.05),
+        (37.65, 24.05), (37.85, 23.75), (37.97, 23.6), (38.0, 23.4), (37.95, 22.95),
+        (38.3, 22.0), (38.3, 21.0)
+    ],
+    "Peloponnese": [
+        (38.2, 21.0), (38.2, 22.4), (37.95, 22.9), (37.75, 23.15), (37.5, 23.45),
+        (37.3, 23.2), (37.0, 22.8), (36.45, 23.1), (36.8, 22.7), (36.4, 22.5),
+        (36.8, 22.1), (36.7, 21.7), (37.5, 21.5)
+    ],
+    "Evia": [
+        (39.0, 23.0), (38.85, 23.6), (38.5, 24.2), (38.0, 24.6), (37.95, 24.45),
+        (38.4, 23.9), (38.75, 23.3)
+    ],
+    "Crete": [
+        (35.6, 23.5), (35.55, 24.2), (35.45, 24.6), (35.33, 25.1), (35.3, 25.8),
+        (35.2, 26.3), (34.95, 26.2), (35.0, 25.0), (35.2, 24.0), (35.25, 23.5)
+    ],
+    "Anatolia": [
+        (41.5, 26.6), (40.6, 26.7), (40.0, 26.2), (39.5, 26.1), (39.0, 26.8),
+        (38.3, 26.3), (38.0, 27.0), (37.5, 27.2), (37.0, 27.3), (36.7, 28.0),
+        (36.6, 28.6), (36.0, 28.6), (35.5, 30.0), (41.5, 30.0)
+    ],
+    "Lesvos": [(39.4, 25.85), (39.35, 26.4), (39.0, 26.6), (38.95, 26.1)],
+    "Chios": [(38.6, 26.0), (38.55, 26.15), (38.2, 26.15), (38.2, 25.85)],
+    "Rhodes": [(36.45, 28.2), (36.1, 27.75), (35.9, 27.8), (36.25, 28.25)],
+    "Kos": [(36.9, 26.95), (36.75, 27.3), (36.7, 27.0)],
+    "Andros": [(37.95, 24.7), (37.8, 24.95), (37.75, 24.8), (37.9, 24.65)],
+    "Naxos": [(37.2, 25.35), (37.2, 25.55), (36.95, 25.6), (36.95, 25.4)],
+    "Paros": [(37.15, 25.1), (37.1, 25.3), (36.95, 25.25), (37.0, 25.1)],
+}
+
+# 8-connected moves as (row, col) offsets
+MOVES = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+# Per weather condition (CALM, MODERATE, ROUGH, SEVERE)
+SPEED_LOSS = np.array([1.0, 0.95, 0.85, 0.7])  # Fraction of service speed kept
+WEATHER_RISK = np.array([0.0, 1.0, 4.0, 25.0])  # Extra cost per nm for the Weather priority
+
+OPERATING_COST_PER_DAY = 10000.0  # USD, crew and running costs at sea
+PRIORITIES = ("Time", "Fuel", "Cost", "Weather")
+
+
+def _inside(lat: np.ndarray, lon: np.ndarray, polygon: Sequence[Tuple[float, float]]) -> np.ndarray:
+    """Even-odd ray casting of many points against one polygon"""
+    inside = np.zeros(lat.shape, dtype=bool)
+    vertices = np.asarray(polygon, dtype=np.float64)
+    for (lat1, lon1), (lat2, lon2) in zip(vertices, np.roll(vertices, -1, axis=0)):
+        crosses = (lat1 > lat) != (lat2 > lat)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lon_at = lon1 + (lat - lat1) * (lon2 - lon1) / (lat2 - lat1)
+        inside ^= crosses & (lon < lon_at)
+    return inside
+
+
+@dataclass
+class RoutePlan:
+    waypoints: List[Tuple[float, float]]
+    distance: float  # nautical miles
+    estimated_time: float  # hours
+    fuel_consumption: float  # tons
+    total_cost: float  # USD
+    weather_risk: str
+    priority: str
+    nodes_expanded: int = 0
+    leg_conditions: List[str] = field(default_factory=list)
+    speed: float = 0.0  # knots
+    weather_exposure: float = 0.0  # Miles sailed weighted by WEATHER_RISK
+
+
+class RouteGraph:
+    """Sea-navigable lat/lon grid with a land mask, searched with A*.
+
+    Nodes are the sea cells of a regular grid; each is linked to its eight
+    neighbours. Edge costs are the great-circle length of the edge times the
+    average per-mile cost of its two cells, where the per-mile cost depends on
+    the optimization priority and the weather in the cell. The A* heuristic is
+    the great-circle distance to the goal times the cheapest per-mile cost, so
+    it never overestimates.
+    """
+
+    def __init__(self, bounds: Tuple[float, float, float, float] = AEGEAN_BOUNDS,
+                 resolution: float = GRID_RESOLUTION,
+                 land: Optional[Dict[str, Sequence[Tuple[float, float]]]] = None):
+        min_lat, min_lon, max_lat, max_lon = bounds
+        self.resolution = resolution
+        self.lats = min_lat + resolution * np.arange(int(round((max_lat - min_lat) / resolution)) + 1)
+        self.lons = min_lon + resolution * np.arange(int(round((max_lon - min_lon) / resolution)) + 1)
+        self.shape = (len(self.lats), len(self.lons))
+
+        lat, lon = np.meshgrid(self.lats, self.lons, indexing='ij')
+        land_mask = np.zeros(self.shape, dtype=bool)
+        for polygon in (AEGEAN_LAND if land is None else land).values():
+            land_mask |= _inside(lat, lon, polygon)
+        self.sea = ~land_mask
+        self._node_lat = lat.ravel()
+        self._node_lon = lon.ravel()
+
+        # Edge lengths depend only on the row (latitude) and the move
+        step_nm = np.zeros((self.shape[0], len(MOVES)))
+        for d, (dr, dc) in enumerate(MOVES):
+            to_row = np.clip(np.arange(self.shape[0]) + dr, 0, self.shape[0] - 1)
+            step_nm[:, d] = geo.haversine_nm(self.lats, 0.0, self.lats[to_row], dc * resolution)
+        self._step_nm = step_nm.tolist()
+
+    def cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        """Grid cell holding a position, clamped to the grid"""
+        row = int(np.clip(round((lat - self.lats[0]) / self.resolution), 0, self.shape[0] - 1))
+        col = int(np.clip(round((lon - self.lons[0]) / self.resolution), 0, self.shape[1] - 1))
+        return row, col
+
+    def nearest_sea_node(self, lat: float, lon: float) -> int:
+        """Flat index of the sea node closest to a position (ports sit on the coast)"""
+        row, col = self.cell(lat, lon)
+        node = row * self.shape[1] + col
+        if self.sea.flat[node]:
+            return node
+        sea_nodes = np.flatnonzero(self.sea)
+        distances = geo.haversine_nm(lat, lon, self._node_lat[sea_nodes], self._node_lon[sea_nodes])
+        return int(sea_nodes[np.argmin(distances)])
+
+    def weather_codes(self, forecasts: Sequence, radius_nm: float = 30.0) -> np.ndarray:
+        """Grid of condition codes, the worst forecast within radius_nm of each cell"""
+        codes = np.zeros(self.shape, dtype=np.int8)
+        for forecast in forecasts:
+            code = WEATHER_CONDITIONS.index(forecast.condition.name)
+            if code == 0:
+                continue
+            lat, lon = forecast.location
+            near = geo.haversine_nm(lat, lon, self._node_lat, self._node_lon) <= radius_nm
+            codes.flat[near] = np.maximum(codes.flat[near], code)
+        return codes
+
+    def unit_costs(self, priority: str, speed: float, weather: Optional[np.ndarray] = None,
+                   fuel_price: float = 750.0, load_percentage: float = 70.0,
+                   hull_efficiency: float = 95.0, multiplier: float = 1.0) -> np.ndarray:
+        """Cost per nautical mile of every cell under a priority"""
+        codes = np.zeros(self.shape, dtype=np.int8) if weather is None else np.asarray(weather)
+        hours = 1.0 / (speed * SPEED_LOSS[codes])
+        if priority == "Time":
+            return hours
+        if priority == "Weather":
+            return 1.0 + WEATHER_RISK[codes]
+
+        daily = daily_consumption(speed, WEATHER_FACTORS[codes], load_percentage, hull_efficiency, multiplier)
+        fuel = daily / 24 * hours
+        if priority == "Fuel":
+            return fuel
+        if priority == "Cost":
+            return fuel * fuel_price + hours * OPERATING_COST_PER_DAY / 24
+        raise ValueError(f"Unknown priority {priority!r}, expected one of {PRIORITIES}")
+
+    def search(self, start: int, goal: int, unit: np.ndarray) -> Tuple[List[int], int]:
+        """A* between two sea nodes; returns the node path and the number of expanded nodes"""
+        rows, cols = self.shape
+        sea = self.sea.ravel().tolist()
+        unit_list = unit.ravel().tolist()
+        goal_lat, goal_lon = self._node_lat[goal], self._node_lon[goal]
+        heuristic = (geo.haversine_nm(self._node_lat, self._node_lon, goal_lat, goal_lon)
+                     * float(unit[self.sea].min())).tolist()
+        step_nm = self._step_nm
+
+        cost = {start: 0.0}
+        parent = {start: -1}
+        closed = set()
+        heap = [(heuristic[start], start)]
+        while heap:
+            _, node = heapq.heappop(heap)
+            if node == goal:
+                break
+            if node in closed:
+                continue
+            closed.add(node)
+
+            row, col = divmod(node, cols)
+            node_cost = cost[node]
+            node_unit = unit_list[node]
+            steps = step_nm[row]
+            for d, (dr, dc) in enumerate(MOVES):
+                r, c = row + dr, col + dc
+                if r < 0 or r >= rows or c < 0 or c >= cols:
+                    continue
+                neighbour = r * cols + c
+                if not sea[neighbour] or neighbour in closed:
+                    continue
+                if dr and dc and not (sea[r * cols + col] and sea[row * cols + c]):
+                    continue  # Diagonal step would cut a land corner
+                new_cost = node_cost + steps[d] * (node_unit + unit_list[neighbour]) * 0.5
+                if new_cost < cost.get(neighbour, float('inf')):
+                    cost[neighbour] = new_cost
+                    parent[neighbour] = node
+                    heapq.heappush(heap, (new_cost + heuristic[neighbour], neighbour))
+        else:
+            raise ValueError("No sea route between the given positions")
+        return self._unwind(parent, goal), len(closed)
+
+    @staticmethod
+    def _unwind(parent: Dict[int, int], node: int) -> List[int]:
+        path = [node]
+        while parent[path[-1]] != -1:
+            path.append(parent[path[-1]])
+        return path[::-1]
+
+    def shortest_paths(self, start: int, goals: Sequence[int]) -> Dict[int, List[int]]:
+        """Shortest sea paths (by distance) from one node to many, in one Dijkstra run"""
+        rows, cols = self.shape
+        sea = self.sea.ravel().tolist()
+        step_nm = self._step_nm
+        remaining = set(goals)
+
+        cost = {start: 0.0}
+        parent = {start: -1}
+        closed = set()
+        heap = [(0.0, start)]
+        while heap and remaining:
+            node_cost, node = heapq.heappop(heap)
+            if node in closed:
+                continue
+            closed.add(node)
+            remaining.discard(node)
+
+            row, col = divmod(node, cols)
+            steps = step_nm[row]
+            for d, (dr, dc) in enumerate(MOVES):
+                r, c = row + dr, col + dc
+                if r < 0 or r >= rows or c < 0 or c >= cols:
+                    continue
+                neighbour = r * cols + c
+                if not sea[neighbour] or neighbour in closed:
+                    continue
+                if dr and dc and not (sea[r * cols + col] and sea[row * cols + c]):
+                    continue  # Diagonal step would cut a land corner
+                new_cost = node_cost + steps[d]
+                if new_cost < cost.get(neighbour, float('inf')):
+                    cost[neighbour] = new_cost
+                    parent[neighbour] = node
+                    heapq.heappush(heap, (new_cost, neighbour))
+
+        if remaining:
+            raise ValueError("No sea route between the given positions")
+        return {goal: self._unwind(parent, goal) for goal in goals}
+
+    def _segment_codes(self, start: Tuple[float, float], end: Tuple[float, float],
+                       weather: np.ndarray) -> Optional[np.ndarray]:
+        """Weather codes of the cells a straight segment passes, None if it crosses land"""
+        samples = max(2, int(np.ceil(max(abs(end[0] - start[0]), abs(end[1] - start[1]))
+                                     / (self.resolution / 2))) + 1)
+        t = np.linspace(0.0, 1.0, samples)
+        rows = np.clip(np.rint((start[0] + t * (end[0] - start[0]) - self.lats[0]) / self.resolution),
+                       0, self.shape[0] - 1).astype(np.intp)
+        cols = np.clip(np.rint((start[1] + t * (end[1] - start[1]) - self.lons[0]) / self.resolution),
+                       0, self.shape[1] - 1).astype(np.intp)
+        if not self.sea[rows, cols].all():
+            return None
+        return weather[rows, cols]
+
+    def smooth(self, path: Sequence[int], weather: np.ndarray) -> List[Tuple[float, float]]:
+        """Replace grid zig-zags with straight legs that stay at sea and in no worse weather"""
+        points = [(float(self._node_lat[n]), float(self._node_lon[n])) for n in path]
+        path_codes = weather.ravel()[list(path)]
+        waypoints = [points[0]]
+        anchor = 0
+        while anchor < len(points) - 1:
+            furthest = anchor + 1
+            for candidate in range(len(points) - 1, anchor, -1):
+                codes = self._segment_codes(points[anchor], points[candidate], weather)
+                if codes is None:
+                    continue
+                # A single grid step is always kept as long as it stays at sea
+                if candidate == anchor + 1 or codes.max() <= path_codes[anchor:candidate + 1].max():
+                    furthest = candidate
+                    break
+            waypoints.append(points[furthest])
+            anchor = furthest
+        return waypoints
+
+
+class RoutePlanner:
+    """Plans sea routes between ports or positions on a shared RouteGraph"""
+
+    RISK_LEVELS = ('Low', 'Low', 'Medium', 'High')  # By worst condition on the route
+
+    def __init__(self, graph: Optional['RouteGraph'] = None, registry=None, distances=None):
+        self.graph = graph if graph is not None else get_route_graph()
+        self.registry = registry if registry is not None else get_port_registry()
+        self.distances = distances  # Optional PortDistanceMatrix for calm-weather port pairs
+
+    def _position(self, place) -> Tuple[float, float]:
+        return self.registry.position(place) if isinstance(place, str) else tuple(place)
+
+    def plan(self, origin, destination, priority: str = "Time", speed: float = 12.0,
+             weather=None, vessel=None, fuel_price: float = 750.0) -> RoutePlan:
+        """Optimal route between two ports (by name) or (lat, lon) positions.
+
+        ``weather`` is a grid of condition codes or a sequence of
+        WeatherForecast; ``vessel`` supplies load, hull and fuel price to the
+        consumption model.
+        """
+        graph = self.graph
+        if weather is None:
+            codes = np.zeros(graph.shape, dtype=np.int8)
+        elif isinstance(weather, np.ndarray):
+            codes = weather
+        else:
+            codes = graph.weather_codes(weather)
+
+        consumption = {}
+        if vessel is not None:
+            consumption = dict(load_percentage=vessel.load_percentage,
+                               hull_efficiency=vessel.hull_efficiency,
+                               multiplier=vessel.consumption_multiplier())
+            fuel_price = vessel.fuel_cost_per_ton
+
+        if (self.distances is not None and weather is None
+                and isinstance(origin, str) and isinstance(destination, str)):
+            # In calm weather every priority is proportional to distance: use the precomputed path
+            waypoints = [tuple(point) for point in self.distances.path(origin, destination).tolist()]
+            expanded = 0
+        else:
+            start = graph.nearest_sea_node(*self._position(origin))
+            goal = graph.nearest_sea_node(*self._position(destination))
+            unit = graph.unit_costs(priority, speed, codes, fuel_price, **consumption)
+            path, expanded = graph.search(start, goal, unit)
+            waypoints = graph.smooth(path, codes)
+
+        return evaluate_route(graph, waypoints, speed, codes, fuel_price, priority,
+                              nodes_expanded=expanded, **consumption)
+
+
+def evaluate_route(graph: RouteGraph, waypoints: List[Tuple[float, float]], speed: float,
+                   weather: np.ndarray, fuel_price: float = 750.0, priority: str = "",
+                   nodes_expanded: int = 0, **consumption) -> RoutePlan:
+    """Time, fuel, cost and weather exposure of a route, sampling the weather along each leg"""
+    distance = hours = fuel = exposure = 0.0
+    leg_conditions = []
+    for leg_start, leg_end in zip(waypoints[:-1], waypoints[1:]):
+        leg_nm = float(geo.haversine_nm(*leg_start, *leg_end))
+        leg_codes = graph._segment_codes(leg_start, leg_end, weather)
+        if leg_codes is None:
+            # Leg touches land cells (e.g. a port inside the coastal mask): use its end cells
+            leg_codes = np.array([weather[graph.cell(*leg_start)], weather[graph.cell(*leg_end)]])
+        sample_hours = leg_nm / (speed * SPEED_LOSS[leg_codes])
+        daily = daily_consumption(speed, WEATHER_FACTORS[leg_codes], **consumption)
+        distance += leg_nm
+        hours += float(sample_hours.mean())
+        fuel += float((daily / 24 * sample_hours).mean())
+        exposure += leg_nm * float(WEATHER_RISK[leg_codes].mean())
+        leg_conditions.append(WEATHER_CONDITIONS[int(leg_codes.max())])
+
+    worst = max((WEATHER_CONDITIONS.index(c) for c in leg_conditions), default=0)
+    return RoutePlan(
+        waypoints=waypoints,
+        distance=distance,
+        estimated_time=hours,
+        fuel_consumption=fuel,
+        total_cost=fuel * fuel_price + hours * OPERATING_COST_PER_DAY / 24,
+        weather_risk=RoutePlanner.RISK_LEVELS[worst],
+        priority=priority,
+        nodes_expanded=nodes_expanded,
+        leg_conditions=leg_conditions,
+        speed=speed,
+        weather_exposure=exposure
+    )
+
+
+_ROUTE_GRAPH: Optional[RouteGraph] = None
+
+
+def get_route_graph() -> RouteGraph:
+    """Process-wide Aegean route graph, built on first use"""
+    global _ROUTE_GRAPH
+    if _ROUTE_GRAPH is None:
+        _ROUTE_GRAPH = RouteGraph()
+    return _ROUTE_GRAPH
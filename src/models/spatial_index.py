@@ -0,0 +1,153 @@
+import heapq
+import itertools
+from typing import Dict, Iterator, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from src.utils.geo import haversine_nm
+
+Cell = Tuple[int, int]
+
+
+class SpatialIndex:
+    """Uniform lat/lon grid of fleet slots for proximity queries.
+
+    Each cell holds the set of slots whose last synced position falls in it.
+    ``sync`` re-buckets only the vessels that changed cell, so it is cheap to
+    run every tick. Queries visit the cells overlapping the search area and
+    filter the candidates with exact great-circle distances.
+    """
+
+    def __init__(self, fleet, cell_size: float = 0.25):
+        self.fleet = fleet
+        self.cell_size = cell_size
+        self.cells: Dict[Cell, Set[int]] = {}
+        self._row = np.zeros(0, dtype=np.int64)
+        self._col = np.zeros(0, dtype=np.int64)
+        self._indexed = np.zeros(0, dtype=bool)
+        self.sync()
+
+    def _cell_of(self, lat, lon) -> Tuple[np.ndarray, np.ndarray]:
+        return (np.floor(np.asarray(lat) / self.cell_size).astype(np.int64),
+                np.floor(np.asarray(lon) / self.cell_size).astype(np.int64))
+
+    def _ensure_capacity(self, capacity: int) -> None:
+        extra = capacity - len(self._indexed)
+        if extra > 0:
+            self._row = np.concatenate((self._row, np.zeros(extra, dtype=np.int64)))
+            self._col = np.concatenate((self._col, np.zeros(extra, dtype=np.int64)))
+            self._indexed = np.concatenate((self._indexed, np.zeros(extra, dtype=bool)))
+
+    def _discard(self, slot: int) -> None:
+        cell = (int(self._row[slot]), int(self._col[slot]))
+        members = self.cells.get(cell)
+        if members is not None:
+            members.discard(slot)
+            if not members:
+                del self.cells[cell]
+        self._indexed[slot] = False
+
+    def sync(self, slots: Optional[Sequence[int]] = None) -> int:
+        """Re-bucket the given slots (default: all) from the fleet; returns how many moved"""
+        fleet = self.fleet
+        self._ensure_capacity(fleet.capacity)
+        if slots is None:
+            # Drop slots that were removed from the fleet
+            for slot in np.flatnonzero(self._indexed[:fleet.capacity] & ~fleet.active):
+                self._discard(int(slot))
+        slots = fleet.resolve_slots(slots)
+
+        row, col = self._cell_of(fleet.lat[slots], fleet.lon[slots])
+        changed = ~self._indexed[slots] | (row != self._row[slots]) | (col != self._col[slots])
+        moved = slots[changed]
+        for slot, new_row, new_col in zip(moved.tolist(), row[changed].tolist(), col[changed].tolist()):
+            if self._indexed[slot]:
+                self._discard(slot)
+            self.cells.setdefault((new_row, new_col), set()).add(slot)
+            self._indexed[slot] = True
+        self._row[moved] = row[changed]
+        self._col[moved] = col[changed]
+        return len(moved)
+
+    def _candidates(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> np.ndarray:
+        (row_lo, row_hi), (col_lo, col_hi) = self._cell_of([min_lat, max_lat], [min_lon, max_lon])
+        # Walk whichever is smaller: the grid window or the occupied cells
+        if (row_hi - row_lo + 1) * (col_hi - col_lo + 1) <= len(self.cells):
+            members = [self.cells.get((r, c)) for r in range(row_lo, row_hi + 1)
+                       for c in range(col_lo, col_hi + 1)]
+        else:
+            members = [slots for (r, c), slots in self.cells.items()
+                       if row_lo <= r <= row_hi and col_lo <= c <= col_hi]
+        found = [slot for cell in members if cell for slot in cell]
+        return np.array(found, dtype=np.intp)
+
+    def bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> np.ndarray:
+        """Slots inside a lat/lon bounding box, e.g. the map viewport"""
+        slots = self._candidates(min_lat, min_lon, max_lat, max_lon)
+        lat, lon = self.fleet.lat[slots], self.fleet.lon[slots]
+        inside = (lat >= min_lat) & (lat <= max_lat) & (lon >= min_lon) & (lon <= max_lon)
+        return np.sort(slots[inside])
+
+    def radius(self, lat: float, lon: float, radius_nm: float) -> np.ndarray:
+        """Slots within radius_nm of a point, nearest first"""
+        d_lat = radius_nm / 60.0
+        d_lon = radius_nm / (60.0 * max(np.cos(np.radians(lat)), 1e-6))
+        slots = self._candidates(lat - d_lat, lon - d_lon, lat + d_lat, lon + d_lon)
+        distances = haversine_nm(lat, lon, self.fleet.lat[slots], self.fleet.lon[slots])
+        inside = distances <= radius_nm
+        return slots[inside][np.argsort(distances[inside], kind='stable')]
+
+    def count_within(self, lat: float, lon: float, radius_nm: float) -> int:
+        return len(self.radius(lat, lon, radius_nm))
+
+    def _rings(self, row: int, col: int) -> Iterator[Tuple[int, np.ndarray]]:
+        """(ring, slots) for the non-empty rings of cells around (row, col), innermost first.
+
+        Ring r holds the cells exactly r cells away (Chebyshev). Once a ring
+        has more cells than the grid has occupied cells, the remaining
+        occupied cells are grouped by ring instead of looking up every cell.
+        """
+        ring = 0
+        while 8 * ring <= len(self.cells):
+            if ring == 0:
+                cells = [(row, col)]
+            else:
+                cells = [(r, c) for r in (row - ring, row + ring) for c in range(col - ring, col + ring + 1)]
+                cells += [(r, c) for r in range(row - ring + 1, row + ring) for c in (col - ring, col + ring)]
+            slots = [slot for cell in cells for slot in self.cells.get(cell, ())]
+            if slots:
+                yield ring, np.array(slots, dtype=np.intp)
+            ring += 1
+
+        outer = sorted((max(abs(r - row), abs(c - col)), (r, c)) for r, c in self.cells
+                       if max(abs(r - row), abs(c - col)) >= ring)
+        for ring, group in itertools.groupby(outer, key=lambda item: item[0]):
+            yield ring, np.array([slot for _, cell in group for slot in self.cells[cell]], dtype=np.intp)
+
+    def nearest(self, lat: float, lon: float, k: int = 1) -> np.ndarray:
+        """The k slots nearest to a point, searching outwards ring by ring of cells.
+
+        Stops as soon as the k-th distance is within the reach of the rings
+        visited so far.
+        """
+        if k <= 0 or not self.cells:
+            return np.zeros(0, dtype=np.intp)
+        row, col = (int(v) for v in self._cell_of(lat, lon))
+
+        best = []  # Max-heap of (-distance, slot)
+        for ring, slots in self._rings(row, col):
+            # Cells beyond the last ring lie at least `ring` whole cells away (lon degrees shrink with latitude)
+            if len(best) == k:
+                reach = (ring - 1) * self.cell_size
+                min_outside = reach * 60.0 * np.cos(np.radians(min(abs(lat) + reach, 89.9)))
+                if -best[0][0] <= min_outside:
+                    break
+
+            distances = haversine_nm(lat, lon, self.fleet.lat[slots], self.fleet.lon[slots])
+            for distance, slot in zip(distances.tolist(), slots.tolist()):
+                if len(best) < k:
+                    heapq.heappush(best, (-distance, slot))
+                elif distance < -best[0][0]:
+                    heapq.heapreplace(best, (-distance, slot))
+
+        return np.array([slot for _, slot in sorted((-d, s) for d, s in best)], dtype=np.intp)
@@ -0,0 +1,146 @@
+from datetime import datetime
+from typing import Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+from src.models.consumption import WEATHER_CONDITIONS, WEATHER_FACTORS, daily_consumption
+from src.models.port_registry import get_port_registry
+from src.utils import geo
+
+BERTH_TURNOVER_HOURS = 24.0  # Average stay of a vessel at a berth
+MIN_SPEED = 6.0  # Slowest sustainable engine speed in knots
+EN_ROUTE_STATUSES = ('EN_ROUTE', 'APPROACHING')  # VesselStatus names of vessels still at sea
+
+
+def berth_wait_hours(total_berths, occupancy, queue, turnover_hours: float = BERTH_TURNOVER_HOURS) -> np.ndarray:
+    """Predicted hours until a berth is free for a vessel joining the back of the queue.
+
+    Occupied berths are assumed to free up evenly, one every
+    ``turnover_hours / total_berths`` hours, and each freed berth is taken by
+    the next vessel in the queue.
+    """
+    total_berths = np.maximum(np.asarray(total_berths, dtype=np.float64), 1.0)
+    free = total_berths - np.asarray(occupancy, dtype=np.float64)
+    ahead = np.asarray(queue, dtype=np.float64) + 1 - free  # Releases needed before our turn
+    return np.maximum(ahead, 0.0) * turnover_hours / total_berths
+
+
+def jit_speed_profile(distances, weather_factors, target_hours, min_speed=MIN_SPEED,
+                      max_speed=20.0) -> np.ndarray:
+    """Fuel-minimizing speeds per segment that cover the distance in target_hours.
+
+    ``distances`` and ``weather_factors`` have shape (vessels, segments), or
+    (vessels,) for a single segment. With consumption per mile proportional
+    to ``factor * speed ** 2`` (the cubic law over ``distance / speed`` hours),
+    the optimum keeps ``factor * speed ** 3`` equal on every segment, so
+    speeds scale with ``factor ** (-1/3)``. Segments that hit a speed limit are
+    fixed there and the rest are re-solved for the remaining time. If even
+    min_speed arrives early, the vessel waits for the rest of the time.
+    """
+    distances = np.atleast_2d(np.asarray(distances, dtype=np.float64).T).T
+    factors = np.broadcast_to(np.atleast_2d(np.asarray(weather_factors, dtype=np.float64).T).T,
+                              distances.shape)
+    target = np.asarray(target_hours, dtype=np.float64).reshape(-1, 1)
+    low = np.broadcast_to(np.asarray(min_speed, dtype=np.float64).reshape(-1, 1), distances.shape)
+    high = np.broadcast_to(np.asarray(max_speed, dtype=np.float64).reshape(-1, 1), distances.shape)
+
+    shape = factors ** (-1.0 / 3.0)
+    fixed = np.zeros(distances.shape, dtype=bool)
+    speeds = np.zeros(distances.shape)
+    for _ in range(distances.shape[1] + 1):
+        fixed_hours = np.where(fixed, distances / np.where(fixed, speeds, 1.0), 0.0).sum(axis=1, keepdims=True)
+        free_time = np.maximum(target - fixed_hours, 1e-9)
+        # Free segments: speed = k * shape, with sum(d / (k * shape)) == free_time
+        k = np.where(~fixed, distances / shape, 0.0).sum(axis=1, keepdims=True) / free_time
+        speeds = np.where(fixed, speeds, k * shape)
+        clipped = ~fixed & ((speeds < low) | (speeds > high)) & (distances > 0)
+        if not clipped.any():
+            break
+        speeds = np.where(clipped, np.clip(speeds, low, high), speeds)
+        fixed |= clipped
+    return np.clip(speeds, low, high)
+
+
+def plan_arrivals(distances, weather_factors, berth_hours, planned_hours, max_speed,
+                  min_speed=MIN_SPEED, **consumption) -> Dict[str, np.ndarray]:
+    """Just-in-time single-leg speed plan for many vessels at once.
+
+    Each vessel targets the later of its planned arrival and its predicted
+    berth time, but never sooner than max_speed allows (``feasible`` is False
+    where even max_speed is too slow). Fuel is compared with sailing at the
+    planned speed and then waiting for the berth at anchor.
+    """
+    distances = np.asarray(distances, dtype=np.float64)
+    weather_factors = np.asarray(weather_factors, dtype=np.float64)
+    berth_hours = np.asarray(berth_hours, dtype=np.float64)
+    planned_hours = np.asarray(planned_hours, dtype=np.float64)
+    max_speed = np.asarray(max_speed, dtype=np.float64)
+
+    earliest = distances / max_speed
+    wanted = np.maximum(berth_hours, planned_hours)
+    target = np.maximum(wanted, earliest)
+    speed = jit_speed_profile(distances, weather_factors, target, min_speed, max_speed)[:, 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sailing_hours = np.where(speed > 0, distances / speed, 0.0)
+        planned_speed = np.clip(np.where(planned_hours > 0, distances / planned_hours, max_speed),
+                                min_speed, max_speed)
+        planned_sailing = np.where(planned_speed > 0, distances / planned_speed, 0.0)
+
+    fuel = daily_consumption(speed, weather_factors, **consumption) / 24 * sailing_hours
+    fuel_at_planned = daily_consumption(planned_speed, weather_factors, **consumption) / 24 * planned_sailing
+    return {
+        'target_hours': target,
+        'feasible': earliest <= wanted + 1e-9,  # Can make the wanted arrival within max_speed
+        'speed': speed,
+        'sailing_hours': sailing_hours,
+        'waiting_hours': np.maximum(target - sailing_hours, 0.0),
+        'fuel': fuel,
+        'fuel_at_planned_speed': fuel_at_planned,
+        'fuel_saving': fuel_at_planned - fuel
+    }
+
+
+def plan_fleet_arrivals(vessels: Sequence, port_congestion: Mapping[str, Mapping],
+                        now: Optional[datetime] = None,
+                        turnover_hours: float = BERTH_TURNOVER_HOURS) -> Dict[str, np.ndarray]:
+    """Just-in-time plan for every vessel at sea heading to a port with congestion data.
+
+    Remaining distance is the great-circle distance to the destination port,
+    berth times come from ``port_congestion`` (total berths, occupancy,
+    queue) and the planned arrival from each vessel's current ETA. Returns
+    the plan_arrivals columns plus ``vessel`` (index into vessels),
+    ``distance`` and ``berth_hours``.
+    """
+    now = now or datetime.now()
+    registry = get_port_registry()
+    rows = [i for i, vessel in enumerate(vessels)
+            if vessel.status.name in EN_ROUTE_STATUSES
+            and vessel.destination in port_congestion and vessel.destination in registry]
+    en_route = [vessels[i] for i in rows]
+
+    ports = [port_congestion[v.destination] for v in en_route]
+    port_ids = registry.ids(v.destination for v in en_route)
+    slots = np.array([v.slot for v in en_route], dtype=np.intp)
+    fleets = {id(v.fleet): v.fleet for v in en_route}
+    if len(fleets) == 1:
+        fleet = next(iter(fleets.values()))
+        lat, lon, max_speed = fleet.lat[slots], fleet.lon[slots], fleet.max_speed[slots]
+    else:
+        lat = np.array([v.position[0] for v in en_route])
+        lon = np.array([v.position[1] for v in en_route])
+        max_speed = np.array([v.max_speed for v in en_route], dtype=np.float64)
+
+    distance = geo.haversine_nm(lat, lon, registry.lat[port_ids], registry.lon[port_ids])
+    berth = berth_wait_hours([p['total_berths'] for p in ports], [p['current_occupancy'] for p in ports],
+                             [p['queue'] for p in ports], turnover_hours)
+    planned = np.array([max((v.current_eta - now).total_seconds() / 3600, 0.0) for v in en_route])
+    weather = WEATHER_FACTORS[[WEATHER_CONDITIONS.index(v.current_weather.name) for v in en_route]]
+
+    plan = plan_arrivals(
+        distance, weather, berth, planned, np.maximum(max_speed, MIN_SPEED),
+        load_percentage=np.array([v.load_percentage for v in en_route], dtype=np.float64),
+        hull_efficiency=np.array([v.hull_efficiency for v in en_route], dtype=np.float64),
+        multiplier=np.array([v.consumption_multiplier() for v in en_route], dtype=np.float64)
+    )
+    plan.update(vessel=np.array(rows, dtype=np.intp), distance=distance, berth_hours=berth)
+    return plan
@@ -0,0 +1,65 @@
+from typing import Optional
+
+import numpy as np
+
+# Folium/Leaflet world width in pixels at zoom 0
+TILE_SIZE = 256
+
+
+def simplify_track(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """Douglas-Peucker simplification of an (n, 2) track.
+
+    Keeps the end points and every vertex farther than ``tolerance`` (in the
+    units of the points) from the simplified line. Iterative, with the
+    point-to-segment distances of each span computed in one vector operation.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    n = len(points)
+    if n < 3 or tolerance <= 0:
+        return points.copy()
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+
+        inner = points[start + 1:end]
+        segment = points[end] - points[start]
+        offset = inner - points[start]
+        length_sq = segment @ segment
+        if length_sq == 0:
+            distances = np.hypot(offset[:, 0], offset[:, 1])
+        else:
+            # Distance to the segment, clamped to its end points
+            t = np.clip(offset @ segment / length_sq, 0.0, 1.0)
+            nearest = offset - t[:, np.newaxis] * segment
+            distances = np.hypot(nearest[:, 0], nearest[:, 1])
+
+        index = int(np.argmax(distances))
+        if distances[index] > tolerance:
+            split = start + 1 + index
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+
+    return points[keep]
+
+
+def zoom_tolerance(zoom: float, pixels: float = 1.0) -> float:
+    """Tolerance in degrees matching a number of screen pixels at a map zoom level"""
+    return pixels * 360.0 / (TILE_SIZE * 2 ** zoom)
+
+
+def simplify_for_zoom(points: np.ndarray, zoom: float, max_points: Optional[int] = 300,
+                      pixels: float = 1.0) -> np.ndarray:
+    """Simplify a track for display at a zoom level, capped at max_points vertices"""
+    tolerance = zoom_tolerance(zoom, pixels)
+    simplified = simplify_track(points, tolerance)
+    while max_points and len(simplified) > max_points:
+        tolerance *= 2
+        simplified = simplify_track(simplified, tolerance)
+    return simplified
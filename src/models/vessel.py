@@ -1,19 +1,32 @@
 import sys
 import os
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Dict, List, Tuple, Optional
 from abc import ABC, abstractmethod
 
+import numpy as np
+
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.utils.config import STORMGLASS_API_KEY
-from src.utils.weather_api import WeatherAPI
+from src.utils import geo
 from .types import (
     WeatherCondition, VesselStatus, PortCongestion,
     WeatherForecast, VoyageData
 )
+from .ring_buffer import RingBuffer
+from .fleet_state import FleetState
+from .engine_monitor import evaluate_engine_alerts, format_alerts, StreamingAnomalyDetector
+from .view_cache import cached_view, format_cache_stats
+from .forecast_store import ForecastStore
+from .track import simplify_for_zoom
+from . import consumption
+from .voyage_history import VoyageHistory
+from .cost_engine import compute_voyage_costs
+from .port_registry import PortCostsView, get_port_registry
+from .delay_ledger import DelayLedger
 
 class VesselStatus(Enum):
     EN_ROUTE = "En Route"
@@ -67,21 +80,76 @@ class WeatherForecast:
 
 
 class EngineStatus:
-    def __init__(self):
-        self.rpm = 0.0
-        self.load = 0.0  # percentage
-        self.fuel_pressure = 0.0  # bar
-        self.temperature = 0.0  # Celsius
-        self.readings_history: List[Dict] = []  # για trend analysis
+    READING_COLUMNS = ('timestamp', 'rpm', 'load', 'pressure', 'temp')
+
+    def __init__(self, history_size: int = 100, fleet: Optional[FleetState] = None,
+                 slot: Optional[int] = None,
+                 detector: Optional[StreamingAnomalyDetector] = None):
+        # Current values are views over the vessel's fleet state engine row
+        if fleet is None:
+            fleet = FleetState(capacity=1)
+            slot = fleet.add(0.0, 0.0)
+        self.fleet = fleet
+        self.slot = slot
+        # Ring buffer for trend analysis, timestamps in epoch seconds
+        self.readings = RingBuffer(self.READING_COLUMNS, capacity=history_size)
+        # Incremental drift/spike detection, O(1) per reading
+        self.detector = detector if detector is not None else StreamingAnomalyDetector()
+
+    @property
+    def rpm(self) -> float:
+        return float(self.fleet.engine[self.slot, 0])
+
+    @rpm.setter
+    def rpm(self, value: float) -> None:
+        self.fleet.engine[self.slot, 0] = value
+        self.fleet.touch(self.slot)
+
+    @property
+    def load(self) -> float:
+        """Engine load in percentage"""
+        return float(self.fleet.engine[self.slot, 1])
+
+    @load.setter
+    def load(self, value: float) -> None:
+        self.fleet.engine[self.slot, 1] = value
+        self.fleet.touch(self.slot)
+
+    @property
+    def fuel_pressure(self) -> float:
+        """Fuel pressure in bar"""
+        return float(self.fleet.engine[self.slot, 2])
+
+    @fuel_pressure.setter
+    def fuel_pressure(self, value: float) -> None:
+        self.fleet.engine[self.slot, 2] = value
+        self.fleet.touch(self.slot)
+
+    @property
+    def temperature(self) -> float:
+        """Temperature in Celsius"""
+        return float(self.fleet.engine[self.slot, 3])
+
+    @temperature.setter
+    def temperature(self, value: float) -> None:
+        self.fleet.engine[self.slot, 3] = value
+        self.fleet.touch(self.slot)
 
     def add_reading(self, reading: Dict):
-        """Add a new reading to history"""
-        self.readings_history.append({
-            'timestamp': datetime.now(),
-            **reading
-        })
-        if len(self.readings_history) > 100:  # Keep only last 100 readings
-            self.readings_history.pop(0)
+        """Add a new reading to history and update the anomaly detector"""
+        values = (reading['rpm'], reading['load'], reading['pressure'], reading['temp'])
+        self.readings.append((time.time(),) + values)
+        self.detector.update(values)
+
+    @property
+    def anomaly(self) -> Dict:
+        """Streaming anomaly report for the latest reading"""
+        return self.detector.last_report
+
+    @property
+    def readings_history(self) -> Dict[str, np.ndarray]:
+        """Zero-copy views of the stored readings, keyed by column"""
+        return self.readings.window()
 
 
 class BaseVessel:
@@ -101,27 +169,30 @@ class BaseVessel:
     }
 
     def __init__(self, name: str, lat: float, lon: float, destination: str,
-                 eta: datetime, cargo_status: str, fuel_level: float):
+                 eta: datetime, cargo_status: str, fuel_level: float,
+                 fleet: Optional[FleetState] = None):
+        # Derived views are cached until the vessel or its fleet row changes
+        self._version = 0
+        self._view_cache: Dict[str, Tuple] = {}
+        self._view_stats: Dict[str, List[int]] = {}
+
+        # Kinematics live in a row of the (shared) fleet state
+        self.fleet = fleet if fleet is not None else FleetState(capacity=1)
+        self.slot = self.fleet.add(lat, lon, speed=12.0, max_speed=20.0, fuel_level=fuel_level)
+
         # Basic vessel info
         self.name = name
-        self.position = (lat, lon)
         self.destination = destination
         self.original_eta = eta
         self.current_eta = eta
         self.cargo_status = cargo_status
-        self.fuel_level = fuel_level
         self.status = self._determine_status()
 
         # Route and Weather
         self.route: List[Tuple[float, float]] = []
-        self.weather_forecasts: List[WeatherForecast] = []
+        self.weather_forecasts = ForecastStore()
         self.current_weather = WeatherCondition.CALM
 
-        # Tracking and History
-        self.track_history: List[Tuple[float, float]] = []
-        self.speed_history: List[float] = []
-        self.heading = 0.0
-
         # Port status monitoring
         self.port_status = {
             'congestion_level': PortCongestion.NONE,
@@ -130,32 +201,23 @@ class BaseVessel:
             'estimated_waiting_time': timedelta(minutes=0)
         }
 
-        # Performance metrics
-        self.speed = 12.0  # Default speed in knots
-        self.max_speed = 20.0
+        # Performance metrics (speed defaults to 12 knots, max 20)
         self.load_percentage = 70.0
         self.hull_efficiency = 95.0
         self.distance_traveled = 0.0
 
         # New attributes for real-time metrics
         self.optimal_speed = 12.0  # Default optimal speed
+        self.jit_speed: Optional[float] = None  # Just-in-time arrival speed from the speed planner
         self.current_consumption = 0.0  # Current fuel consumption
         self.baseline_consumption = 0.0  # Baseline fuel consumption
         self.eta_deviation = 0  # Hours of deviation from original ETA
 
-        # Engine monitoring
-        self.engine = EngineStatus()
-        self.normal_parameters = {
-            'rpm_range': (70, 90),
-            'load_range': (60, 85),
-            'pressure_range': (7.5, 8.5),
-            'temp_range': (75, 85)
-        }
+        # Engine monitoring, normal ranges live in the fleet state row
+        self.engine = EngineStatus(fleet=self.fleet, slot=self.slot)
 
-        # Delays and costs
-        self.current_delay = timedelta(minutes=0)
-        self.delay_history: List[Dict] = []
-        self.total_delay_cost = 0.0
+        # Delays and costs, aggregated in a bounded columnar ledger
+        self.delays = DelayLedger(conditions=WeatherCondition)
 
         # Historical data
         self.historical_consumption = []
@@ -163,16 +225,157 @@ class BaseVessel:
         self._initialize_historical_data()
 
         # Voyage historical data
-        self.voyage_history: List[VoyageData] = []
+        self.voyage_history = VoyageHistory()
         self.fuel_cost_per_ton = 750.0  # USD per ton
-        self.port_costs = {
-            "Piraeus": {"docking": 1000, "daily_rate": 500},
-            "Santorini": {"docking": 800, "daily_rate": 400},
-            "Heraklion": {"docking": 900, "daily_rate": 450}
-        }
+        # Shared read-only view of the port registry tariffs (a plain dict also works)
+        self.port_costs = get_port_registry().port_costs
+        self._voyage_costs: Dict[int, Tuple] = {}
+
+    def __setattr__(self, name, value):
+        # Any public attribute assignment invalidates the cached views
+        if not name.startswith('_'):
+            self._version += 1
+        super().__setattr__(name, value)
+
+    def _invalidate(self) -> None:
+        """Invalidate cached views after an in-place change to a container attribute"""
+        self._version += 1
+
+    def _cache_key(self) -> Tuple[int, int]:
+        return self._version, int(self.fleet.version[self.slot])
+
+    def cache_info(self) -> Dict[str, Dict[str, float]]:
+        """Hit/miss counters of the cached derived views"""
+        return format_cache_stats(self._view_stats)
+
+    # Kinematic fields are views over the vessel's fleet state row
+    @property
+    def position(self) -> Tuple[float, float]:
+        return float(self.fleet.lat[self.slot]), float(self.fleet.lon[self.slot])
+
+    @position.setter
+    def position(self, value: Tuple[float, float]) -> None:
+        self.fleet.lat[self.slot], self.fleet.lon[self.slot] = value
+
+    @property
+    def speed(self) -> float:
+        return float(self.fleet.speed[self.slot])
+
+    @speed.setter
+    def speed(self, value: float) -> None:
+        self.fleet.speed[self.slot] = value
+
+    @property
+    def max_speed(self) -> float:
+        return float(self.fleet.max_speed[self.slot])
+
+    @max_speed.setter
+    def max_speed(self, value: float) -> None:
+        self.fleet.max_speed[self.slot] = value
+
+    @property
+    def heading(self) -> float:
+        return float(self.fleet.heading[self.slot])
+
+    @heading.setter
+    def heading(self, value: float) -> None:
+        self.fleet.heading[self.slot] = value
+
+    @property
+    def fuel_level(self) -> float:
+        return float(self.fleet.fuel_level[self.slot])
+
+    @fuel_level.setter
+    def fuel_level(self, value: float) -> None:
+        self.fleet.fuel_level[self.slot] = value
+
+    @property
+    def track_history(self) -> np.ndarray:
+        """Recent positions as an (n, 2) array of lat/lon, oldest first"""
+        return self.fleet.track.get(self.slot)
+
+    @track_history.setter
+    def track_history(self, positions: List[Tuple[float, float]]) -> None:
+        self.fleet.track.reset(self.slot)
+        slot = np.array([self.slot])
+        for position in positions:
+            self.fleet.track.append(slot, np.asarray(position)[np.newaxis])
+
+    @property
+    def track_length(self) -> float:
+        """Sailed distance over the retained track, in nautical miles"""
+        return geo.path_length_nm(self.track_history)
+
+    @property
+    def track_efficiency(self) -> float:
+        """Direct distance over sailed distance for the retained track"""
+        return geo.route_efficiency(self.track_history)
+
+    def simplified_track(self, zoom: float, max_points: Optional[int] = 300) -> np.ndarray:
+        """Track simplified for display at a map zoom level"""
+        return simplify_for_zoom(self.track_history, zoom, max_points)
+
+    @property
+    def speed_history(self) -> np.ndarray:
+        """Recent speeds, oldest first"""
+        return self.fleet.speed_history.get(self.slot)
+
+    @speed_history.setter
+    def speed_history(self, speeds: List[float]) -> None:
+        self.fleet.speed_history.reset(self.slot)
+        slot = np.array([self.slot])
+        for speed in speeds:
+            self.fleet.speed_history.append(slot, np.array([speed]))
+
+    @property
+    def current_delay(self) -> timedelta:
+        return self.delays.total_duration
+
+    @property
+    def total_delay_cost(self) -> float:
+        return self.delays.total_cost
+
+    @property
+    def delay_history(self) -> List[Dict]:
+        """Retained delay events as dicts, oldest first"""
+        return self.delays.entries()
+
+    @property
+    def voyage_history(self) -> VoyageHistory:
+        """Voyages sorted by start date, indexed by route and month"""
+        return self._voyages
+
+    @voyage_history.setter
+    def voyage_history(self, voyages) -> None:
+        self._voyages = voyages if isinstance(voyages, VoyageHistory) else VoyageHistory(voyages)
+
+    @property
+    def weather_forecasts(self) -> ForecastStore:
+        """Forecasts sorted by time, supporting window queries"""
+        return self._forecasts
+
+    @weather_forecasts.setter
+    def weather_forecasts(self, forecasts) -> None:
+        self._forecasts = forecasts if isinstance(forecasts, ForecastStore) else ForecastStore(forecasts)
+
+    @property
+    def normal_parameters(self) -> Dict[str, Tuple[float, float]]:
+        """Normal engine parameter ranges, keyed as '<parameter>_range'"""
+        limits = self.fleet.engine_limits[self.slot].tolist()
+        return {f"{name}_range": tuple(limits[i])
+                for i, name in enumerate(FleetState.ENGINE_PARAMETERS)}
+
+    @normal_parameters.setter
+    def normal_parameters(self, ranges: Dict[str, Tuple[float, float]]) -> None:
+        for i, name in enumerate(FleetState.ENGINE_PARAMETERS):
+            if f"{name}_range" in ranges:
+                self.fleet.engine_limits[self.slot, i] = ranges[f"{name}_range"]
 
     def calculate_optimal_speed(self) -> float:
-        """Calculate optimal speed based on conditions"""
+        """Calculate optimal speed based on conditions, or the planned just-in-time speed"""
+        if self.jit_speed is not None:
+            return round(self.jit_speed, 1)
+
         base_optimal = 12.0
         weather_factor = self.WEATHER_IMPACT[self.current_weather]
         cargo_factor = 1.0 - (self.load_percentage - 70) / 100 * 0.2
@@ -199,7 +402,8 @@ class BaseVessel:
 
     def add_voyage(self, voyage: VoyageData) -> None:
         """Add a new voyage to vessel's history"""
-        self.voyage_history.append(voyage)
+        self.voyage_history.add(voyage)
+        self._invalidate()
 
     def get_voyage_history(self, start_date: Optional[datetime] = None,
                            end_date: Optional[datetime] = None) -> List[VoyageData]:
@@ -207,46 +411,25 @@ class BaseVessel:
         if not (start_date and end_date):
             return self.voyage_history
 
-        return [
-            voyage for voyage in self.voyage_history
-            if start_date <= voyage.start_date <= end_date
-        ]
+        return self.voyage_history.between(start_date, end_date)
 
     def calculate_voyage_costs(self, voyage: VoyageData) -> Dict[str, float]:
         """Calculate detailed costs for a specific voyage"""
-        # Fuel costs
-        fuel_cost = voyage.fuel_consumption * self.fuel_cost_per_ton
-
-        # Port costs and port delay costs
-        port_costs = 0.0
-        port_delay_costs = 0.0
-
-        for port in [voyage.origin] + voyage.intermediate_stops + [voyage.destination]:
-            if port in self.port_costs:
-                port_data = self.port_costs[port]
-                waiting_time = voyage.port_waiting_times.get(port, timedelta(0))
-                days_waiting = waiting_time.total_seconds() / (24 * 3600)
-
-                port_costs += port_data["docking"]
-                port_costs += port_data["daily_rate"] * days_waiting
-                port_delay_costs += waiting_time.total_seconds() / 3600 * 500  # $500 per hour
-
-        # Schedule deviation costs (if voyage was delayed overall)
-        schedule_deviation_costs = 0.0
-        if voyage.actual_arrival_time and voyage.actual_arrival_time > voyage.end_date:
-            total_delay = (voyage.actual_arrival_time - voyage.end_date).total_seconds() / 3600
-            schedule_deviation_costs = total_delay * 750  # Higher rate for overall delay
-
-        total_cost = fuel_cost + port_costs + port_delay_costs + schedule_deviation_costs
-
-        return {
-            "fuel_cost": fuel_cost,
-            "port_costs": port_costs,
-            "port_delay_costs": port_delay_costs,
-            "schedule_deviation_costs": schedule_deviation_costs,
-            "total_cost": total_cost,
-            "cost_per_mile": total_cost / voyage.distance
-        }
+        # Cached per voyage until the fuel price or a visited port's tariff changes
+        key = None
+        if isinstance(self.port_costs, PortCostsView):
+            ports = [voyage.origin] + voyage.intermediate_stops + [voyage.destination]
+            key = (self.fuel_cost_per_ton, self.port_costs.registry.versions(ports))
+            entry = self._voyage_costs.get(id(voyage))
+            if entry is not None and entry[0] is voyage and entry[1] == key:
+                return dict(entry[2])
+
+        # Single-row view over the batch cost engine
+        costs = compute_voyage_costs([(self, voyage)])
+        costs = {column: float(values[0]) for column, values in costs.items()}
+        if key is not None:
+            self._voyage_costs[id(voyage)] = (voyage, key, costs)
+        return dict(costs)
 
     def get_efficiency_metrics_by_voyage(self, voyage: VoyageData) -> Dict[str, float]:
         """Get detailed efficiency metrics for a specific voyage"""
@@ -260,73 +443,6 @@ class BaseVessel:
             "cargo_load": voyage.cargo_load,
             "total_cost": costs["total_cost"]
         }
-    pass
-
-    def __init__(self, name: str, lat: float, lon: float, destination: str,
-                 eta: datetime, cargo_status: str, fuel_level: float):
-        # Basic vessel info
-        self.name = name
-        self.position = (lat, lon)
-        self.destination = destination
-        self.original_eta = eta
-        self.current_eta = eta
-        self.cargo_status = cargo_status
-        self.fuel_level = fuel_level
-        self.status = self._determine_status()
-
-        # Route and Weather
-        self.route: List[Tuple[float, float]] = []
-        self.weather_forecasts: List[WeatherForecast] = []
-        self.current_weather = WeatherCondition.CALM
-
-        # Tracking and History
-        self.track_history: List[Tuple[float, float]] = []  # Added track_history
-        self.speed_history: List[float] = []  # Added speed_history
-        self.heading = 0.0  # Added heading for vessel direction
-
-        # Port status monitoring
-        self.port_status = {
-            'congestion_level': PortCongestion.NONE,
-            'available_berths': 0,
-            'queue_position': None,
-            'estimated_waiting_time': timedelta(minutes=0)
-        }
-
-        # Performance metrics
-        self.speed = 12.0  # Default speed in knots
-        self.max_speed = 20.0
-        self.load_percentage = 70.0
-        self.hull_efficiency = 95.0
-        self.distance_traveled = 0.0
-
-        # Engine monitoring
-        self.engine = EngineStatus()
-        self.normal_parameters = {
-            'rpm_range': (70, 90),
-            'load_range': (60, 85),
-            'pressure_range': (7.5, 8.5),
-            'temp_range': (75, 85)
-        }
-
-        # Delays and costs
-        self.current_delay = timedelta(minutes=0)
-        self.delay_history: List[Dict] = []
-        self.total_delay_cost = 0.0
-
-        # Historical data
-        self.historical_consumption = []
-        self.historical_speeds = []
-        self._initialize_historical_data()
-
-        # Voyage historical data
-        self.voyage_history: List[VoyageData] = []
-        self.fuel_cost_per_ton = 750.0  # USD per ton
-        self.port_costs = {
-            "Piraeus": {"docking": 1000, "daily_rate": 500},
-            "Santorini": {"docking": 800, "daily_rate": 400},
-            "Heraklion": {"docking": 900, "daily_rate": 450}
-        }
-
     def update_port_status(self, congestion_level: PortCongestion,
                            available_berths: int, queue_position: int = None) -> None:
         """Update port status and calculate delays"""
@@ -348,6 +464,7 @@ class BaseVessel:
             base_waiting_time *= queue_position
 
         self.port_status['estimated_waiting_time'] = timedelta(minutes=base_waiting_time)
+        self._invalidate()
 
         # Add delay if there's congestion
         if congestion_level != PortCongestion.NONE:
@@ -373,27 +490,24 @@ class BaseVessel:
                 'alerts': []
             }
 
-        # Get only relevant forecasts
-        time_to_arrival = (self.current_eta - datetime.now()).total_seconds() / 3600
-        relevant_forecasts = [f for f in self.weather_forecasts
-                              if (f.timestamp - datetime.now()).total_seconds() / 3600 <= time_to_arrival]
+        # Get only relevant forecasts (up to the ETA)
+        relevant_forecasts = self.weather_forecasts.until(self.current_eta)
 
         # Get conditions for next few hours
-        next_hours = relevant_forecasts[:3] if len(relevant_forecasts) > 3 else relevant_forecasts
+        next_hours = relevant_forecasts[:3]
 
         # Get conditions near destination (last hour)
         destination_forecast = relevant_forecasts[-1] if relevant_forecasts else None
 
         # Check for severe weather alerts
-        alerts = []
-        for forecast in relevant_forecasts:
-            if forecast.condition in [WeatherCondition.ROUGH, WeatherCondition.SEVERE]:
-                alerts.append({
-                    'time': forecast.timestamp,
-                    'condition': forecast.condition.value,
-                    'wind_speed': forecast.wind_speed,
-                    'wave_height': forecast.wave_height
-                })
+        alerts = [
+            {
+                'time': forecast.timestamp,
+                'condition': forecast.condition.value,
+                'wind_speed': forecast.wind_speed,
+                'wave_height': forecast.wave_height
+            } for forecast in self.weather_forecasts.alerts(end=self.current_eta)
+        ]
 
         return {
             'current': self.current_weather.value,
@@ -455,76 +569,23 @@ class BaseVessel:
         """Check if vessel is delayed"""
         return datetime.now() > self.current_eta
 
+    @cached_view
     def calculate_weather_delay(self) -> timedelta:
         """Calculate potential delay based on weather forecasts"""
-        total_delay = timedelta(minutes=0)
-
-        for forecast in self.weather_forecasts:
-            if forecast.condition == WeatherCondition.ROUGH:
-                total_delay += timedelta(minutes=30)
-            elif forecast.condition == WeatherCondition.SEVERE:
-                total_delay += timedelta(minutes=60)
-
-        return total_delay
+        # Prefix sums over the forecast store, no scan
+        return self.weather_forecasts.delay()
 
     def add_delay(self, duration: timedelta, reason: str, cost: float):
         """Add a new delay event"""
-        self.current_delay += duration
-        self.delay_history.append({
-            'timestamp': datetime.now(),
-            'duration': duration,
-            'reason': reason,
-            'cost': cost,
-            'weather': self.current_weather
-        })
-        self.total_delay_cost += cost
+        self.delays.add(duration, reason, cost, self.current_weather)
         self.current_eta = self.original_eta + self.current_delay
+        self._invalidate()
 
+    @cached_view
     def check_engine_parameters(self) -> Dict[str, any]:
         """Check all engine parameters for anomalies"""
-        alerts = []
-
-        # RPM Check
-        if not (self.normal_parameters['rpm_range'][0] <= self.engine.rpm <=
-                self.normal_parameters['rpm_range'][1]):
-            alerts.append({
-                'parameter': 'RPM',
-                'value': self.engine.rpm,
-                'normal_range': self.normal_parameters['rpm_range'],
-                'severity': 'high' if abs(self.engine.rpm -
-                                          sum(self.normal_parameters['rpm_range']) / 2) > 15 else 'medium'
-            })
-
-        # Load Check
-        if not (self.normal_parameters['load_range'][0] <= self.engine.load <=
-                self.normal_parameters['load_range'][1]):
-            alerts.append({
-                'parameter': 'Engine Load',
-                'value': self.engine.load,
-                'normal_range': self.normal_parameters['load_range'],
-                'severity': 'high' if self.engine.load > 90 else 'medium'
-            })
-
-        # Pressure Check
-        if not (self.normal_parameters['pressure_range'][0] <= self.engine.fuel_pressure <=
-                self.normal_parameters['pressure_range'][1]):
-            alerts.append({
-                'parameter': 'Fuel Pressure',
-                'value': self.engine.fuel_pressure,
-                'normal_range': self.normal_parameters['pressure_range'],
-                'severity': 'high'
-            })
-
-        # Temperature Check
-        if not (self.normal_parameters['temp_range'][0] <= self.engine.temperature <=
-                self.normal_parameters['temp_range'][1]):
-            alerts.append({
-                'parameter': 'Temperature',
-                'value': self.engine.temperature,
-                'normal_range': self.normal_parameters['temp_range'],
-                'severity': 'high' if self.engine.temperature >
-                                      self.normal_parameters['temp_range'][1] + 10 else 'medium'
-            })
+        # Single-row view over the fleet-wide evaluator
+        alerts = format_alerts(self.fleet, evaluate_engine_alerts(self.fleet, [self.slot]))
 
         return {
             'has_alerts': len(alerts) > 0,
@@ -537,6 +598,7 @@ class BaseVessel:
             }
         }
 
+    @cached_view
     def get_efficiency_metrics(self) -> Dict[str, float]:
         """Get comprehensive efficiency metrics"""
         return {
@@ -557,12 +619,50 @@ class BaseVessel:
 
     def _calculate_daily_consumption(self) -> float:
         """Calculate daily fuel consumption in tons"""
-        speed_factor = (self.speed / 12.0) ** 3  # Cubic relationship with speed
-        weather_factor = self.WEATHER_IMPACT[self.current_weather]
-        load_factor = 1 + (self.load_percentage - 70) / 100 * 0.2
-        hull_factor = 100 / self.hull_efficiency
+        # Cubic relationship with speed, see consumption.daily_consumption
+        return float(consumption.daily_consumption(
+            self.speed, self.WEATHER_IMPACT[self.current_weather],
+            self.load_percentage, self.hull_efficiency
+        ))
+
+    def consumption_multiplier(self) -> float:
+        """Vessel-type specific multiplier on the base consumption"""
+        return 1.0
+
+    def consumption_profile(self, speeds, conditions=None, loads=None,
+                            per_mile: bool = False) -> np.ndarray:
+        """Consumption over speed x weather x load scenarios, shape (speeds, conditions, loads)"""
+        return consumption.consumption_grid([self], speeds, conditions, loads, per_mile)[0]
+
+    def check_consumption_anomaly(self, threshold: float = 15.0) -> Dict[str, any]:
+        """Compare current consumption with the historical baseline and explain the deviation"""
+        current = self._calculate_consumption_per_mile()
+        expected = self._get_average_efficiency()
+        deviation = (current - expected) / expected * 100 if expected else 0.0
+
+        # Impact of each factor on consumption per mile, in percent
+        factors = {
+            "speed": ((self.speed / 12.0) ** 2 - 1) * 100,
+            "weather": (self.WEATHER_IMPACT[self.current_weather] - 1) * 100,
+            "cargo_load": (self.load_percentage - 70) / 100 * 0.2 * 100,
+            "hull_condition": (100 / self.hull_efficiency - 1) * 100 if self.hull_efficiency else 0.0
+        }
 
-        return 30.0 * speed_factor * weather_factor * load_factor * hull_factor
+        # Engine parameters flagged by the streaming detector
+        engine_anomaly = self.engine.anomaly
+        for parameter, impact in engine_anomaly['contributing_factors'].items():
+            factors[f"engine_{parameter}"] = impact
+
+        return {
+            "is_anomaly": abs(deviation) > threshold or engine_anomaly['has_anomaly'],
+            "current_consumption": current,
+            "expected_consumption": expected,
+            "deviation_percentage": deviation,
+            "engine_anomaly": engine_anomaly['anomaly_type'],
+            "contributing_factors": {
+                factor: impact for factor, impact in factors.items() if abs(impact) >= 1.0
+            }
+        }
 
     def _get_average_efficiency(self) -> float:
         """Calculate average historical consumption per mile"""
@@ -572,6 +672,7 @@ class BaseVessel:
                         in zip(self.historical_consumption, self.historical_speeds)]
         return sum(efficiencies) / len(efficiencies)
 
+    @cached_view
     def get_status_info(self) -> Dict:
         """Get comprehensive vessel status including delays and weather"""
         weather_delay = self.calculate_weather_delay()
@@ -641,27 +742,22 @@ class BaseVessel:
         if wind_speed > 20:
             self.fuel_consumption *= 1.2  # Increase fuel consumption in strong winds
 
-            def update_weather_data(self):
-                """Update vessel weather data from API"""
-                weather_api = WeatherAPI(STORMGLASS_API_KEY)
-                weather_data = weather_api.get_vessel_weather_data(
-                    self.position[0],
-                    self.position[1]
-                )
-
-                self.current_weather = weather_data['current_weather']
-                self.weather_forecasts = weather_data['weather_forecasts']
+    def update_weather_data(self, weather_data: Dict) -> None:
+        """Apply weather from WeatherAPI: current condition, forecasts, wave height and wind"""
+        self.current_weather = WeatherCondition[weather_data['current_weather'].name]
+        self.weather_forecasts = weather_data['weather_forecasts']
 
-                # Update vessel parameters based on weather
-                self.update_weather_conditions({
-                    'wave_height': weather_data['wave_height'],
-                    'wind_speed': weather_data['wind_speed']
-                })
+        # Update vessel parameters based on weather
+        self.update_weather_conditions({
+            'wave_height': weather_data['wave_height'],
+            'wind_speed': weather_data['wind_speed']
+        })
 
 class Vessel(BaseVessel, ABC):
     def __init__(self, name: str, lat: float, lon: float, destination: str,
-                 eta: datetime, cargo_status: str, fuel_level: float):
-        super().__init__(name, lat, lon, destination, eta, cargo_status, fuel_level)
+                 eta: datetime, cargo_status: str, fuel_level: float,
+                 fleet: Optional[FleetState] = None):
+        super().__init__(name, lat, lon, destination, eta, cargo_status, fuel_level, fleet)
 
     @abstractmethod
     def calculate_specific_consumption(self) -> float:
@@ -676,19 +772,19 @@ class Vessel(BaseVessel, ABC):
 class TankerVessel(Vessel):
     def __init__(self, name: str, lat: float, lon: float, destination: str,
                  eta: datetime, cargo_status: str, fuel_level: float,
-                 tank_type: str, cargo_capacity: float):
-        super().__init__(name, lat, lon, destination, eta, cargo_status, fuel_level)
+                 tank_type: str, cargo_capacity: float, fleet: Optional[FleetState] = None):
+        super().__init__(name, lat, lon, destination, eta, cargo_status, fuel_level, fleet)
         self.tank_type = tank_type
         self.cargo_capacity = cargo_capacity
         self.tank_cleaning_status = "clean"
         self.cargo_temperature = None
         self.heating_required = False
 
+    def consumption_multiplier(self) -> float:
+        return 1.15 if self.heating_required else 1.0
+
     def calculate_specific_consumption(self) -> float:
-        base_consumption = self._calculate_daily_consumption()
-        if self.heating_required:
-            base_consumption *= 1.15
-        return base_consumption
+        return self._calculate_daily_consumption() * self.consumption_multiplier()
 
     def get_vessel_specific_info(self) -> Dict[str, any]:
         return {
@@ -702,18 +798,18 @@ class TankerVessel(Vessel):
 class BulkCarrierVessel(Vessel):
     def __init__(self, name: str, lat: float, lon: float, destination: str,
                  eta: datetime, cargo_status: str, fuel_level: float,
-                 hold_count: int, hatch_type: str):
-        super().__init__(name, lat, lon, destination, eta, cargo_status, fuel_level)
+                 hold_count: int, hatch_type: str, fleet: Optional[FleetState] = None):
+        super().__init__(name, lat, lon, destination, eta, cargo_status, fuel_level, fleet)
         self.hold_count = hold_count
         self.hatch_type = hatch_type
         self.ballast_condition = "normal"
         self.hold_cleaning_status = ["clean"] * hold_count
 
+    def consumption_multiplier(self) -> float:
+        return 1.1 if self.ballast_condition == "heavy" else 1.0
+
     def calculate_specific_consumption(self) -> float:
-        base_consumption = self._calculate_daily_consumption()
-        if self.ballast_condition == "heavy":
-            base_consumption *= 1.1
-        return base_consumption
+        return self._calculate_daily_consumption() * self.consumption_multiplier()
 
     def get_vessel_specific_info(self) -> Dict[str, any]:
         return {
@@ -0,0 +1,40 @@
+import functools
+from typing import Callable, Dict
+
+
+def cached_view(method: Callable) -> Callable:
+    """Memoize a derived vessel view until the vessel or its fleet row changes.
+
+    The owner must provide ``_cache_key()``, an ``_view_cache`` dict and an
+    ``_view_stats`` dict. Cached values are shared between callers and must
+    be treated as read-only.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self):
+        key = self._cache_key()
+        stats = self._view_stats.setdefault(name, [0, 0])
+        entry = self._view_cache.get(name)
+        if entry is not None and entry[0] == key:
+            stats[0] += 1
+            return entry[1]
+
+        stats[1] += 1
+        value = method(self)
+        self._view_cache[name] = (key, value)
+        return value
+
+    return wrapper
+
+
+def format_cache_stats(view_stats: Dict[str, list]) -> Dict[str, Dict[str, float]]:
+    """Turn raw [hits, misses] counters into hit/miss/hit-rate dicts"""
+    return {
+        name: {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0
+        }
+        for name, (hits, misses) in view_stats.items()
+    }
@@ -0,0 +1,141 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def _to_datetime64(values: Iterable) -> np.ndarray:
+    return np.array([np.datetime64(v, 'us') if v is not None else np.datetime64('NaT')
+                     for v in values], dtype='datetime64[us]')
+
+
+def voyage_columns(voyages: Sequence) -> Dict[str, np.ndarray]:
+    """Voyage fields as arrays, plus one row per port visit, in a single pass over the voyages.
+
+    Visit rows hold the voyage index, the port name and the hours waited there.
+    """
+    visit_voyage: List[int] = []
+    visit_port: List[str] = []
+    visit_wait: List[float] = []
+    for i, voyage in enumerate(voyages):
+        ports = [voyage.origin] + voyage.intermediate_stops + [voyage.destination]
+        waits = voyage.port_waiting_times
+        visit_voyage.extend([i] * len(ports))
+        visit_port.extend(ports)
+        visit_wait.extend(waits[port].total_seconds() / 3600 if waits.get(port) else 0.0 for port in ports)
+
+    return {
+        'fuel': np.array([v.fuel_consumption for v in voyages], dtype=np.float64),
+        'distance': np.array([v.distance for v in voyages], dtype=np.float64),
+        'end': _to_datetime64(v.end_date for v in voyages),
+        'arrival': _to_datetime64(v.actual_arrival_time for v in voyages),
+        'visit_voyage': np.array(visit_voyage, dtype=np.intp),
+        'visit_port': np.array(visit_port, dtype=object),
+        'visit_wait': np.array(visit_wait, dtype=np.float64)
+    }
+
+
+class _SortedVoyages:
+    """Voyages kept sorted by start date, with a parallel list of keys for bisect"""
+
+    def __init__(self):
+        self.starts: List[datetime] = []
+        self.voyages: List = []
+
+    def add(self, voyage) -> None:
+        # Appending in order is the common case and stays O(1)
+        if not self.starts or voyage.start_date >= self.starts[-1]:
+            index = len(self.starts)
+        else:
+            index = bisect_right(self.starts, voyage.start_date)
+        self.starts.insert(index, voyage.start_date)
+        self.voyages.insert(index, voyage)
+
+    def between(self, start: Optional[datetime], end: Optional[datetime]) -> List:
+        lo = 0 if start is None else bisect_left(self.starts, start)
+        hi = len(self.starts) if end is None else bisect_right(self.starts, end)
+        return self.voyages[lo:hi]
+
+
+class VoyageHistory:
+    """Voyages of a vessel sorted by start date, indexed by route and by month.
+
+    Date-range, route and per-month lookups are binary searches over sorted
+    lists, O(log n + k) for k results.
+    """
+
+    def __init__(self, voyages: Iterable = ()):
+        self._all = _SortedVoyages()
+        self._by_route: Dict[Tuple[str, str], _SortedVoyages] = {}
+        self._by_month: Dict[Tuple[int, int], _SortedVoyages] = {}
+        self._columns: Optional[Dict[str, np.ndarray]] = None
+        for voyage in voyages:
+            self.add(voyage)
+
+    def add(self, voyage) -> None:
+        """Insert a voyage, keeping all indexes sorted"""
+        self._all.add(voyage)
+        self._columns = None
+        route = (voyage.origin, voyage.destination)
+        self._by_route.setdefault(route, _SortedVoyages()).add(voyage)
+        month = (voyage.start_date.year, voyage.start_date.month)
+        self._by_month.setdefault(month, _SortedVoyages()).add(voyage)
+
+    # Kept for code that treats the history as a list
+    append = add
+
+    def __len__(self) -> int:
+        return len(self._all.voyages)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._all.voyages)
+
+    def __getitem__(self, index):
+        return self._all.voyages[index]
+
+    def between(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List:
+        """Voyages starting within [start, end], None meaning unbounded"""
+        return self._all.between(start, end)
+
+    def route(self, origin: str, destination: str, start: Optional[datetime] = None,
+              end: Optional[datetime] = None) -> List:
+        """Voyages on a route, optionally within a start-date range"""
+        voyages = self._by_route.get((origin, destination))
+        return voyages.between(start, end) if voyages else []
+
+    def nearest_on_route(self, origin: str, destination: str, date: datetime,
+                         tolerance: timedelta = timedelta(days=30)):
+        """Voyage on a route starting closest to a date, less than tolerance away"""
+        candidates = [voyage for voyage in self.route(origin, destination, date - tolerance, date + tolerance)
+                      if abs(voyage.start_date - date) < tolerance]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda voyage: abs(voyage.start_date - date))
+
+    def same_route_last_year(self, voyage, tolerance: timedelta = timedelta(days=30)):
+        """Voyage on the same route starting closest to 365 days earlier, less than tolerance away.
+
+        When several qualify this is the nearest one, not the first in the
+        history as the dashboard's former scan returned.
+        """
+        return self.nearest_on_route(voyage.origin, voyage.destination,
+                                     voyage.start_date - timedelta(days=365), tolerance)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """voyage_columns of the history in start-date order, built once per change.
+
+        Voyages are treated as immutable once added.
+        """
+        if self._columns is None:
+            self._columns = voyage_columns(self._all.voyages)
+        return self._columns
+
+    def month(self, year: int, month: int) -> List:
+        """Voyages starting in a calendar month"""
+        voyages = self._by_month.get((year, month))
+        return list(voyages.voyages) if voyages else []
+
+    def months(self) -> List[Tuple[int, int]]:
+        """(year, month) keys that have voyages, in order"""
+        return sorted(self._by_month)
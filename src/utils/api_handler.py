@@ -1,16 +1,24 @@
 import requests
 import random
 import logging
+import numpy as np
 import json
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 from pathlib import Path
-from functools import lru_cache  # Πρόσθεσε αυτό για το @lru_cache
 
 from src.models.vessel import (
     Vessel, WeatherCondition, PortCongestion, VoyageData, WeatherForecast  # Πρόσθεσε το WeatherForecast
 )
 from src.utils.data_manager import DataManager
+from src.models.fleet_state import FleetState
+from src.models.port_registry import get_port_registry
+from src.models.spatial_index import SpatialIndex
+from src.models.speed_planner import plan_fleet_arrivals
+from src.utils.fleet_simulator import FleetSimulator
+from src.utils.http_client import HTTPClient, get_http_client
+from src.utils.ttl_cache import TTLCache, get_ttl_cache, prune_cache_files
+from src.utils.weather_api import WeatherAPI
 from src.models.vessel import TankerVessel, BulkCarrierVessel
 
 # Configure logging
@@ -24,6 +32,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+POSITIONS_MAX_STALE = 900  # Seconds past cache_duration before a read waits for fresh positions
+POSITIONS_MAX_FILES = 48  # Position snapshots kept in the cache directory
+POSITIONS_MAX_BYTES = 50 * 1024 * 1024
+
 
 class APIError(Exception):
     """Custom exception for API related errors"""
@@ -31,9 +43,12 @@ class APIError(Exception):
 
 
 class MarineTrafficAPI:
-    def __init__(self, api_key: str = "test_key", cache_duration: int = 300):
+    def __init__(self, api_key: str = "test_key", cache_duration: int = 300,
+                 http: Optional[HTTPClient] = None, weather: Optional[WeatherAPI] = None):
         self.api_key = api_key
         self.base_url = "https://services.marinetraffic.com/api/exportvessel/v:5/"
+        self.http = http if http is not None else get_http_client()
+        self.weather = weather if weather is not None else WeatherAPI(http=self.http)
         self.cache_duration = cache_duration
         self.cache_dir = Path("cache")
         self.cache_dir.mkdir(exist_ok=True)
@@ -47,6 +62,11 @@ class MarineTrafficAPI:
         # Port congestion simulation
         self.port_congestion = self._initialize_port_congestion()
 
+        # Columnar kinematics shared by all vessels created by this handler
+        self.fleet = FleetState()
+        self.spatial_index = SpatialIndex(self.fleet)
+        self.simulator = FleetSimulator(self.fleet, index=self.spatial_index)
+
     @staticmethod
     def _initialize_weather_patterns() -> Dict[str, Dict[str, Dict[str, Any]]]:
         """Initialize realistic weather patterns for different regions"""
@@ -77,22 +97,23 @@ class MarineTrafficAPI:
 
     @staticmethod
     def _initialize_port_congestion() -> Dict[str, Dict[str, Any]]:
-        """Initialize port congestion data"""
+        """Initialize port congestion data, berths come from the port registry"""
+        registry = get_port_registry()
         return {
             "Piraeus": {
-                "total_berths": 10,
+                "total_berths": int(registry.total_berths[registry.id("Piraeus")]),
                 "current_occupancy": 7,
                 "queue": 2,
                 "congestion_level": PortCongestion.MEDIUM
             },
             "Santorini": {
-                "total_berths": 4,
+                "total_berths": int(registry.total_berths[registry.id("Santorini")]),
                 "current_occupancy": 2,
                 "queue": 0,
                 "congestion_level": PortCongestion.LOW
             },
             "Heraklion": {
-                "total_berths": 6,
+                "total_berths": int(registry.total_berths[registry.id("Heraklion")]),
                 "current_occupancy": 5,
                 "queue": 3,
                 "congestion_level": PortCongestion.HIGH
@@ -128,17 +149,30 @@ class MarineTrafficAPI:
 
         return port_data
 
-    @lru_cache(maxsize=128)
     def get_vessel_positions(self) -> List[Dict[str, Any]]:
-        """Get vessel positions from API with caching"""
-        cache_file = self.cache_dir / f"vessel_positions_{datetime.now().strftime('%Y%m%d_%H')}.json"
-
-        if cache_file.exists() and self._is_cache_valid(cache_file):
+        """Get vessel positions, refreshed in the background once older than cache_duration.
+
+        Returns copies of the cached records, so callers may modify them
+        without changing what other sessions are served.
+        """
+        cache = get_ttl_cache("vessel_positions", ttl=self.cache_duration, max_stale=POSITIONS_MAX_STALE)
+        key = (self.base_url, self.api_key)
+        if cache.peek(key) is None:
+            self._seed_positions_cache(cache, key)
+        return [dict(record) for record in cache.get(key, self._fetch_vessel_positions, ttl=self.cache_duration)]
+
+    def _seed_positions_cache(self, cache: TTLCache, key: tuple) -> None:
+        """Start from the newest positions file on disk, aged by its modification time"""
+        files = sorted(self.cache_dir.glob("vessel_positions_*.json"), key=lambda p: p.stat().st_mtime)
+        if not files:
+            return
+        cached_data = self._load_from_cache(files[-1])
+        if cached_data:
             logger.info("Using cached vessel positions")
-            cached_data = self._load_from_cache(cache_file)
-            if cached_data:
-                return cached_data
+            cache.set(key, cached_data, fetched=files[-1].stat().st_mtime)
 
+    def _fetch_vessel_positions(self) -> List[Dict[str, Any]]:
+        """Fetch vessel positions from the API and keep a bounded history of them on disk"""
         try:
             params = {
                 "api_key": self.api_key,
@@ -147,13 +181,16 @@ class MarineTrafficAPI:
             }
 
             logger.info("Fetching vessel positions from API")
-            response = requests.get(self.base_url, params=params, timeout=10)
+            response = self.http.get(self.base_url, params=params, timeout=10)
             response.raise_for_status()
 
             data = response.json()
             if not isinstance(data, list):
                 data = [data]
+            cache_file = self.cache_dir / f"vessel_positions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
             self._save_to_cache(cache_file, data)
+            prune_cache_files(self.cache_dir, "vessel_positions_*.json",
+                              max_files=POSITIONS_MAX_FILES, max_bytes=POSITIONS_MAX_BYTES)
             return data
 
         except requests.RequestException as e:
@@ -171,6 +208,12 @@ class MarineTrafficAPI:
         vessels = []
         logger.info("Creating test vessels from sample data")
 
+        # Fresh fleet state for every sample set
+        self.fleet = FleetState()
+        self.spatial_index = SpatialIndex(self.fleet)
+        self.simulator.fleet = self.fleet
+        self.simulator.index = self.spatial_index
+
         # Απευθείας χρήση του SAMPLE_DATA
         for data in self.SAMPLE_DATA:
             try:
@@ -180,97 +223,92 @@ class MarineTrafficAPI:
                     vessel.track_history = [vessel.position]
                     vessel.speed_history = [vessel.speed]
                     vessel.heading = 0.0
+                    vessels.append(vessel)
+            except Exception as e:
+                logger.error(f"Error creating vessel from sample data: {str(e)}")
+                continue
 
-                    # Δημιουργία αρχικού ιστορικού κίνησης
-                    for _ in range(5):  # Δημιουργία 5 αρχικών σημείων
-                        self.update_vessel_position(vessel)
+        # Δημιουργία αρχικού ιστορικού κίνησης, one vectorized tick for all vessels
+        for _ in range(5):  # Δημιουργία 5 αρχικών σημείων
+            self.update_fleet(vessels)
 
-                    # Ενημέρωση port status
-                    port_status = self.update_port_congestion(vessel.destination)
-                    if port_status:
-                        vessel.update_port_status(
-                            congestion_level=port_status['congestion_level'],
-                            available_berths=port_status['total_berths'] - port_status['current_occupancy'],
-                            queue_position=port_status['queue']
-                        )
+        for vessel in vessels:
+            try:
+                # Ενημέρωση port status
+                port_status = self.update_port_congestion(vessel.destination)
+                if port_status:
+                    vessel.update_port_status(
+                        congestion_level=port_status['congestion_level'],
+                        available_berths=port_status['total_berths'] - port_status['current_occupancy'],
+                        queue_position=port_status['queue']
+                    )
 
-                    vessels.append(vessel)
-                    self._simulate_realistic_conditions(vessel)
+                self._simulate_realistic_conditions(vessel)
             except Exception as e:
-                logger.error(f"Error creating vessel from sample data: {str(e)}")
+                logger.error(f"Error simulating conditions for {vessel.name}: {str(e)}")
                 continue
 
+        self.plan_arrival_speeds(vessels)
+
         logger.info(f"Successfully created {len(vessels)} test vessels")
         return vessels
 
+    def plan_arrival_speeds(self, vessels: List[Vessel]) -> Dict[str, np.ndarray]:
+        """Set just-in-time arrival speeds where slowing down for the berth saves fuel"""
+        plan = plan_fleet_arrivals(vessels, self.port_congestion)
+        useful = plan['feasible'] & (plan['fuel_saving'] > 1e-6)
+        planned = {}
+        for row, speed, berth_hours, saving in zip(plan['vessel'][useful].tolist(), plan['speed'][useful].tolist(),
+                                                   plan['berth_hours'][useful].tolist(),
+                                                   plan['fuel_saving'][useful].tolist()):
+            planned[row] = (speed, berth_hours, saving)
+
+        for row, vessel in enumerate(vessels):
+            if row in planned:
+                speed, berth_hours, saving = planned[row]
+                vessel.jit_speed = speed
+                vessel.port_status['berth_available_in'] = timedelta(hours=berth_hours)
+                vessel.port_status['jit_fuel_saving'] = saving
+            elif vessel.jit_speed is not None:
+                # No longer worth planning (arrived, docked or already late)
+                vessel.jit_speed = None
+                vessel.port_status.pop('berth_available_in', None)
+                vessel.port_status.pop('jit_fuel_saving', None)
+            else:
+                continue
+            vessel.update_metrics()
+        return plan
+
+    def update_fleet(self, vessels: List[Vessel]) -> None:
+        """One simulation tick: move the vessels, update their ports' congestion and re-plan arrival speeds"""
+        if not vessels:
+            return
+        self.update_fleet_positions(np.array([vessel.slot for vessel in vessels], dtype=np.intp),
+                                    vessels[0].fleet)
+        for port in dict.fromkeys(vessel.destination for vessel in vessels):
+            self.update_port_congestion(port)
+        self.plan_arrival_speeds(vessels)
+
+    def refresh_fleet_weather(self, vessels: List[Vessel], hours: int = 24) -> None:
+        """Fetch live weather for the whole fleet in one concurrent, tile-shared batch and apply it"""
+        if not vessels:
+            return
+        results = self.weather.get_fleet_weather_data([vessel.position for vessel in vessels], hours)
+        for vessel, weather_data in zip(vessels, results):
+            vessel.update_weather_data(weather_data)
+
     def update_vessel_position(self, vessel: Vessel) -> None:
         """Update vessel position and track history"""
-        try:
-            # Simulate vessel movement
-            current_lat, current_lon = vessel.position
-
-            # Calculate new position with realistic movement
-            movement_factor = vessel.speed / vessel.max_speed
-            lat_change = random.uniform(-0.01, 0.01) * movement_factor
-            lon_change = random.uniform(-0.01, 0.01) * movement_factor
-
-            new_lat = current_lat + lat_change
-            new_lon = current_lon + lon_change
-            new_position = (new_lat, new_lon)
-
-            # Update vessel position
-            vessel.position = new_position
-
-            # Update track history (keep last 100 positions)
-            vessel.track_history.append(new_position)
-            if len(vessel.track_history) > 100:
-                vessel.track_history.pop(0)
-
-            # Update speed with realistic variations
-            speed_variation = random.uniform(-1, 1)
-            new_speed = min(max(vessel.speed + speed_variation, 0), vessel.max_speed)
-            vessel.speed = new_speed
-
-            # Update speed history (keep last 100 readings)
-            vessel.speed_history.append(new_speed)
-            if len(vessel.speed_history) > 100:
-                vessel.speed_history.pop(0)
-
-            # Calculate heading based on last two positions
-            if len(vessel.track_history) >= 2:
-                vessel.heading = self._calculate_heading(
-                    vessel.track_history[-2],
-                    vessel.track_history[-1]
-                )
-
-            logger.debug(f"Updated position for vessel {vessel.name}: {new_position}")
+        self.update_fleet_positions(np.array([vessel.slot]), vessel.fleet)
+        logger.debug(f"Updated position for vessel {vessel.name}: {vessel.position}")
 
+    def update_fleet_positions(self, slots: Optional[np.ndarray] = None,
+                               fleet: Optional[FleetState] = None) -> None:
+        """Update positions, speeds and headings of many vessels in one vectorized step"""
+        try:
+            self.simulator.step(slots, fleet if fleet is not None else self.fleet)
         except Exception as e:
-            logger.error(f"Error updating vessel position: {str(e)}")
-
-    def _calculate_heading(self, pos1: tuple, pos2: tuple) -> float:
-        """Calculate heading angle between two positions"""
-        import math
-
-        lat1, lon1 = pos1
-        lat2, lon2 = pos2
-
-        # Convert to radians
-        lat1, lon1 = math.radians(lat1), math.radians(lon1)
-        lat2, lon2 = math.radians(lat2), math.radians(lon2)
-
-        d_lon = lon2 - lon1
-
-        y = math.sin(d_lon) * math.cos(lat2)
-        x = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(d_lon)
-
-        heading = math.atan2(y, x)
-
-        # Convert to degrees and normalize
-        heading_degrees = math.degrees(heading)
-        normalized_heading = (heading_degrees + 360) % 360
-
-        return normalized_heading
+            logger.error(f"Error updating vessel positions: {str(e)}")
 
     @staticmethod
     def _save_to_cache(cache_file: Path, data: List[Dict[str, Any]]) -> None:
@@ -281,10 +319,6 @@ class MarineTrafficAPI:
         except Exception as e:
             logger.error(f"Failed to save cache: {str(e)}")
 
-    def _is_cache_valid(self, cache_file: Path) -> bool:
-        """Check if cache is still valid"""
-        return (datetime.now().timestamp() - cache_file.stat().st_mtime) < self.cache_duration
-
     @staticmethod
     def _load_from_cache(cache_file: Path) -> Optional[List[Dict[str, Any]]]:
         """Load data from cache file"""
@@ -313,7 +347,8 @@ class MarineTrafficAPI:
                     cargo_status=data["cargo_status"],
                     fuel_level=data["fuel_level"],
                     tank_type=data["tank_type"],
-                    cargo_capacity=data["cargo_capacity"]
+                    cargo_capacity=data["cargo_capacity"],
+                    fleet=self.fleet
                 )
             elif data["vessel_type"] == "bulk_carrier":
                 vessel = BulkCarrierVessel(
@@ -325,7 +360,8 @@ class MarineTrafficAPI:
                     cargo_status=data["cargo_status"],
                     fuel_level=data["fuel_level"],
                     hold_count=data["hold_count"],
-                    hatch_type=data["hatch_type"]
+                    hatch_type=data["hatch_type"],
+                    fleet=self.fleet
                 )
             else:
                 raise ValueError(f"Unknown vessel type: {data.get('vessel_type')}")
@@ -542,7 +578,8 @@ class MarineTrafficAPI:
                 destination=vessel_data["destination"],
                 eta=datetime.now() + timedelta(hours=24),
                 cargo_status=vessel_data["status"],
-                fuel_level=vessel_data["fuel_level"]
+                fuel_level=vessel_data["fuel_level"],
+                fleet=self.fleet
             )
 
             # Set weather condition
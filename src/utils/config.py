@@ -4,3 +4,6 @@ from dotenv import load_dotenv
 load_dotenv()
 
 STORMGLASS_API_KEY = os.getenv('STORMGLASS_API_KEY')
+
+# Where the precomputed port distance matrix is stored between runs
+PORT_DISTANCES_DIR = os.getenv('PORT_DISTANCES_DIR', os.path.join('cache', 'port_distances'))
@@ -0,0 +1,75 @@
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.models.fleet_state import FleetState
+from src.models.spatial_index import SpatialIndex
+from src.utils.geo import initial_bearing
+
+
+class FleetSimulator:
+    """Advances every vessel of a FleetState in one vectorized step.
+
+    Each tick nudges positions in proportion to speed, varies speeds within
+    [0, max_speed], derives headings from the movement and appends the new
+    positions and speeds to the track rings. All randomness comes from a
+    seeded ``numpy.random.Generator``, so runs are reproducible. An optional
+    SpatialIndex is re-synced for the moved vessels.
+    """
+
+    def __init__(self, fleet: Optional[FleetState] = None, seed: Optional[int] = None,
+                 max_position_step: float = 0.01, max_speed_step: float = 1.0,
+                 index: Optional[SpatialIndex] = None):
+        self.fleet = fleet if fleet is not None else FleetState()
+        self.index = index  # Kept in sync with the moved vessels after every tick
+        self.rng = np.random.default_rng(seed)
+        self.max_position_step = max_position_step  # Degrees per tick at max speed
+        self.max_speed_step = max_speed_step  # Knots per tick
+        self.ticks = 0
+
+    def populate(self, count: int, bounds: Tuple[float, float, float, float] = (35.0, 23.0, 40.0, 27.0),
+                 speed_range: Tuple[float, float] = (8.0, 16.0), max_speed: float = 20.0) -> np.ndarray:
+        """Add count vessels at random positions within (min_lat, min_lon, max_lat, max_lon)"""
+        min_lat, min_lon, max_lat, max_lon = bounds
+        return self.fleet.add_many(
+            lat=self.rng.uniform(min_lat, max_lat, count),
+            lon=self.rng.uniform(min_lon, max_lon, count),
+            speed=self.rng.uniform(*speed_range, count),
+            max_speed=max_speed,
+            fuel_level=self.rng.uniform(40, 100, count)
+        )
+
+    def step(self, slots: Optional[Sequence[int]] = None, fleet: Optional[FleetState] = None) -> None:
+        """Advance the given slots (default: all active vessels) by one tick"""
+        fleet = fleet if fleet is not None else self.fleet
+        slots = fleet.resolve_slots(slots)
+        count = len(slots)
+        if not count:
+            return
+
+        current_lat = fleet.lat[slots]
+        current_lon = fleet.lon[slots]
+
+        # Movement proportional to the fraction of max speed
+        movement_factor = fleet.speed[slots] / fleet.max_speed[slots]
+        step = self.max_position_step
+        lat_change = self.rng.uniform(-step, step, count) * movement_factor
+        lon_change = self.rng.uniform(-step, step, count) * movement_factor
+        fleet.move(slots, current_lat + lat_change, current_lon + lon_change)
+
+        # Speed variation, kept within [0, max_speed]
+        speed_variation = self.rng.uniform(-self.max_speed_step, self.max_speed_step, count)
+        fleet.set_speed(slots, np.clip(fleet.speed[slots] + speed_variation, 0, fleet.max_speed[slots]))
+
+        # Heading from previous to new position
+        fleet.heading[slots] = initial_bearing(current_lat, current_lon,
+                                               fleet.lat[slots], fleet.lon[slots])
+        if self.index is not None and self.index.fleet is fleet:
+            self.index.sync(slots)
+        self.ticks += 1
+
+    def run(self, ticks: int, slots: Optional[Sequence[int]] = None) -> None:
+        """Advance the fleet by several ticks"""
+        slots = self.fleet.resolve_slots(slots)
+        for _ in range(ticks):
+            self.step(slots)
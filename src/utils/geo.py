@@ -0,0 +1,110 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Spherical Earth; all functions take degrees and nautical miles and broadcast
+EARTH_RADIUS_NM = 3440.065
+
+
+def haversine_nm(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Great-circle distance in nautical miles"""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_NM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def initial_bearing(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Initial great-circle bearing in degrees [0, 360)"""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    d_lon = lon2 - lon1
+
+    y = np.sin(d_lon) * np.cos(lat2)
+    x = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(d_lon)
+
+    return (np.degrees(np.arctan2(y, x)) + 360) % 360
+
+
+def _rhumb_terms(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    d_lat = lat2 - lat1
+    d_lon = lon2 - lon1
+    # Take the shorter way across the antimeridian
+    d_lon = np.where(np.abs(d_lon) > np.pi, d_lon - np.sign(d_lon) * 2 * np.pi, d_lon)
+    d_psi = np.log(np.tan(np.pi / 4 + lat2 / 2) / np.tan(np.pi / 4 + lat1 / 2))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        q = np.where(np.abs(d_psi) > 1e-12, d_lat / d_psi, np.cos(lat1))
+    return d_lat, d_lon, d_psi, q
+
+
+def rhumb_distance_nm(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Rhumb-line (constant heading) distance in nautical miles"""
+    d_lat, d_lon, _, q = _rhumb_terms(lat1, lon1, lat2, lon2)
+    return np.hypot(d_lat, q * d_lon) * EARTH_RADIUS_NM
+
+
+def rhumb_bearing(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Constant rhumb-line bearing in degrees [0, 360)"""
+    _, d_lon, d_psi, _ = _rhumb_terms(lat1, lon1, lat2, lon2)
+    return (np.degrees(np.arctan2(d_lon, d_psi)) + 360) % 360
+
+
+def destination_point(lat, lon, bearing, distance_nm) -> Tuple[np.ndarray, np.ndarray]:
+    """Position reached from a start point along a great circle"""
+    lat, lon, bearing = map(np.radians, (lat, lon, bearing))
+    delta = np.asarray(distance_nm) / EARTH_RADIUS_NM
+
+    lat2 = np.arcsin(np.sin(lat) * np.cos(delta) + np.cos(lat) * np.sin(delta) * np.cos(bearing))
+    lon2 = lon + np.arctan2(np.sin(bearing) * np.sin(delta) * np.cos(lat),
+                            np.cos(delta) - np.sin(lat) * np.sin(lat2))
+    return np.degrees(lat2), (np.degrees(lon2) + 540) % 360 - 180
+
+
+def distance_matrix(lat_a, lon_a, lat_b: Optional[np.ndarray] = None,
+                    lon_b: Optional[np.ndarray] = None) -> np.ndarray:
+    """Pairwise great-circle distances, shape (len(a), len(b)); b defaults to a"""
+    lat_a, lon_a = np.asarray(lat_a, dtype=np.float64), np.asarray(lon_a, dtype=np.float64)
+    if lat_b is None:
+        lat_b, lon_b = lat_a, lon_a
+    lat_b, lon_b = np.asarray(lat_b, dtype=np.float64), np.asarray(lon_b, dtype=np.float64)
+    return haversine_nm(lat_a[:, None], lon_a[:, None], lat_b[None, :], lon_b[None, :])
+
+
+def path_length_nm(points: np.ndarray) -> float:
+    """Length of a polyline given as an (n, 2) array of lat/lon"""
+    points = np.asarray(points, dtype=np.float64)
+    if len(points) < 2:
+        return 0.0
+    return float(haversine_nm(points[:-1, 0], points[:-1, 1], points[1:, 0], points[1:, 1]).sum())
+
+
+def route_efficiency(points: np.ndarray) -> float:
+    """Straight-line distance between the ends divided by the sailed distance (1.0 = direct)"""
+    sailed = path_length_nm(points)
+    if sailed == 0:
+        return 1.0
+    direct = haversine_nm(points[0][0], points[0][1], points[-1][0], points[-1][1])
+    return float(direct / sailed)
+
+
+def ring_track_lengths(ring, slots) -> np.ndarray:
+    """Sailed distance of many tracks stored in a HistoryRing, in one call.
+
+    Distances are taken between every pair of neighbouring ring cells; pairs
+    past the valid samples and the wrap-around seam of full rings are masked.
+    """
+    slots = np.asarray(slots, dtype=np.intp)
+    data = ring.window(slots).astype(np.float64)
+    depth = data.shape[1]
+    if depth < 2:
+        return np.zeros(len(slots))
+
+    following = np.roll(data, -1, axis=1)
+    legs = haversine_nm(data[..., 0], data[..., 1], following[..., 0], following[..., 1])
+
+    index = np.arange(depth)[None, :]
+    count = ring.count[slots][:, None]
+    head = ring.head[slots][:, None]
+    full = count == ring.length
+    valid = np.where(full, index != (head - 1) % depth, index < count - 1)
+    return np.where(valid, legs, 0.0).sum(axis=1)
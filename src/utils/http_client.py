@@ -0,0 +1,191 @@
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, FrozenSet, Optional
+from urllib.parse import urlparse
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Upper bucket edges in milliseconds; the last bucket catches everything slower
+LATENCY_BUCKETS_MS = np.array([5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, np.inf])
+
+
+@dataclass(frozen=True)
+class HostPolicy:
+    """Connection pool and retry settings for one host"""
+    pool_connections: int = 4
+    pool_maxsize: int = 32
+    timeout: float = 10.0
+    max_retries: int = 3
+    backoff_base: float = 0.5  # Seconds; doubled on every retry
+    backoff_max: float = 30.0
+    max_retry_after: float = 120.0  # Longest Retry-After we are willing to wait
+    retry_statuses: FrozenSet[int] = field(default_factory=lambda: frozenset({429, 500, 502, 503, 504}))
+
+
+class LatencyHistogram:
+    """Request latencies counted into fixed millisecond buckets"""
+
+    def __init__(self):
+        self.counts = np.zeros(len(LATENCY_BUCKETS_MS), dtype=np.int64)
+        self.total = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[np.searchsorted(LATENCY_BUCKETS_MS, seconds * 1000.0)] += 1
+        self.total += seconds
+
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+
+    def percentile(self, q: float) -> float:
+        """Upper edge (ms) of the bucket holding the q-th percentile"""
+        if not self.count:
+            return 0.0
+        index = int(np.searchsorted(np.cumsum(self.counts), q / 100.0 * self.count))
+        return float(LATENCY_BUCKETS_MS[min(index, len(LATENCY_BUCKETS_MS) - 1)])
+
+    def summary(self) -> Dict[str, float]:
+        count = self.count
+        return {
+            'count': count,
+            'mean_ms': self.total / count * 1000.0 if count else 0.0,
+            'p50_ms': self.percentile(50),
+            'p90_ms': self.percentile(90),
+            'p99_ms': self.percentile(99)
+        }
+
+
+def retry_after_seconds(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """Delay requested by a Retry-After header, given in seconds or as an HTTP date"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - (now or datetime.now(timezone.utc))).total_seconds(), 0.0)
+
+
+class HTTPClient:
+    """Shared HTTP layer for the external APIs.
+
+    One requests Session keeps connections alive, with an adapter pool
+    mounted per configured host. GET requests that fail to connect, time out
+    or answer with a retryable status are retried with full-jitter
+    exponential backoff, waiting as long as the server's Retry-After asks
+    instead when it sends one. Every attempt's latency is recorded per
+    endpoint (host and path).
+    """
+
+    def __init__(self, default_policy: Optional[HostPolicy] = None, seed: Optional[int] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.default_policy = default_policy or HostPolicy()
+        self.policies: Dict[str, HostPolicy] = {}
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.retries: Dict[str, int] = {}
+        self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(pool_connections=self.default_policy.pool_connections,
+                                                  pool_maxsize=self.default_policy.pool_maxsize))
+        self.session.mount('https://', HTTPAdapter(pool_connections=self.default_policy.pool_connections,
+                                                   pool_maxsize=self.default_policy.pool_maxsize))
+        self._random = random.Random(seed)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def configure(self, host: str, **settings) -> HostPolicy:
+        """Set pool and retry settings for one host (e.g. 'api.stormglass.io' or '127.0.0.1:8080')"""
+        with self._lock:
+            policy = replace(self.policies.get(host, self.default_policy), **settings)
+            self.policies[host] = policy
+            for scheme in ('http', 'https'):
+                self.session.mount(f'{scheme}://{host}', HTTPAdapter(pool_connections=policy.pool_connections,
+                                                                     pool_maxsize=policy.pool_maxsize))
+        return policy
+
+    def policy(self, host: str) -> HostPolicy:
+        with self._lock:
+            return self.policies.get(host, self.default_policy)
+
+    def backoff(self, attempt: int, policy: HostPolicy) -> float:
+        """Full-jitter delay before retry number attempt + 1"""
+        return self._random.uniform(0.0, min(policy.backoff_max, policy.backoff_base * 2 ** attempt))
+
+    def _record(self, endpoint: str, seconds: float) -> None:
+        with self._lock:
+            self.histograms.setdefault(endpoint, LatencyHistogram()).record(seconds)
+
+    def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+            timeout: Optional[float] = None, deadline: Optional[float] = None) -> requests.Response:
+        """GET with retries; returns the last response, so callers still check its status.
+
+        ``timeout`` bounds each attempt and ``deadline`` (seconds) all attempts
+        and waits together: no retry is started that could not finish in time.
+        """
+        parsed = urlparse(url)
+        endpoint = f"{parsed.netloc}{parsed.path}"
+        policy = self.policy(parsed.netloc)
+        timeout = policy.timeout if timeout is None else timeout
+        give_up_at = time.monotonic() + deadline if deadline is not None else float('inf')
+
+        for attempt in range(policy.max_retries + 1):
+            started = time.perf_counter()
+            attempt_timeout = max(min(timeout, give_up_at - time.monotonic()), 0.001)
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=attempt_timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._record(endpoint, time.perf_counter() - started)
+                delay = self.backoff(attempt, policy)
+                if attempt == policy.max_retries or time.monotonic() + delay >= give_up_at:
+                    raise
+                logger.warning(f"{endpoint} failed ({type(e).__name__}), retrying in {delay:.2f}s")
+            else:
+                self._record(endpoint, time.perf_counter() - started)
+                if response.status_code not in policy.retry_statuses or attempt == policy.max_retries:
+                    return response
+                delay = retry_after_seconds(response.headers.get('Retry-After'))
+                if delay is None:
+                    delay = self.backoff(attempt, policy)
+                if delay > policy.max_retry_after or time.monotonic() + delay >= give_up_at:
+                    return response
+                response.close()
+                logger.warning(f"{endpoint} answered {response.status_code}, retrying in {delay:.2f}s")
+
+            with self._lock:
+                self.retries[endpoint] = self.retries.get(endpoint, 0) + 1
+            self._sleep(delay)
+
+    def latency_report(self) -> Dict[str, Dict[str, float]]:
+        """Latency percentiles and retry counts per endpoint"""
+        with self._lock:
+            return {endpoint: {**histogram.summary(), 'retries': self.retries.get(endpoint, 0)}
+                    for endpoint, histogram in self.histograms.items()}
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_HTTP_CLIENT: Optional[HTTPClient] = None
+_HTTP_CLIENT_LOCK = threading.Lock()
+
+
+def get_http_client() -> HTTPClient:
+    """Process-wide HTTP client shared by the API classes"""
+    global _HTTP_CLIENT
+    with _HTTP_CLIENT_LOCK:
+        if _HTTP_CLIENT is None:
+            _HTTP_CLIENT = HTTPClient()
+        return _HTTP_CLIENT
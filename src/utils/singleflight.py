@@ -0,0 +1,89 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    """One in-flight call and the outcome its waiters receive"""
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one upstream call.
+
+    The first caller for a key runs the function; callers arriving while it
+    runs wait for it and receive the same result, or the same exception.
+    Nothing is cached: once the call returns, the next caller runs it again.
+    """
+
+    def __init__(self, name: str = "default"):
+        self.name = name
+        self.upstream_calls = 0
+        self.coalesced = 0
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Result of fn() for key, and whether it was shared with a call already in flight"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.upstream_calls += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, float]:
+        """Upstream and coalesced call counts, and requests served per upstream call"""
+        with self._lock:
+            upstream, coalesced = self.upstream_calls, self.coalesced
+        return {
+            'upstream_calls': upstream,
+            'coalesced': coalesced,
+            'fan_in': (upstream + coalesced) / upstream if upstream else 0.0
+        }
+
+
+_GROUPS: Dict[str, SingleFlight] = {}
+_GROUPS_LOCK = threading.Lock()
+
+
+def get_singleflight(name: str) -> SingleFlight:
+    """Process-wide singleflight group, shared by every session in this process"""
+    with _GROUPS_LOCK:
+        if name not in _GROUPS:
+            _GROUPS[name] = SingleFlight(name)
+        return _GROUPS[name]
+
+
+def singleflight_report() -> Dict[str, Dict[str, float]]:
+    """stats() of every process-wide group"""
+    with _GROUPS_LOCK:
+        groups = list(_GROUPS.values())
+    return {group.name: group.stats() for group in groups}
@@ -0,0 +1,197 @@
+import atexit
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+from src.utils.singleflight import SingleFlight, get_singleflight
+
+logger = logging.getLogger(__name__)
+
+
+def prune_cache_files(directory: Union[str, Path], pattern: str, max_files: Optional[int] = None,
+                      max_bytes: Optional[int] = None) -> List[Path]:
+    """Delete the oldest files matching pattern until both bounds hold; returns the deleted paths"""
+    entries = []
+    for path in Path(directory).glob(pattern):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue  # Removed by another process meanwhile
+        entries.append((stat.st_mtime, stat.st_size, path))
+    entries.sort(key=lambda entry: entry[0])
+
+    total = sum(size for _, size, _ in entries)
+    deleted = []
+    for _, size, path in entries:
+        over_count = max_files is not None and len(entries) - len(deleted) > max_files
+        over_bytes = max_bytes is not None and total > max_bytes
+        if not (over_count or over_bytes):
+            break
+        try:
+            path.unlink()
+        except OSError as e:
+            logger.warning(f"Could not delete cache file {path}: {str(e)}")
+            continue
+        total -= size
+        deleted.append(path)
+    return deleted
+
+
+class TTLCache:
+    """In-memory cache with time-based expiry and stale-while-revalidate.
+
+    An entry younger than ``ttl`` is served as is. An older one is still
+    served immediately while a background thread reloads it, until it is
+    ``max_stale`` seconds past its ttl (None: no limit); only then, or on a
+    miss, does a read wait for the loader. Concurrent loads of one key are
+    coalesced by ``flight``. At most ``maxsize`` entries are kept, least
+    recently used first out.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_stale: Optional[float] = None, maxsize: int = 128,
+                 name: str = "ttl_cache", clock: Callable[[], float] = time.time,
+                 flight: Optional[SingleFlight] = None, refresh_workers: int = 2):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.maxsize = maxsize
+        self.name = name
+        self.clock = clock
+        self.flight = flight if flight is not None else SingleFlight(name)
+        self.refresh_workers = refresh_workers
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._refreshing = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.metrics = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0,
+                        'refresh_failures': 0, 'evictions': 0}
+
+    def _count(self, metric: str) -> None:
+        with self._lock:
+            self.metrics[metric] += 1
+
+    def set(self, key: Hashable, value: Any, fetched: Optional[float] = None) -> None:
+        """Store value as loaded at time fetched (default: now)"""
+        with self._lock:
+            self._entries[key] = (self.clock() if fetched is None else fetched, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.metrics['evictions'] += 1
+
+    def peek(self, key: Hashable) -> Optional[Tuple[float, Any]]:
+        """(fetched, value) without touching metrics or recency"""
+        with self._lock:
+            return self._entries.get(key)
+
+    def age(self, key: Hashable) -> Optional[float]:
+        entry = self.peek(key)
+        return self.clock() - entry[0] if entry is not None else None
+
+    def get(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """Cached value for key, calling loader() to fill or refresh it; ttl overrides the default"""
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is not None:
+            age = self.clock() - entry[0]
+            if age < ttl:
+                self._count('hits')
+                return entry[1]
+            if self.max_stale is None or age < ttl + self.max_stale:
+                self._count('stale_hits')
+                self._refresh_in_background(key, loader)
+                return entry[1]
+
+        self._count('misses')
+        value, _ = self.flight.do(key, lambda: self._load(key, loader))
+        return value
+
+    def _load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        value = loader()
+        self.set(key, value)
+        return value
+
+    def _refresh_in_background(self, key: Hashable, loader: Callable[[], Any]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.refresh_workers,
+                                                    thread_name_prefix=f"{self.name}-refresh")
+            executor = self._executor
+        executor.submit(self._refresh, key, loader)
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any]) -> None:
+        try:
+            self.flight.do(key, lambda: self._load(key, loader))
+            self._count('refreshes')
+        except Exception as e:
+            self._count('refresh_failures')
+            logger.warning(f"Background refresh of {self.name} {key} failed: {str(e)}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def wait_for_refreshes(self, timeout: float = 10.0) -> bool:
+        """Block until no background refresh is pending; True if none is left"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if not self._refreshing:
+                    return True
+            time.sleep(0.01)
+        return False
+
+    def close(self, wait: bool = True) -> None:
+        """Shut down the background refresh threads, dropping refreshes that have not started"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+        with self._lock:
+            self._refreshing.clear()
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Metric counters plus entry count and the share of reads answered without waiting"""
+        with self._lock:
+            metrics = dict(self.metrics)
+            entries = len(self._entries)
+        reads = metrics['hits'] + metrics['stale_hits'] + metrics['misses']
+        served = metrics['hits'] + metrics['stale_hits']
+        return {**metrics, 'entries': entries, 'hit_ratio': served / reads if reads else 0.0}
+
+
+_CACHES: Dict[str, TTLCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_ttl_cache(name: str, **settings) -> TTLCache:
+    """Process-wide cache by name, created with settings on first use and closed at exit"""
+    with _CACHES_LOCK:
+        if name not in _CACHES:
+            _CACHES[name] = TTLCache(name=name, flight=get_singleflight(name), **settings)
+            atexit.register(_CACHES[name].close)
+        return _CACHES[name]
+
+
+def ttl_cache_report() -> Dict[str, Dict[str, float]]:
+    """stats() of every process-wide cache"""
+    with _CACHES_LOCK:
+        caches = list(_CACHES.values())
+    return {cache.name: cache.stats() for cache in caches}
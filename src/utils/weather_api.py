@@ -1,50 +1,116 @@
 # src/utils/weather_api.py
-import requests
+import asyncio
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from src.utils.config import STORMGLASS_API_KEY
+from src.utils.http_client import HTTPClient, get_http_client
+from src.utils.weather_cache import TileKey, WeatherTileCache, get_weather_cache
 from ..models.types import WeatherCondition, WeatherForecast
 
+FETCH_GRACE = 0.5  # Seconds a tile fetch may run past its HTTP deadline before it is abandoned
+
 class WeatherAPI:
-    def __init__(self):
-        self.api_key = STORMGLASS_API_KEY
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[WeatherTileCache] = None,
+                 http: Optional[HTTPClient] = None):
+        self.api_key = api_key or STORMGLASS_API_KEY
         self.base_url = "https://api.stormglass.io/v2"
+        self.http = http if http is not None else get_http_client()
         self.logger = logging.getLogger(__name__)
+        self.cache = cache if cache is not None else get_weather_cache()
 
     def get_vessel_weather_data(self, lat: float, lon: float, hours: int = 24) -> Dict:
-        """Get weather data and forecasts for vessel"""
+        """Get weather data and forecasts for vessel, shared per weather tile"""
         try:
-            endpoint = f"{self.base_url}/weather/point"
-            params = {
-                'lat': lat,
-                'lng': lon,
-                'params': ','.join([
-                    'waveHeight',
-                    'windSpeed',
-                    'windDirection',
-                    'visibility'  # Added visibility parameter
-                ]),
-                'hours': hours
-            }
-            headers = {'Authorization': self.api_key}
-
-            response = requests.get(
-                endpoint,
-                params=params,
-                headers=headers,
-                timeout=10
-            )
-            response.raise_for_status()
-
-            data = response.json()
+            data = self.cache.get(lat, lon, lambda tile_lat, tile_lon: self._fetch(tile_lat, tile_lon, hours),
+                                  hours=hours)
             return self._process_weather_data(data)
 
         except Exception as e:
             self.logger.error(f"Error fetching weather data: {str(e)}")
             return self._get_fallback_data()
 
+    def get_fleet_weather_data(self, positions: Sequence[Tuple[float, float]], hours: int = 24,
+                               concurrency: int = 8, timeout: float = 10.0) -> List[Dict]:
+        """Weather data for many positions, fetched concurrently; fallback data where a fetch failed"""
+        results = asyncio.run(self.fetch_fleet_weather(positions, hours, concurrency, timeout))
+        return [result if result is not None else self._get_fallback_data() for result in results]
+
+    async def fetch_fleet_weather(self, positions: Sequence[Tuple[float, float]], hours: int = 24,
+                                  concurrency: int = 8, timeout: float = 10.0) -> List[Optional[Dict]]:
+        """Weather data for every position, with at most `concurrency` requests in flight.
+
+        Positions are grouped by weather tile and each tile is fetched once,
+        through the tile cache, on a thread of its own. Each fetch passes a
+        `timeout` second deadline to the HTTP client, so a slow tile fails (and
+        falls back to stale cache data) on its own thread; one still running
+        FETCH_GRACE seconds later is abandoned. Positions whose tile failed get
+        None, so the results that did arrive are kept.
+        """
+        tiles: Dict[TileKey, List[int]] = {}
+        for i, (lat, lon) in enumerate(positions):
+            tiles.setdefault(self.cache.key(lat, lon, hours), []).append(i)
+
+        results: List[Optional[Dict]] = [None] * len(positions)
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(concurrency)
+        pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="weather")
+
+        async def fetch_tile(indices: List[int]) -> None:
+            lat, lon = positions[indices[0]]
+            async with semaphore:
+                give_up_at = time.monotonic() + timeout
+                fetch = lambda tile_lat, tile_lon: self._fetch(
+                    tile_lat, tile_lon, hours, max(give_up_at - time.monotonic(), 0.001))
+                try:
+                    data = await asyncio.wait_for(
+                        loop.run_in_executor(pool, self.cache.get, lat, lon, fetch, hours), timeout + FETCH_GRACE)
+                except Exception as e:
+                    self.logger.warning(f"Weather fetch failed near ({lat:.2f}, {lon:.2f}): {str(e) or type(e).__name__}")
+                    return
+            self.cache.count_shared(len(indices) - 1)
+            for i in indices:
+                results[i] = self._process_weather_data(data)
+
+        try:
+            await asyncio.gather(*(fetch_tile(indices) for indices in tiles.values()))
+        finally:
+            # Abandoned fetches finish on their own, bounded by the HTTP deadline
+            pool.shutdown(wait=False)
+        return results
+
+    def cache_report(self) -> Dict[str, float]:
+        return self.cache.report()
+
+    def _fetch(self, lat: float, lon: float, hours: int, timeout: float = 10.0) -> Dict:
+        """Raw Stormglass point response"""
+        endpoint = f"{self.base_url}/weather/point"
+        params = {
+            'lat': lat,
+            'lng': lon,
+            'params': ','.join([
+                'waveHeight',
+                'windSpeed',
+                'windDirection',
+                'visibility'  # Added visibility parameter
+            ]),
+            'hours': hours
+        }
+        headers = {'Authorization': self.api_key}
+
+        response = self.http.get(
+            endpoint,
+            params=params,
+            headers=headers,
+            timeout=timeout,
+            deadline=timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
     def _process_weather_data(self, data: Dict) -> Dict:
         """Process API data into vessel weather format"""
         if not data or 'hours' not in data:
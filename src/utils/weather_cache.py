@@ -0,0 +1,187 @@
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from src.utils.singleflight import SingleFlight, get_singleflight
+from src.utils.ttl_cache import prune_cache_files
+
+logger = logging.getLogger(__name__)
+
+TileKey = Tuple[int, int, int]  # (row, col, forecast hours)
+
+
+class WeatherTileCache:
+    """Weather responses cached per lat/lon tile, in memory and on disk.
+
+    Positions are quantized to ``tile_size`` degree tiles, so vessels in the
+    same tile share one fetch (made for the tile centre). Entries are keyed
+    by tile and forecast length only and expire after ``ttl`` seconds. The
+    memory tier is an LRU of ``maxsize`` entries; the disk tier keeps one
+    JSON file per entry and evicts the least recently written files beyond
+    ``disk_maxsize``, checked every ``prune_every`` writes. Concurrent misses
+    for one entry are coalesced by ``flight`` and counted as ``coalesced``.
+    When a fetch fails, the expired entry for the tile is served instead if
+    there is one.
+    """
+
+    def __init__(self, tile_size: float = 0.5, ttl: float = 3600.0, maxsize: int = 512,
+                 directory: Optional[Union[str, Path]] = Path("cache") / "weather",
+                 disk_maxsize: int = 4096, prune_every: int = 64, clock: Callable[[], float] = time.time,
+                 flight: Optional[SingleFlight] = None):
+        self.tile_size = tile_size
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.directory = Path(directory) if directory is not None else None
+        self.disk_maxsize = disk_maxsize
+        self.prune_every = prune_every
+        self._writes = 0
+        self.clock = clock
+        self._memory: 'OrderedDict[TileKey, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.flight = flight if flight is not None else SingleFlight("weather_tiles")
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'coalesced': 0, 'misses': 0, 'stale_served': 0}
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def tile(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.tile_size), math.floor(lon / self.tile_size)
+
+    def tile_center(self, lat: float, lon: float) -> Tuple[float, float]:
+        row, col = self.tile(lat, lon)
+        return (row + 0.5) * self.tile_size, (col + 0.5) * self.tile_size
+
+    def key(self, lat: float, lon: float, hours: int = 24) -> TileKey:
+        row, col = self.tile(lat, lon)
+        return row, col, hours
+
+    def _path(self, key: TileKey) -> Path:
+        return self.directory / ("tile_%d_%d_%d.json" % key)
+
+    def _read_disk(self, key: TileKey) -> Optional[Tuple[float, Any]]:
+        if self.directory is None:
+            return None
+        try:
+            entry = json.loads(self._path(key).read_text())
+            return entry['fetched'], entry['data']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_disk(self, key: TileKey, fetched: float, data: Any) -> None:
+        if self.directory is None:
+            return
+        path = self._path(key)
+        tmp = path.with_suffix('.tmp')
+        try:
+            tmp.write_text(json.dumps({'fetched': fetched, 'data': data}))
+            os.replace(tmp, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not write weather tile {key}: {str(e)}")
+            return
+        with self._lock:
+            self._writes += 1
+            due = self._writes % self.prune_every == 0
+        if due:
+            prune_cache_files(self.directory, 'tile_*.json', max_files=self.disk_maxsize)
+
+    def _remember(self, key: TileKey, entry: Tuple[float, Any]) -> None:
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
+
+    def _fresh(self, entry: Optional[Tuple[float, Any]]) -> bool:
+        return entry is not None and self.clock() - entry[0] < self.ttl
+
+    def _lookup(self, key: TileKey) -> Tuple[Optional[Tuple[float, Any]], str]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if self._fresh(entry):
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return entry, 'memory'
+        disk = self._read_disk(key)
+        if self._fresh(disk):
+            self._remember(key, disk)
+            self._count('disk_hits')
+            return disk, 'disk'
+        # Expired: the newer of the two copies, kept as a fallback if the fetch fails
+        return max((e for e in (entry, disk) if e is not None), key=lambda e: e[0], default=None), 'miss'
+
+    def get(self, lat: float, lon: float, fetch: Callable[[float, float], Any], hours: int = 24) -> Any:
+        """Cached data for the tile holding (lat, lon), calling fetch(tile_lat, tile_lon) on a miss"""
+        key = self.key(lat, lon, hours)
+        entry, source = self._lookup(key)
+        if source != 'miss':
+            return entry[1]
+
+        # One fetch per tile, however many vessels ask for it at once
+        data, shared = self.flight.do(key, lambda: self._load(key, lat, lon, fetch))
+        if shared:
+            self.count_shared(1)
+        return data
+
+    def _load(self, key: TileKey, lat: float, lon: float, fetch: Callable[[float, float], Any]) -> Any:
+        entry, source = self._lookup(key)
+        if source != 'miss':
+            # Filled by a fetch that finished since our first lookup
+            return entry[1]
+
+        self._count('misses')
+        try:
+            data = fetch(*self.tile_center(lat, lon))
+        except Exception:
+            if entry is None:
+                raise
+            self._count('stale_served')
+            logger.warning(f"Weather fetch failed for tile {key}, serving stale data")
+            return entry[1]
+
+        fetched = self.clock()
+        self._remember(key, (fetched, data))
+        self._write_disk(key, fetched, data)
+        return data
+
+    def _count(self, metric: str, amount: int = 1) -> None:
+        with self._lock:
+            self.stats[metric] += amount
+
+    def count_shared(self, lookups: int) -> None:
+        """Record lookups answered by a fetch another caller made for the same tile"""
+        self._count('coalesced', lookups)
+
+    def hit_ratio(self) -> float:
+        """Share of lookups answered without a fetch of their own"""
+        with self._lock:
+            hits = self.stats['memory_hits'] + self.stats['disk_hits'] + self.stats['coalesced']
+            lookups = hits + self.stats['misses']
+        return hits / lookups if lookups else 0.0
+
+    def report(self) -> Dict[str, float]:
+        """Hit counters per tier, coalesced lookups and the overall hit ratio"""
+        with self._lock:
+            stats, entries = dict(self.stats), len(self._memory)
+        return {**stats, 'hit_ratio': self.hit_ratio(), 'memory_entries': entries}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+
+_WEATHER_CACHE: Optional[WeatherTileCache] = None
+_WEATHER_CACHE_LOCK = threading.Lock()
+
+
+def get_weather_cache() -> WeatherTileCache:
+    """Process-wide weather tile cache, shared by every WeatherAPI instance"""
+    global _WEATHER_CACHE
+    with _WEATHER_CACHE_LOCK:
+        if _WEATHER_CACHE is None:
+            _WEATHER_CACHE = WeatherTileCache(flight=get_singleflight("weather"))
+        return _WEATHER_CACHE
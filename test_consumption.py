@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.models.consumption import consumption_grid, what_if_table
+from src.models.fleet_state import FleetState
+from src.models.vessel import BulkCarrierVessel, TankerVessel, WeatherCondition
+
+COMMON = dict(lat=37.9, lon=23.7, destination="Piraeus",
+              eta=datetime.now() + timedelta(hours=48), cargo_status="En Route", fuel_level=80)
+
+
+def _fleet():
+    fleet = FleetState()
+    tanker = TankerVessel(name="TANKER", tank_type="crude_oil", cargo_capacity=1000.0,
+                          fleet=fleet, **COMMON)
+    tanker.heating_required = True
+    bulk = BulkCarrierVessel(name="BULK", hold_count=5, hatch_type="folding",
+                             fleet=fleet, **COMMON)
+    bulk.ballast_condition = "heavy"
+    bulk.hull_efficiency = 90.0
+    plain = TankerVessel(name="PLAIN", tank_type="crude_oil", cargo_capacity=1000.0,
+                         fleet=fleet, **COMMON)
+    return [tanker, bulk, plain]
+
+
+def test_grid_matches_scalar_methods():
+    vessels = _fleet()
+    speeds = np.arange(0.0, 20.5, 0.5)
+    conditions = list(WeatherCondition)
+    loads = [50.0, 70.0, 95.0]
+    grid = consumption_grid(vessels, speeds, conditions, loads)
+    per_mile = consumption_grid(vessels, speeds, conditions, loads, per_mile=True)
+    assert grid.shape == (3, len(speeds), 4, 3)
+
+    for v, vessel in enumerate(vessels):
+        for s in (0, 7, 24, 40):
+            for w, condition in enumerate(conditions):
+                for l, load in enumerate(loads):
+                    vessel.speed = speeds[s]
+                    vessel.current_weather = condition
+                    vessel.load_percentage = load
+                    assert np.isclose(grid[v, s, w, l], vessel.calculate_specific_consumption())
+                    expected = (vessel.calculate_specific_consumption() / (speeds[s] * 24)
+                                if speeds[s] else 0.0)
+                    assert np.isclose(per_mile[v, s, w, l], expected)
+
+
+def test_current_conditions_and_profile():
+    vessels = _fleet()
+    vessels[1].current_weather = WeatherCondition.ROUGH
+    grid = consumption_grid(vessels, [12.0])
+    assert grid.shape == (3, 1, 1, 1)
+    assert np.isclose(grid[1, 0, 0, 0], 30.0 * 1.3 * 100 / 90 * 1.1)
+
+    profile = vessels[2].consumption_profile([10.0, 12.0, 14.0], per_mile=True)
+    assert profile.shape == (3, 1, 1)
+    assert np.all(np.diff(profile[:, 0, 0]) > 0)
+
+
+def test_what_if_table():
+    vessels = _fleet()
+    table = what_if_table(vessels, [10.0, 14.0], [WeatherCondition.CALM, WeatherCondition.SEVERE], [70.0])
+    assert len(table) == 3 * 2 * 2
+    row = table[(table.vessel == "PLAIN") & (table.speed == 14.0) & (table.weather == "Severe")].iloc[0]
+    assert np.isclose(row.daily_consumption, 30.0 * (14 / 12) ** 3 * 1.5 * 100 / 95)
+    assert np.isclose(row.consumption_per_mile, row.daily_consumption / (14.0 * 24))
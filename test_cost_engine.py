@@ -0,0 +1,104 @@
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.models.cost_engine import (compute_voyage_costs, fleet_voyage_costs, monthly_cost_summary,
+                                    voyage_cost_table)
+from src.models.vessel import TankerVessel, VoyageData
+
+PORTS = ["Piraeus", "Santorini", "Heraklion", "Rhodes"]
+
+
+def _reference_costs(vessel, voyage):
+    """Per-voyage loop of the original cost calculation"""
+    fuel_cost = voyage.fuel_consumption * vessel.fuel_cost_per_ton
+    port_costs = port_delay_costs = 0.0
+    for port in [voyage.origin] + voyage.intermediate_stops + [voyage.destination]:
+        if port in vessel.port_costs:
+            waiting = voyage.port_waiting_times.get(port, timedelta(0))
+            port_costs += vessel.port_costs[port]["docking"]
+            port_costs += vessel.port_costs[port]["daily_rate"] * waiting.total_seconds() / 86400
+            port_delay_costs += waiting.total_seconds() / 3600 * 500
+    schedule = 0.0
+    if voyage.actual_arrival_time and voyage.actual_arrival_time > voyage.end_date:
+        schedule = (voyage.actual_arrival_time - voyage.end_date).total_seconds() / 3600 * 750
+    total = fuel_cost + port_costs + port_delay_costs + schedule
+    return {"fuel_cost": fuel_cost, "port_costs": port_costs, "port_delay_costs": port_delay_costs,
+            "schedule_deviation_costs": schedule, "total_cost": total,
+            "cost_per_mile": total / voyage.distance}
+
+
+def _vessel(name, voyages, seed):
+    rng = random.Random(seed)
+    vessel = TankerVessel(
+        name=name, lat=37.9, lon=23.7, destination="Piraeus",
+        eta=datetime.now() + timedelta(hours=48), cargo_status="En Route",
+        fuel_level=80, tank_type="crude_oil", cargo_capacity=1000.0
+    )
+    for i in range(voyages):
+        start = datetime(2023, 1, 1) + timedelta(hours=rng.randrange(365 * 24))
+        end = start + timedelta(days=2)
+        origin, destination, stop = rng.sample(PORTS, 3)
+        vessel.add_voyage(VoyageData(
+            voyage_id=f"{name}-{i}", start_date=start, end_date=end, origin=origin,
+            destination=destination, intermediate_stops=[stop] if i % 2 else [],
+            distance=rng.uniform(100, 400), fuel_consumption=rng.uniform(10, 40),
+            cargo_load=80.0, weather_conditions=[],
+            port_waiting_times={p: timedelta(hours=rng.uniform(0, 12)) for p in (origin, stop)},
+            total_cost=rng.uniform(1e4, 5e4), average_speed=12.0, route_efficiency=0.95,
+            actual_arrival_time=end + timedelta(hours=rng.uniform(-5, 10)) if i % 3 else None
+        ))
+    return vessel
+
+
+def test_batch_matches_per_voyage_loop():
+    vessels = [_vessel("A", 200, 1), _vessel("B", 150, 2)]
+    vessels[1].port_costs = {"Rhodes": {"docking": 700, "daily_rate": 300}}
+
+    pairs = [(vessel, voyage) for vessel in vessels for voyage in vessel.voyage_history]
+    batch = compute_voyage_costs(pairs)
+    for i, (vessel, voyage) in enumerate(pairs):
+        expected = _reference_costs(vessel, voyage)
+        for column, value in expected.items():
+            assert np.isclose(batch[column][i], value), column
+        assert vessel.calculate_voyage_costs(voyage).keys() == expected.keys()
+
+
+def test_history_columns_match_per_voyage_results():
+    vessels = [_vessel("A", 40, 4), _vessel("B", 25, 5), _vessel("C", 0, 6)]
+    vessels[1].port_costs = {"Piraeus": {"docking": 900, "daily_rate": 450}}
+
+    def check():
+        batch = fleet_voyage_costs(vessels)
+        voyages = [(vessel, voyage) for vessel in vessels for voyage in vessel.voyage_history]
+        assert len(batch["total_cost"]) == len(voyages)
+        for i, (vessel, voyage) in enumerate(voyages):
+            expected = _reference_costs(vessel, voyage)
+            scalar = vessel.calculate_voyage_costs(voyage)
+            for column, value in expected.items():
+                assert np.isclose(batch[column][i], value), column
+                assert np.isclose(scalar[column], value), column
+
+    check()
+    assert vessels[0].voyage_history.columns() is vessels[0].voyage_history.columns()
+    # Adding a voyage rebuilds that vessel's columns
+    vessels[2].add_voyage(next(iter(_vessel("C", 1, 7).voyage_history)))
+    check()
+
+
+def test_cost_table_and_monthly_summary():
+    vessel = _vessel("A", 300, 3)
+    table = voyage_cost_table([vessel])
+    assert len(table) == 300
+
+    monthly = monthly_cost_summary(table)
+    for month in ("2023-02", "2023-07"):
+        voyages = [v for v in vessel.voyage_history if v.start_date.strftime('%Y-%m') == month]
+        row = monthly.loc[month]
+        assert row.total_voyages == len(voyages)
+        assert np.isclose(row.cost_per_mile,
+                          sum(v.total_cost for v in voyages) / sum(v.distance for v in voyages))
+        delay = [(c := vessel.calculate_voyage_costs(v))['port_delay_costs']
+                 + c['schedule_deviation_costs'] for v in voyages]
+        assert np.isclose(row.avg_delay_cost, sum(delay) / len(delay))
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.models.delay_ledger import DelayLedger, ReasonCodes, fleet_delay_costs
+from src.models.vessel import PortCongestion, TankerVessel, WeatherCondition
+
+
+def test_running_totals_and_bounded_detail():
+    ledger = DelayLedger(detail_size=10, reasons=ReasonCodes())
+    start = datetime(2024, 1, 1)
+    for i in range(100):
+        ledger.add(timedelta(minutes=30), "Weather" if i % 2 else "Port", cost=100.0,
+                   weather=WeatherCondition.ROUGH if i % 2 else WeatherCondition.CALM,
+                   timestamp=start + timedelta(hours=i))
+
+    assert ledger.count == 100 and len(ledger) == 10
+    assert ledger.total_cost == 10000.0
+    assert ledger.total_duration == timedelta(minutes=3000)
+    assert ledger.cost_by_reason() == {"Port": 5000.0, "Weather": 5000.0}
+    assert ledger.cost_by_weather()["ROUGH"] == 5000.0
+    np.testing.assert_array_equal(ledger.recent()['timestamp'][[0, -1]],
+                                  [(start + timedelta(hours=h)).timestamp() for h in (90, 99)])
+    assert ledger.entries()[-1]['reason'] == "Weather"
+    assert ledger.entries()[-1]['weather'] == "ROUGH"
+
+
+def test_storage_is_allocated_by_the_first_delay():
+    ledger = DelayLedger(detail_size=10, days=30, reasons=ReasonCodes())
+    assert ledger.detail.nbytes == 0 and ledger.bucket_day.nbytes == 0
+    assert len(ledger) == 0 and len(ledger.recent()) == 0 and ledger.entries() == []
+    assert ledger.cost_by_reason(since=datetime(2024, 1, 1)) == {}
+    assert fleet_delay_costs([ledger]) == {}
+
+    ledger.add(timedelta(hours=1), "Port", cost=50.0, timestamp=datetime(2024, 1, 1))
+    assert len(ledger.detail) == 10 and len(ledger.bucket_day) == 30
+    assert ledger.cost_by_reason(since=datetime(2024, 1, 1)) == {"Port": 50.0}
+
+
+def test_window_and_fleet_rollup():
+    reasons = ReasonCodes()
+    now = datetime(2024, 6, 30, 12)
+    ledgers = [DelayLedger(days=60, reasons=reasons) for _ in range(3)]
+    for i, ledger in enumerate(ledgers):
+        for day in range(90):
+            ledger.add(timedelta(hours=1), f"Cause {day % 3}", cost=10.0 * (i + 1),
+                       timestamp=now - timedelta(days=day))
+
+    since = now - timedelta(days=29)
+    window = ledgers[0].cost_by_reason(since=since)
+    assert sum(window.values()) == 30 * 10.0
+    rollup = fleet_delay_costs(ledgers, since=since, reasons=reasons)
+    assert rollup == {f"Cause {c}": 10 * 60.0 for c in range(3)}
+    # Days older than the bucket window are still in the lifetime totals
+    assert ledgers[2].total_cost == 90 * 30.0
+
+
+def test_vessel_delays():
+    vessel = TankerVessel(
+        name="TEST TANKER", lat=37.9, lon=23.7, destination="Piraeus",
+        eta=datetime.now() + timedelta(hours=48), cargo_status="En Route",
+        fuel_level=80, tank_type="crude_oil", cargo_capacity=1000.0
+    )
+    vessel.update_port_status(PortCongestion.HIGH, available_berths=0, queue_position=2)
+    vessel.current_weather = WeatherCondition.ROUGH
+    vessel.add_delay(timedelta(minutes=30), "Weather", 250.0)
+
+    assert vessel.current_delay == timedelta(minutes=270)
+    assert vessel.total_delay_cost == 2000.0 + 250.0
+    assert vessel.current_eta == vessel.original_eta + timedelta(minutes=270)
+    assert [d['reason'] for d in vessel.delay_history] == ["Port Congestion: High Congestion", "Weather"]
+    # Weather is reported as the vessel's enum member, as before the ledger
+    assert [d['weather'] for d in vessel.delay_history] == [WeatherCondition.CALM, WeatherCondition.ROUGH]
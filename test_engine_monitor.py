@@ -0,0 +1,117 @@
+import numpy as np
+
+from src.models.engine_monitor import (
+    SEVERITIES, PARAMETER_NAMES, StreamingAnomalyDetector, evaluate_engine_alerts
+)
+from src.models.fleet_state import FleetState
+
+
+def _scalar_alerts(values, limits):
+    """Reference per-vessel implementation of the threshold rules"""
+    rpm, load, pressure, temp = values
+    alerts = []
+    if not limits[0][0] <= rpm <= limits[0][1]:
+        alerts.append({'parameter': 0, 'value': rpm, 'normal_range': limits[0],
+                       'severity': 'high' if abs(rpm - sum(limits[0]) / 2) > 15 else 'medium'})
+    if not limits[1][0] <= load <= limits[1][1]:
+        alerts.append({'parameter': 1, 'value': load, 'normal_range': limits[1],
+                       'severity': 'high' if load > 90 else 'medium'})
+    if not limits[2][0] <= pressure <= limits[2][1]:
+        alerts.append({'parameter': 2, 'value': pressure, 'normal_range': limits[2],
+                       'severity': 'high'})
+    if not limits[3][0] <= temp <= limits[3][1]:
+        alerts.append({'parameter': 3, 'value': temp, 'normal_range': limits[3],
+                       'severity': 'high' if temp > limits[3][1] + 10 else 'medium'})
+    return {
+        'has_alerts': len(alerts) > 0,
+        'alerts': alerts,
+        'current_values': {'rpm': rpm, 'load': load, 'pressure': pressure, 'temperature': temp}
+    }
+
+
+def _random_fleet(size, spread=1.0, seed=7):
+    """Fleet with engine values around the normal ranges, wider for larger spread"""
+    rng = np.random.default_rng(seed)
+    fleet = FleetState(capacity=size)
+    for _ in range(size):
+        fleet.add(0.0, 0.0)
+    fleet.engine[:size] = np.column_stack((
+        rng.normal(80, 15 * spread, size),
+        rng.normal(72, 15 * spread, size),
+        rng.normal(8.0, 0.5 * spread, size),
+        rng.normal(80, 8 * spread, size)
+    ))
+    return fleet
+
+
+def test_matches_per_vessel_rules():
+    fleet = _random_fleet(500)
+    alerts = evaluate_engine_alerts(fleet)
+
+    expected = [
+        (slot, alert['parameter'], alert['severity'])
+        for slot in range(500)
+        for alert in _scalar_alerts(fleet.engine[slot], fleet.engine_limits[slot])['alerts']
+    ]
+    actual = [(a['vessel'], a['parameter'], SEVERITIES[a['severity']]) for a in alerts]
+    assert actual == expected
+    assert len(PARAMETER_NAMES) == len(FleetState.ENGINE_PARAMETERS)
+
+
+def test_slot_selection_and_custom_limits():
+    fleet = _random_fleet(3)
+    fleet.engine[:3] = [80, 70, 8.0, 80]
+    fleet.engine_limits[1, 0] = (85, 95)
+
+    alerts = evaluate_engine_alerts(fleet, [1, 2])
+    assert alerts['vessel'].tolist() == [1]
+    assert PARAMETER_NAMES[alerts['parameter'][0]] == 'RPM'
+
+
+def _feed(detector, samples):
+    return [detector.update(sample) for sample in samples]
+
+
+def test_detector_quiet_on_stationary_noise():
+    rng = np.random.default_rng(1)
+    detector = StreamingAnomalyDetector()
+    samples = np.column_stack((
+        rng.normal(80, 2, 2000), rng.normal(70, 2, 2000),
+        rng.normal(8.0, 0.1, 2000), rng.normal(80, 1, 2000)
+    ))
+    reports = _feed(detector, samples)
+
+    flagged = sum(report['has_anomaly'] for report in reports)
+    assert flagged < 0.01 * len(reports)
+    assert detector.count == 2000
+
+
+def test_detector_flags_spike_with_factor():
+    rng = np.random.default_rng(2)
+    detector = StreamingAnomalyDetector()
+    _feed(detector, np.column_stack((
+        rng.normal(80, 1, 200), rng.normal(70, 1, 200),
+        rng.normal(8.0, 0.05, 200), rng.normal(80, 0.5, 200)
+    )))
+
+    report = detector.update((80, 70, 8.0, 95))
+    assert report['has_anomaly']
+    assert {'parameter': 'temp', 'type': 'spike'}.items() <= report['anomalies'][0].items()
+    assert report['contributing_factors']['temp'] > 15
+
+
+def test_detector_flags_gradual_drift():
+    rng = np.random.default_rng(3)
+    detector = StreamingAnomalyDetector()
+    steady = 300
+    ramp = np.concatenate((np.zeros(steady), np.arange(200) * 0.05))
+    samples = np.column_stack((
+        rng.normal(80, 1, len(ramp)), rng.normal(70, 1, len(ramp)),
+        rng.normal(8.0, 0.05, len(ramp)), 80 + ramp + rng.normal(0, 0.5, len(ramp))
+    ))
+    reports = _feed(detector, samples)
+
+    drift = [i for i, report in enumerate(reports)
+             if any(a['type'] == 'drift' and a['parameter'] == 'temp' for a in report['anomalies'])]
+    assert drift and drift[0] > steady
+    assert not any(r['has_anomaly'] and r['anomaly_type'] == 'spike' for r in reports[steady:])
@@ -0,0 +1,47 @@
+import numpy as np
+
+from src.models.fleet_state import FleetState
+from src.utils.api_handler import MarineTrafficAPI
+from src.utils.fleet_simulator import FleetSimulator
+from src.utils.geo import initial_bearing
+
+
+def _run(seed, ticks=20):
+    simulator = FleetSimulator(FleetState(), seed=seed)
+    simulator.populate(500)
+    simulator.run(ticks)
+    return simulator.fleet
+
+
+def test_seeded_runs_are_reproducible():
+    first, second = _run(7), _run(7)
+    slots = first.slots
+    for field in FleetState.FIELDS:
+        np.testing.assert_array_equal(getattr(first, field)[slots], getattr(second, field)[slots])
+    assert not np.array_equal(first.lat[slots], _run(8).lat[slots])
+
+
+def test_step_updates_all_columns():
+    fleet = _run(1, ticks=30)
+    slots = fleet.slots
+    assert len(slots) == 500
+    assert np.all(fleet.track.count[slots] == 30)
+    assert np.all(fleet.speed_history.count[slots] == 30)
+    assert np.all((fleet.speed[slots] >= 0) & (fleet.speed[slots] <= fleet.max_speed[slots]))
+
+    track = fleet.track.get(slots[0])
+    expected = initial_bearing(track[-2, 0], track[-2, 1], track[-1, 0], track[-1, 1])
+    assert abs(fleet.heading[slots[0]] - expected) < 0.5  # Tracks are stored as float32
+
+
+def test_add_many_and_api_delegation():
+    fleet = FleetState(capacity=2)
+    fleet.add(0.0, 0.0)
+    slots = fleet.add_many(np.ones(10), np.ones(10), speed=5.0)
+    np.testing.assert_array_equal(slots, np.arange(1, 11))
+    assert len(fleet) == 11 and fleet.capacity >= 11
+
+    api = MarineTrafficAPI()
+    api.simulator.rng = np.random.default_rng(0)
+    api.update_fleet_positions(slots, fleet)
+    assert np.all(fleet.track.count[slots] == 1)
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.models.fleet_state import FleetState
+from src.models.vessel import TankerVessel
+from src.utils.api_handler import MarineTrafficAPI
+
+
+def _tanker(fleet, name="TEST TANKER", lat=37.9, lon=23.7):
+    return TankerVessel(
+        name=name, lat=lat, lon=lon, destination="Piraeus",
+        eta=datetime.now() + timedelta(hours=48), cargo_status="En Route",
+        fuel_level=80, tank_type="crude_oil", cargo_capacity=100000.0, fleet=fleet
+    )
+
+
+def test_vessel_is_view_over_fleet_row():
+    fleet = FleetState(capacity=1)
+    first = _tanker(fleet, "FIRST")
+    second = _tanker(fleet, "SECOND", lat=36.0)
+
+    assert fleet.capacity >= 2
+    assert second.position == (36.0, 23.7)
+    assert first.fuel_level == 80
+
+    fleet.speed[second.slot] = 17.5
+    assert second.speed == 17.5
+    first.speed = 9.0
+    assert fleet.speed[first.slot] == 9.0
+
+
+def test_history_rings_keep_latest_samples():
+    fleet = FleetState(history_size=3, track_size=3)
+    vessel = _tanker(fleet)
+    vessel.track_history = [vessel.position]
+
+    for i in range(5):
+        fleet.move([vessel.slot], [float(i)], [float(i)])
+        fleet.set_speed([vessel.slot], [float(i)])
+
+    np.testing.assert_allclose(vessel.track_history, [[2, 2], [3, 3], [4, 4]])
+    np.testing.assert_allclose(vessel.speed_history, [2, 3, 4])
+
+
+def test_filter_sort_and_slot_reuse():
+    fleet = FleetState()
+    for speed in (10.0, 14.0, 12.0):
+        fleet.add(0.0, 0.0, speed=speed)
+
+    np.testing.assert_array_equal(fleet.sort('speed'), [0, 2, 1])
+    np.testing.assert_array_equal(fleet.filter(fleet.speed > 11), [1, 2])
+
+    fleet.remove(1)
+    assert len(fleet) == 2
+    assert fleet.add(1.0, 1.0) == 1
+
+
+def test_fleet_wide_update():
+    fleet = FleetState(capacity=5_000)
+    for i in range(5_000):
+        fleet.add(37.0 + i * 1e-5, 24.0, speed=12.0)
+
+    MarineTrafficAPI().update_fleet_positions(fleet=fleet)
+
+    assert np.all(fleet.track.count[fleet.slots] == 1)
+    assert np.all((fleet.speed >= 0) & (fleet.speed <= fleet.max_speed))
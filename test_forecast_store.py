@@ -0,0 +1,63 @@
+import random
+from datetime import datetime, timedelta
+
+from src.models.forecast_store import ForecastStore
+from src.models.types import WeatherCondition as TypesCondition
+from src.models.vessel import TankerVessel, WeatherCondition, WeatherForecast
+
+DELAYS = {'ROUGH': 30, 'SEVERE': 60}
+
+
+def _forecasts(start, hours, seed=5):
+    rng = random.Random(seed)
+    conditions = list(WeatherCondition)
+    forecasts = [
+        WeatherForecast(location=(37.9, 23.7), timestamp=start + timedelta(hours=h),
+                        condition=rng.choice(conditions), wind_speed=10.0,
+                        wave_height=1.0, visibility=10.0)
+        for h in range(hours)
+    ]
+    rng.shuffle(forecasts)
+    return forecasts
+
+
+def test_window_queries_match_linear_scan():
+    start = datetime(2024, 6, 1)
+    forecasts = _forecasts(start, 500)
+    store = ForecastStore(forecasts)
+
+    lo, hi = start + timedelta(hours=40.5), start + timedelta(hours=200)
+    expected = sorted((f for f in forecasts if lo <= f.timestamp <= hi), key=lambda f: f.timestamp)
+    assert store.window(lo, hi) == expected
+    assert store.alerts(lo, hi) == [f for f in expected if f.condition.name in DELAYS]
+    assert store.delay(lo, hi) == timedelta(
+        minutes=sum(DELAYS.get(f.condition.name, 0) for f in expected))
+    assert store.delay() == timedelta(
+        minutes=sum(DELAYS.get(f.condition.name, 0) for f in forecasts))
+    assert len(store.next_hours(3, now=start)) == 4
+    assert store.until(start - timedelta(hours=1)) == []
+
+
+def test_conditions_from_either_enum():
+    now = datetime.now()
+    store = ForecastStore([
+        WeatherForecast((0, 0), now, TypesCondition.SEVERE, 30, 5, 2),
+        WeatherForecast((0, 0), now, WeatherCondition.ROUGH, 20, 3, 5),
+    ])
+    assert store.delay() == timedelta(minutes=90)
+
+
+def test_vessel_uses_store():
+    eta = datetime.now() + timedelta(hours=10)
+    vessel = TankerVessel(
+        name="TEST TANKER", lat=37.9, lon=23.7, destination="Piraeus", eta=eta,
+        cargo_status="En Route", fuel_level=80, tank_type="crude_oil", cargo_capacity=1000.0
+    )
+    vessel.weather_forecasts = _forecasts(datetime.now(), 24)
+    assert isinstance(vessel.weather_forecasts, ForecastStore)
+
+    summary = vessel.get_weather_summary()
+    relevant = [f for f in vessel.weather_forecasts if f.timestamp <= eta]
+    assert summary['destination']['time'] == relevant[-1].timestamp.strftime('%H:%M')
+    assert len(summary['alerts']) == sum(f.condition.name in DELAYS for f in relevant)
+    assert vessel.calculate_weather_delay() == vessel.weather_forecasts.delay()
@@ -0,0 +1,48 @@
+import numpy as np
+
+from src.models.fleet_state import HistoryRing
+from src.utils import geo
+
+PIRAEUS = (37.9420, 23.6465)
+HERAKLION = (35.3462, 25.1456)
+
+
+def test_distances_and_bearings():
+    # About 170 nm great circle between Piraeus and Heraklion
+    distance = geo.haversine_nm(*PIRAEUS, *HERAKLION)
+    assert 165 < distance < 175
+    assert abs(geo.rhumb_distance_nm(*PIRAEUS, *HERAKLION) - distance) < 1
+    assert abs(geo.haversine_nm(0, 0, 0, 1) - 60.04) < 0.1
+    assert geo.initial_bearing(0, 0, 1, 0) == 0
+    assert abs(geo.rhumb_bearing(0, 0, 0, -1) - 270) < 1e-9
+
+
+def test_destination_round_trip_and_matrix():
+    rng = np.random.default_rng(4)
+    lat, lon = rng.uniform(30, 45, 50), rng.uniform(10, 35, 50)
+    bearing, distance = rng.uniform(0, 360, 50), rng.uniform(1, 500, 50)
+
+    lat2, lon2 = geo.destination_point(lat, lon, bearing, distance)
+    np.testing.assert_allclose(geo.haversine_nm(lat, lon, lat2, lon2), distance, rtol=1e-9)
+    np.testing.assert_allclose(geo.initial_bearing(lat, lon, lat2, lon2), bearing, atol=1e-6)
+
+    matrix = geo.distance_matrix(lat, lon)
+    assert matrix.shape == (50, 50)
+    np.testing.assert_allclose(matrix, matrix.T)
+    np.testing.assert_allclose(matrix[3, 7], geo.haversine_nm(lat[3], lon[3], lat[7], lon[7]))
+
+
+def test_track_lengths_in_one_call():
+    ring = HistoryRing(capacity=3, length=8, shape=(2,), chunk_length=2)
+    steps = {0: 5, 1: 20, 2: 1}
+    for slot, count in steps.items():
+        for i in range(count):
+            ring.append(np.array([slot]), np.array([[37.0 + 0.1 * i, 24.0]]))
+
+    lengths = geo.ring_track_lengths(ring, [0, 1, 2])
+    expected = [geo.path_length_nm(ring.get(slot).astype(np.float64)) for slot in steps]
+    np.testing.assert_allclose(lengths, expected, rtol=1e-6)
+    assert lengths[2] == 0
+
+    track = np.array([[37.0, 24.0], [37.5, 24.5], [38.0, 24.0]])
+    assert 0 < geo.route_efficiency(track) < 1
@@ -0,0 +1,183 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from src.utils import http_client
+from src.utils.http_client import HostPolicy, HTTPClient, LatencyHistogram, get_http_client, retry_after_seconds
+
+
+class ScriptedServer:
+    """Keep-alive HTTP/1.1 server answering with a scripted list of (status, headers)"""
+
+    def __init__(self, script=()):
+        self.script = list(script)
+        self.clients = []
+
+    def __enter__(self):
+        scripted = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                scripted.clients.append(self.client_address)
+                status, headers = scripted.script.pop(0) if scripted.script else (200, {})
+                body = b'{"ok": true}'
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.host = f"127.0.0.1:{self.server.server_address[1]}"
+        self.url = f"http://{self.host}/v2/weather/point"
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _client(**policy):
+    sleeps = []
+    client = HTTPClient(HostPolicy(**policy), seed=1, sleep=sleeps.append)
+    return client, sleeps
+
+
+def test_connections_are_kept_alive():
+    client, _ = _client()
+    with ScriptedServer() as server:
+        for _ in range(5):
+            assert client.get(server.url).json() == {'ok': True}
+    client.close()
+    assert len(server.clients) == 5
+    assert len(set(server.clients)) == 1  # One TCP connection for all requests
+
+
+def test_retries_server_errors_with_jittered_backoff():
+    client, sleeps = _client(backoff_base=0.5, backoff_max=1.5)
+    with ScriptedServer([(503, {}), (502, {}), (500, {})]) as server:
+        response = client.get(server.url)
+    assert response.status_code == 200
+    assert len(sleeps) == 3
+    assert all(0 <= delay <= cap for delay, cap in zip(sleeps, (0.5, 1.0, 1.5)))
+    assert len(set(sleeps)) == 3
+
+
+def test_honors_retry_after():
+    client, sleeps = _client()
+    with ScriptedServer([(429, {'Retry-After': '7'})]) as server:
+        assert client.get(server.url).status_code == 200
+    assert sleeps == [7.0]
+
+
+def test_gives_up_after_max_retries_or_long_retry_after():
+    client, sleeps = _client(max_retries=2)
+    with ScriptedServer([(503, {})] * 5) as server:
+        response = client.get(server.url)
+        assert response.status_code == 503
+        assert len(server.clients) == 3
+        with pytest.raises(requests.HTTPError):
+            response.raise_for_status()
+
+    client, sleeps = _client(max_retry_after=60)
+    with ScriptedServer([(429, {'Retry-After': '3600'})]) as server:
+        assert client.get(server.url).status_code == 429
+    assert sleeps == []
+
+
+def test_client_errors_are_not_retried():
+    client, sleeps = _client()
+    with ScriptedServer([(404, {})]) as server:
+        assert client.get(server.url).status_code == 404
+    assert sleeps == [] and len(server.clients) == 1
+
+
+def test_connection_errors_are_retried_then_raised():
+    client, sleeps = _client(max_retries=2, timeout=1.0)
+    with ScriptedServer() as server:
+        url = server.url
+    with pytest.raises(requests.ConnectionError):
+        client.get(url)
+    assert len(sleeps) == 2
+
+
+def test_per_host_policy():
+    client, sleeps = _client(max_retries=3)
+    with ScriptedServer([(503, {})] * 5) as server:
+        client.configure(server.host, max_retries=0, pool_maxsize=64)
+        assert client.get(server.url).status_code == 503
+    assert sleeps == []
+    adapter = client.session.get_adapter(server.url)
+    assert adapter._pool_maxsize == 64
+    assert client.policy('example.com').max_retries == 3
+
+
+def test_latency_report_per_endpoint():
+    client, _ = _client()
+    with ScriptedServer([(503, {})]) as server:
+        client.get(server.url)
+        client.get(server.url.replace('weather/point', 'tide/sea-level'))
+    report = client.latency_report()
+    point = report[f"{server.host}/v2/weather/point"]
+    assert point['count'] == 2 and point['retries'] == 1
+    assert report[f"{server.host}/v2/tide/sea-level"]['count'] == 1
+    assert 0 < point['p50_ms'] <= point['p99_ms']
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for ms in [3] * 90 + [40] * 9 + [700]:
+        histogram.record(ms / 1000)
+    summary = histogram.summary()
+    assert summary['count'] == 100
+    assert summary['p50_ms'] == 5 and summary['p90_ms'] == 5
+    assert summary['p99_ms'] == 50
+    assert histogram.percentile(100) == 1000
+    assert summary['mean_ms'] == pytest.approx((270 + 360 + 700) / 100)
+
+
+def test_retry_after_parsing():
+    now = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+    assert retry_after_seconds('120') == 120.0
+    assert retry_after_seconds(format_datetime(now + timedelta(seconds=30), usegmt=True), now) == 30.0
+    assert retry_after_seconds(format_datetime(now - timedelta(seconds=30), usegmt=True), now) == 0.0
+    assert retry_after_seconds('soon') is None
+    assert retry_after_seconds(None) is None
+
+
+def test_deadline_stops_retrying():
+    client, sleeps = _client(backoff_base=0.5)
+    with ScriptedServer([(503, {'Retry-After': '5'}), (503, {})]) as server:
+        response = client.get(server.url, deadline=2.0)
+    assert response.status_code == 503
+    assert sleeps == []
+
+
+def test_concurrent_first_use_creates_one_shared_client(monkeypatch):
+    monkeypatch.setattr(http_client, '_HTTP_CLIENT', None)
+    barrier = threading.Barrier(8)
+    clients = []
+
+    def first_use():
+        barrier.wait()
+        clients.append(get_http_client())
+
+    threads = [threading.Thread(target=first_use) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(clients) == 8 and all(client is clients[0] for client in clients)
@@ -0,0 +1,74 @@
+import numpy as np
+
+from src.models.pareto import (MAX_SHARED_WORKERS, OBJECTIVES, ParetoRouteSearch, get_pareto_search, pareto_front,
+                               select_spread)
+from src.models.port_distances import get_route_planner
+from src.models.route import RouteGraph, RoutePlanner, get_route_graph
+
+
+def _dominated_brute(points, j):
+    return any((points[i] <= points[j]).all() and (points[i] < points[j]).any()
+               for i in range(len(points)))
+
+
+def test_pareto_front_matches_brute_force():
+    points = np.random.default_rng(3).integers(0, 6, (60, 3)).astype(float)
+    front = pareto_front(points)
+    expected = [j for j in range(len(points)) if not _dominated_brute(points, j)]
+    # Duplicates keep only their first occurrence
+    unique_expected = [j for j in expected
+                       if not any((points[i] == points[j]).all() for i in range(j))]
+    assert front.tolist() == unique_expected
+
+
+def test_select_spread_keeps_extremes():
+    points = np.array([[0.0, 10.0], [1.0, 8.0], [2.0, 5.0], [3.0, 4.0], [10.0, 0.0]])
+    chosen = select_spread(points, np.arange(5), 3)
+    assert 0 in chosen and 4 in chosen and len(chosen) == 3
+
+
+def _storm():
+    graph = get_route_graph()
+    codes = np.zeros(graph.shape, dtype=np.int8)
+    row_lo, col_lo = graph.cell(36.6, 22.0)
+    row_hi, col_hi = graph.cell(36.9, 25.8)
+    codes[row_lo:row_hi, col_lo:col_hi] = 3
+    return codes
+
+
+def test_search_returns_non_dominated_trade_offs():
+    search = ParetoRouteSearch()
+    options = search.search("Piraeus", "Heraklion", speeds=(10.0, 14.0), weather=_storm(), max_options=4)
+
+    assert 2 <= len(options) <= 4
+    objectives = np.array([[getattr(plan, name) for name in OBJECTIVES] for plan in options])
+    assert not any(_dominated_brute(objectives, j) for j in range(len(options)))
+    assert [plan.estimated_time for plan in options] == sorted(plan.estimated_time for plan in options)
+    # Both a fast route through the storm and a slower route around it
+    assert {plan.weather_risk for plan in options} >= {"High", "Low"}
+
+
+def test_process_pool_matches_serial():
+    kwargs = dict(speeds=(12.0,), weights=[(1, 0, 0, 0), (0, 0, 0, 1), (0, 0.5, 0.5, 0)], weather=_storm())
+    serial = ParetoRouteSearch().candidates("Piraeus", "Heraklion", **kwargs)
+    with ParetoRouteSearch(workers=2) as search:
+        parallel = search.candidates("Piraeus", "Heraklion", **kwargs)
+    assert [p.waypoints for p in parallel] == [p.waypoints for p in serial]
+    assert [p.total_cost for p in parallel] == [p.total_cost for p in serial]
+
+
+def test_process_wide_search_is_shared():
+    search = get_pareto_search()
+    assert get_pareto_search() is search
+    assert search.planner is get_route_planner()
+    assert 1 <= search.workers <= MAX_SHARED_WORKERS
+
+
+def test_serial_search_uses_the_planners_graph():
+    # Open sea only: the straight line is the shortest route, unlike on the Aegean grid
+    graph = RouteGraph(bounds=(36.0, 23.0, 37.0, 24.0), resolution=0.1, land={})
+    search = ParetoRouteSearch(RoutePlanner(graph=graph))
+    plans = search.candidates((36.1, 23.1), (36.9, 23.9), speeds=(12.0,), weights=[(1, 0, 0, 0)])
+    waypoints = plans[0].waypoints
+    assert np.allclose(waypoints[0], (36.1, 23.1)) and np.allclose(waypoints[-1], (36.9, 23.9))
+    assert all(36.0 - 1e-9 <= lat <= 37.0 + 1e-9 and 23.0 - 1e-9 <= lon <= 24.0 + 1e-9 for lat, lon in waypoints)
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.models.cost_engine import planned_distances
+from src.models.port_distances import PortDistanceMatrix
+from src.models.port_registry import DEFAULT_PORTS, PortRegistry
+from src.models.route import RoutePlanner
+from src.models.vessel import VoyageData
+from src.utils import geo
+
+
+def test_matrix_matches_route_planner(tmp_path):
+    registry = PortRegistry()
+    matrix = PortDistanceMatrix(tmp_path, registry=registry)
+    planner = RoutePlanner(registry=registry)
+
+    assert matrix.ports == list(DEFAULT_PORTS)
+    np.testing.assert_allclose(matrix.distances, matrix.distances.T)
+    assert np.all(np.diag(matrix.distances) == 0)
+
+    plan = planner.plan("Piraeus", "Heraklion", "Time")
+    assert abs(matrix.distance("Piraeus", "Heraklion") - plan.distance) < 1.0
+    path = matrix.path("Heraklion", "Piraeus")
+    np.testing.assert_allclose(path, matrix.path("Piraeus", "Heraklion")[::-1])
+
+    cached = RoutePlanner(registry=registry, distances=matrix).plan("Heraklion", "Piraeus", "Cost")
+    assert cached.nodes_expanded == 0
+    assert cached.distance == np.float64(geo.path_length_nm(path))
+
+
+def test_matrix_is_memory_mapped_on_restart(tmp_path):
+    registry = PortRegistry()
+    built = PortDistanceMatrix(tmp_path, registry=registry)
+
+    loaded = PortDistanceMatrix(tmp_path, registry=registry)
+    assert isinstance(loaded.distances, np.memmap)
+    np.testing.assert_array_equal(loaded.distances, built.distances)
+    np.testing.assert_array_equal(loaded.path("Santorini", "Piraeus"), built.path("Santorini", "Piraeus"))
+
+
+def test_adding_a_port_extends_matrix(tmp_path):
+    registry = PortRegistry()
+    matrix = PortDistanceMatrix(tmp_path, registry=registry)
+    before = np.array(matrix.distances)
+
+    registry.add_ports({"Rhodes": (36.4510, 28.2278, 950.0, 480.0, 5)})
+    assert matrix.distance("Rhodes", "Piraeus") > matrix.distance("Santorini", "Piraeus")
+    np.testing.assert_array_equal(matrix.distances[:3, :3], before)
+
+    reloaded = PortDistanceMatrix(tmp_path, registry=registry)
+    assert reloaded.ports == ["Piraeus", "Santorini", "Heraklion", "Rhodes"]
+    assert reloaded.distance("Piraeus", "Rhodes") == matrix.distance("Piraeus", "Rhodes")
+
+
+def test_planned_distances_for_voyages(tmp_path):
+    matrix = PortDistanceMatrix(tmp_path, registry=PortRegistry())
+    now = datetime.now()
+
+    def voyage(origin, destination, stops=()):
+        return VoyageData("V", now, now + timedelta(days=1), origin, destination, list(stops),
+                          200.0, 20.0, 70.0, [], {}, 0.0, 12.0, 0.9)
+
+    planned = planned_distances([voyage("Piraeus", "Heraklion"),
+                                 voyage("Piraeus", "Heraklion", ["Santorini"]),
+                                 voyage("Piraeus", "Atlantis")], matrix)
+    assert planned[0] == matrix.distance("Piraeus", "Heraklion")
+    assert planned[1] == matrix.distance("Piraeus", "Santorini") + matrix.distance("Santorini", "Heraklion")
+    assert np.isnan(planned[2])
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.models.port_registry import PortRegistry, get_port_registry
+from src.models.vessel import TankerVessel, VoyageData
+
+
+def _tanker(name="TEST TANKER"):
+    return TankerVessel(
+        name=name, lat=37.9, lon=23.7, destination="Piraeus",
+        eta=datetime.now() + timedelta(hours=48), cargo_status="En Route",
+        fuel_level=80, tank_type="crude_oil", cargo_capacity=1000.0
+    )
+
+
+def _voyage(origin, destination):
+    start = datetime(2024, 5, 1)
+    return VoyageData(
+        voyage_id="V1", start_date=start, end_date=start + timedelta(days=1), origin=origin,
+        destination=destination, intermediate_stops=[], distance=100.0, fuel_consumption=10.0,
+        cargo_load=80.0, weather_conditions=[], port_waiting_times={destination: timedelta(hours=12)},
+        total_cost=0.0, average_speed=12.0, route_efficiency=0.95
+    )
+
+
+def test_registry_is_shared_and_read_only():
+    first, second = _tanker("FIRST"), _tanker("SECOND")
+    assert first.port_costs is second.port_costs
+    assert first.port_costs["Piraeus"] == {"docking": 1000.0, "daily_rate": 500.0}
+    assert set(first.port_costs) == {"Piraeus", "Santorini", "Heraklion"}
+
+    registry = get_port_registry()
+    with pytest.raises(ValueError):
+        registry.docking[0] = 0.0
+
+
+def test_bulk_update_bumps_only_changed_ports():
+    registry = PortRegistry()
+    snapshot = registry.docking
+    registry.update_tariffs(["Santorini", "Heraklion"], docking=[850.0, 950.0])
+
+    assert registry.versions(["Piraeus", "Santorini", "Heraklion", "Nowhere"]) == (0, 1, 1, -1)
+    assert snapshot[registry.id("Santorini")] == 800.0
+    np.testing.assert_array_equal(registry.ids(["Heraklion", "Nowhere"]), [2, -1])
+    assert registry.tariff("Heraklion") == {"docking": 950.0, "daily_rate": 450.0}
+
+    registry.add_ports({"Rhodes": (36.45, 28.23, 700.0, 350.0, 5)})
+    assert registry.position("Rhodes") == (36.45, 28.23)
+    assert registry.versions(["Rhodes"]) == (0,)
+
+
+def test_voyage_costs_invalidated_by_tariff_change():
+    registry = get_port_registry()
+    vessel = _tanker()
+    voyage = _voyage("Piraeus", "Santorini")
+    before = vessel.calculate_voyage_costs(voyage)
+    assert before["port_costs"] == 1000 + 800 + 400 * 0.5
+
+    try:
+        registry.update_tariffs(["Santorini"], docking=[900.0])
+        assert vessel.calculate_voyage_costs(voyage)["port_costs"] == 1000 + 900 + 400 * 0.5
+        # Cached result is unaffected by tariff changes to other ports
+        registry.update_tariffs(["Heraklion"], daily_rate=[500.0])
+        entry = vessel._voyage_costs[id(voyage)]
+        assert vessel.calculate_voyage_costs(voyage) == entry[2]
+    finally:
+        registry.update_tariffs(["Santorini", "Heraklion"], docking=[800.0, 900.0],
+                                daily_rate=[400.0, 450.0])
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from src.models.ring_buffer import RingBuffer
+from src.models.vessel import EngineStatus
+
+
+def test_window_is_ordered_and_bounded():
+    buffer = RingBuffer(('a', 'b'), capacity=4)
+    for i in range(10):
+        buffer.append((i, i * 10))
+
+    assert len(buffer) == 4
+    window = buffer.window()
+    np.testing.assert_array_equal(window['a'], [6, 7, 8, 9])
+    np.testing.assert_array_equal(window['b'], [60, 70, 80, 90])
+    np.testing.assert_array_equal(buffer.column('a', 2), [8, 9])
+    assert buffer.latest() == {'a': 9.0, 'b': 90.0}
+
+
+def test_window_is_zero_copy_view():
+    buffer = RingBuffer(('a',), capacity=3)
+    buffer.append((1,))
+    buffer.append((2,))
+
+    view = buffer.column('a')
+    assert np.shares_memory(view, buffer._data)
+    with pytest.raises(ValueError):
+        view[0] = 5
+
+
+def test_partial_buffer_and_clear():
+    buffer = RingBuffer(('a',), capacity=5)
+    assert buffer.latest() is None
+    buffer.append((1,))
+    buffer.append((2,))
+    np.testing.assert_array_equal(buffer.column('a', 10), [1, 2])
+
+    buffer.clear()
+    assert len(buffer) == 0
+    assert len(buffer.column('a')) == 0
+
+
+def test_engine_status_history():
+    engine = EngineStatus(history_size=3)
+    for rpm in (80, 81, 82, 83):
+        engine.add_reading({'rpm': rpm, 'load': 70, 'pressure': 8.0, 'temp': 80})
+
+    history = engine.readings_history
+    np.testing.assert_array_equal(history['rpm'], [81, 82, 83])
+    assert set(history) == set(EngineStatus.READING_COLUMNS)
@@ -0,0 +1,100 @@
+import numpy as np
+
+from src.models.route import RouteGraph, RoutePlanner, get_route_graph
+from src.utils.geo import haversine_nm
+
+
+def _crosses_land(graph, waypoints):
+    for start, end in zip(waypoints[:-1], waypoints[1:]):
+        if graph._segment_codes(start, end, np.zeros(graph.shape, dtype=np.int8)) is None:
+            return True
+    return False
+
+
+def test_route_between_ports_stays_at_sea():
+    planner = RoutePlanner()
+    plan = planner.plan("Piraeus", "Heraklion", "Time", speed=12.0)
+
+    direct = haversine_nm(*planner.registry.position("Piraeus"), *planner.registry.position("Heraklion"))
+    assert direct <= plan.distance < direct * 1.1
+    assert abs(plan.estimated_time - plan.distance / 12.0) < 1e-9
+    assert plan.fuel_consumption > 0 and plan.weather_risk == "Low"
+    assert not _crosses_land(planner.graph, plan.waypoints)
+
+
+def test_route_goes_around_land():
+    # Straight line from the North Aegean to south of Crete crosses Evia and Crete
+    planner = RoutePlanner()
+    plan = planner.plan((40.5, 25.5), (34.8, 25.0), "Time")
+    direct = float(haversine_nm(40.5, 25.5, 34.8, 25.0))
+    assert plan.distance > direct
+    assert len(plan.waypoints) > 2
+    assert not _crosses_land(planner.graph, plan.waypoints)
+
+
+def test_priorities_use_different_costs():
+    graph = get_route_graph()
+    planner = RoutePlanner(graph)
+    codes = np.zeros(graph.shape, dtype=np.int8)
+    row_lo, col_lo = graph.cell(36.6, 22.0)
+    row_hi, col_hi = graph.cell(36.9, 25.8)
+    codes[row_lo:row_hi, col_lo:col_hi] = 3  # Severe band across the direct route
+
+    fastest = planner.plan("Piraeus", "Heraklion", "Time", weather=codes)
+    safest = planner.plan("Piraeus", "Heraklion", "Weather", weather=codes)
+    assert fastest.weather_risk == "High"
+    assert safest.weather_risk == "Low"
+    assert safest.distance > fastest.distance
+
+    unit = {p: graph.unit_costs(p, 12.0, codes) for p in ("Time", "Fuel", "Cost", "Weather")}
+    assert unit["Cost"][row_lo, col_lo] > unit["Cost"][0, 0]
+    assert not np.allclose(unit["Time"] / unit["Time"][0, 0], unit["Fuel"] / unit["Fuel"][0, 0])
+
+
+def test_land_mask_and_custom_grid():
+    graph = RouteGraph(bounds=(0.0, 0.0, 1.0, 1.0), resolution=0.1,
+                       land={"Wall": [(-1.0, 0.45), (0.85, 0.45), (0.85, 0.55), (-1.0, 0.55)]})
+    assert not graph.sea[graph.cell(0.5, 0.5)]
+    plan = RoutePlanner(graph).plan((0.1, 0.1), (0.1, 0.9))
+    assert max(lat for lat, _ in plan.waypoints) >= 0.9
+
+
+def test_cross_aegean_query_expands_a_fraction_of_the_graph():
+    planner = RoutePlanner()
+    plan = planner.plan((40.8, 24.0), (35.9, 27.5), "Cost")
+    # The distance heuristic keeps the search off most of the sea grid
+    assert 0 < plan.nodes_expanded < planner.graph.sea.sum() / 3
+
+
+def test_diagonal_steps_do_not_cut_land_corners():
+    graph = get_route_graph()
+    rows, cols = graph.shape
+    sea = graph.sea
+    # Node pairs one diagonal step apart whose orthogonal neighbours are not both sea
+    corners = sea[:-1, :-1] & sea[1:, 1:] & ~(sea[:-1, 1:] & sea[1:, :-1])
+    pairs = np.argwhere(corners)[:25]
+    assert len(pairs)
+    unit = np.ones(graph.shape)
+    for row, col in pairs:
+        path, _ = graph.search(row * cols + col, (row + 1) * cols + col + 1, unit)
+        assert len(path) > 2
+        steps = np.array([divmod(node, cols) for node in path])
+        assert not _crosses_land(graph, [(graph.lats[r], graph.lons[c]) for r, c in steps])
+
+
+def test_plans_near_the_coast_evaluate_every_leg():
+    planner = RoutePlanner()
+    graph = planner.graph
+    plan = planner.plan((37.7, 23.9), (37.75, 23.85), "Time")
+    assert plan.distance > 0 and len(plan.leg_conditions) == len(plan.waypoints) - 1
+    assert not _crosses_land(graph, plan.waypoints)
+
+    rng = np.random.default_rng(4)
+    sea_nodes = np.flatnonzero(graph.sea)
+    for node in rng.choice(sea_nodes, 30, replace=False):
+        row, col = divmod(int(node), graph.shape[1])
+        origin = (graph.lats[row], graph.lons[col])
+        destination = (origin[0] + 0.05, origin[1] - 0.05)
+        plan = planner.plan(origin, destination, "Time")
+        assert np.isfinite(plan.estimated_time)
+        assert not _crosses_land(graph, plan.waypoints)
@@ -0,0 +1,129 @@
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.database.db_manager import DatabaseManager
+from src.database.route_cache import CALM_EPOCH, RouteCache, get_route_cache, vessel_profile, weather_epoch
+from src.models.port_distances import get_route_planner
+from src.models.route import get_route_graph
+from src.models.vessel import TankerVessel
+
+OLD_ROUTES_TABLE = """
+CREATE TABLE routes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    origin TEXT NOT NULL,
+    destination TEXT NOT NULL,
+    distance REAL NOT NULL,
+    estimated_time REAL NOT NULL,
+    fuel_consumption REAL NOT NULL,
+    weather_conditions TEXT,
+    created_at TIMESTAMP NOT NULL,
+    actual_time REAL,
+    actual_fuel_consumption REAL,
+    status TEXT DEFAULT 'planned'
+)
+"""
+
+
+def test_two_tier_cache(tmp_path):
+    db = DatabaseManager(str(tmp_path / "routes.db"))
+    cache = RouteCache(db=db)
+
+    first, source = cache.plan("Piraeus", "Heraklion", "Fuel")
+    assert source == 'planner'
+    again, source = cache.plan("Piraeus", "Heraklion", "Fuel")
+    assert source == 'memory' and again is first
+
+    # Another session shares the database tier
+    other = RouteCache(db=db)
+    stored, source = other.plan("Piraeus", "Heraklion", "Fuel")
+    assert source == 'database'
+    assert stored.waypoints == first.waypoints
+    assert stored.total_cost == first.total_cost
+
+    assert cache.plan("Piraeus", "Heraklion", "Time")[1] == 'planner'
+    assert cache.plan("Piraeus", "Heraklion", "Fuel", speed=14.0)[1] == 'planner'
+    stats = cache.stats()
+    assert stats['memory']['hits'] == 1 and stats['overall']['misses'] == 3
+    assert len(db.get_route_history()) == 3
+
+
+def test_weather_epoch_invalidates(tmp_path):
+    cache = RouteCache(db=DatabaseManager(str(tmp_path / "routes.db")))
+    graph = get_route_graph()
+    codes = np.zeros(graph.shape, dtype=np.int8)
+    assert weather_epoch(codes) == CALM_EPOCH
+
+    cache.plan("Piraeus", "Santorini")
+    codes[graph.cell(37.0, 24.5)] = 2
+    stormy, source = cache.plan("Piraeus", "Santorini", weather=codes)
+    assert source == 'planner'
+    assert cache.plan("Piraeus", "Santorini", weather=codes.copy())[1] == 'memory'
+
+
+def test_lru_evicts_to_database(tmp_path):
+    cache = RouteCache(db=DatabaseManager(str(tmp_path / "routes.db")), maxsize=1)
+    cache.plan("Piraeus", "Santorini")
+    cache.plan("Piraeus", "Heraklion")
+    assert cache.plan("Piraeus", "Santorini")[1] == 'database'
+
+
+def _tanker(load=70.0, fuel_price=750.0):
+    vessel = TankerVessel(
+        name="TEST TANKER", lat=37.9, lon=23.7, destination="Piraeus",
+        eta=datetime.now() + timedelta(hours=48), cargo_status="En Route",
+        fuel_level=80, tank_type="crude_oil", cargo_capacity=1000.0
+    )
+    vessel.load_percentage = load
+    vessel.fuel_cost_per_ton = fuel_price
+    return vessel
+
+
+def test_vessel_inputs_are_part_of_the_key(tmp_path):
+    cache = RouteCache(db=DatabaseManager(str(tmp_path / "routes.db")))
+    light, source = cache.plan("Piraeus", "Heraklion", "Cost", vessel=_tanker(load=30.0))
+    assert source == 'planner'
+    assert cache.plan("Piraeus", "Heraklion", "Cost", vessel=_tanker(load=31.0))[1] == 'memory'
+
+    laden, source = cache.plan("Piraeus", "Heraklion", "Cost", vessel=_tanker(load=95.0))
+    assert source == 'planner' and laden.fuel_consumption != light.fuel_consumption
+    pricey, source = cache.plan("Piraeus", "Heraklion", "Cost", vessel=_tanker(load=30.0, fuel_price=900.0))
+    assert source == 'planner' and pricey.total_cost > light.total_cost
+
+    heated = _tanker(load=30.0)
+    heated.heating_required = True
+    assert vessel_profile(heated) != vessel_profile(_tanker(load=30.0))
+    assert vessel_profile(None) == "Generic"
+
+
+def test_sessions_share_one_cache(tmp_path):
+    assert get_route_cache() is get_route_cache()
+    assert get_route_cache().planner is get_route_planner()
+
+    cache = RouteCache(db=DatabaseManager(str(tmp_path / "routes.db")))
+    cache.plan("Piraeus", "Santorini")
+    threads = [threading.Thread(target=lambda: [cache.plan("Piraeus", "Santorini") for _ in range(200)])
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.stats()['memory']['hits'] == 8 * 200
+
+
+def test_migrates_old_routes_table(tmp_path):
+    path = tmp_path / "old.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute(OLD_ROUTES_TABLE)
+        conn.execute("INSERT INTO routes (origin, destination, distance, estimated_time, fuel_consumption,"
+                     " created_at) VALUES ('Piraeus', 'Heraklion', 180, 15, 20, '2024-01-01')")
+
+    db = DatabaseManager(str(path))
+    with sqlite3.connect(path) as conn:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(routes)")}
+    assert set(DatabaseManager.ROUTE_CACHE_COLUMNS) <= columns
+    assert db.get_route_history()[0]['cache_key'] is None
+    DatabaseManager(str(path))  # Migrating twice is a no-op
@@ -0,0 +1,129 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.utils.api_handler import MarineTrafficAPI
+from src.utils.singleflight import SingleFlight, get_singleflight, singleflight_report
+
+
+def _run_concurrently(count, target):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def run(i):
+        barrier.wait()
+        try:
+            results[i] = target()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_calls_share_one_upstream_call():
+    flight = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return {'positions': len(calls)}
+
+    results = _run_concurrently(8, lambda: flight.do('positions', slow))
+
+    assert len(calls) == 1
+    assert all(value == {'positions': 1} for value, _ in results)
+    assert sorted(shared for _, shared in results) == [False] + [True] * 7
+    assert flight.stats() == {'upstream_calls': 1, 'coalesced': 7, 'fan_in': 8.0}
+    assert flight.in_flight() == 0
+
+
+def test_sequential_calls_and_other_keys_are_not_coalesced():
+    flight = SingleFlight()
+    assert flight.do('a', lambda: 1) == (1, False)
+    assert flight.do('a', lambda: 2) == (2, False)
+    assert flight.do('b', lambda: 3) == (3, False)
+    assert flight.stats()['coalesced'] == 0
+
+
+def test_waiters_receive_the_leaders_exception():
+    flight = SingleFlight()
+
+    def failing():
+        time.sleep(0.2)
+        raise ConnectionError("upstream down")
+
+    results = _run_concurrently(4, lambda: flight.do('weather', failing))
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert flight.stats()['upstream_calls'] == 1
+    # The failure is not remembered
+    assert flight.do('weather', lambda: 'ok') == ('ok', False)
+
+
+def test_groups_are_process_wide():
+    assert get_singleflight('test_group') is get_singleflight('test_group')
+    get_singleflight('test_group').do('key', lambda: None)
+    assert singleflight_report()['test_group']['upstream_calls'] >= 1
+
+
+@pytest.fixture
+def marine_traffic():
+    """Local stand-in for the MarineTraffic export API with 300 ms latency"""
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append(self.path)
+            time.sleep(0.3)
+            body = json.dumps([{'MMSI': '237000001', 'LAT': 37.9, 'LON': 23.6}]).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/api/exportvessel/", requests_seen
+    server.shutdown()
+    server.server_close()
+
+
+def test_dashboard_sessions_share_one_positions_fetch(marine_traffic, tmp_path):
+    base_url, requests_seen = marine_traffic
+    sessions = []
+    for _ in range(6):
+        api = MarineTrafficAPI(api_key="sessions")
+        api.base_url = base_url
+        api.cache_dir = tmp_path
+        sessions.append(api)
+    before = get_singleflight('vessel_positions').stats()
+
+    iterator = iter(sessions)
+    lock = threading.Lock()
+
+    def fetch():
+        with lock:
+            api = next(iterator)
+        return api.get_vessel_positions()
+
+    results = _run_concurrently(len(sessions), fetch)
+
+    assert len(requests_seen) == 1
+    assert all(result == [{'MMSI': '237000001', 'LAT': 37.9, 'LON': 23.6}] for result in results)
+    after = get_singleflight('vessel_positions').stats()
+    assert after['upstream_calls'] - before['upstream_calls'] == 1
+    assert after['coalesced'] - before['coalesced'] == 5
@@ -0,0 +1,74 @@
+import numpy as np
+
+from src.models.fleet_state import FleetState
+from src.models.spatial_index import SpatialIndex
+from src.utils.fleet_simulator import FleetSimulator
+from src.utils.geo import haversine_nm
+
+
+def _fleet(size, seed=9):
+    simulator = FleetSimulator(FleetState(capacity=size), seed=seed)
+    simulator.populate(size, bounds=(34.0, 22.0, 41.0, 29.0))
+    return simulator
+
+
+def test_queries_match_brute_force():
+    fleet = _fleet(5000).fleet
+    index = SpatialIndex(fleet, cell_size=0.2)
+    slots = fleet.slots
+    rng = np.random.default_rng(1)
+
+    for lat, lon in rng.uniform((34, 22), (41, 29), (20, 2)):
+        distances = haversine_nm(lat, lon, fleet.lat[slots], fleet.lon[slots])
+        expected = slots[np.argsort(distances, kind='stable')]
+
+        within = index.radius(lat, lon, 30.0)
+        np.testing.assert_array_equal(within, expected[:np.count_nonzero(distances <= 30.0)])
+        np.testing.assert_array_equal(index.nearest(lat, lon, k=7), expected[:7])
+
+    inside = (fleet.lat[slots] >= 36) & (fleet.lat[slots] <= 37) & \
+             (fleet.lon[slots] >= 24) & (fleet.lon[slots] <= 25.5)
+    np.testing.assert_array_equal(index.bbox(36, 24, 37, 25.5), slots[inside])
+
+
+def test_incremental_sync_with_simulator():
+    simulator = _fleet(2000)
+    fleet = simulator.fleet
+    simulator.index = SpatialIndex(fleet)
+    simulator.run(10)
+
+    # Cells agree with a freshly built index after moves
+    fresh = SpatialIndex(fleet)
+    assert simulator.index.cells == fresh.cells
+
+    fleet.remove(5)
+    simulator.index.sync()
+    assert all(5 not in members for members in simulator.index.cells.values())
+    assert simulator.index.sync() == 0
+
+
+def test_radius_query_only_visits_nearby_cells():
+    fleet = _fleet(100_000).fleet
+    index = SpatialIndex(fleet)
+    slots = fleet.slots
+
+    within = index.radius(37.5, 25.0, 10.0)
+    distances = haversine_nm(37.5, 25.0, fleet.lat[slots], fleet.lon[slots])
+    np.testing.assert_array_equal(np.sort(within), slots[distances <= 10.0])
+    # Candidates come from the few cells around the circle, not the whole fleet
+    d_lon = 10.0 / (60.0 * np.cos(np.radians(37.5)))
+    candidates = index._candidates(37.5 - 10.0 / 60.0, 25.0 - d_lon, 37.5 + 10.0 / 60.0, 25.0 + d_lon)
+    assert len(within) <= len(candidates) < len(slots) / 100
+
+
+def test_nearest_far_from_the_fleet_and_past_its_size():
+    fleet = _fleet(300).fleet
+    index = SpatialIndex(fleet, cell_size=0.1)
+    slots = fleet.slots
+
+    # A point well outside the fleet's bounds still finds the true nearest vessels
+    distances = haversine_nm(45.0, 35.0, fleet.lat[slots], fleet.lon[slots])
+    expected = slots[np.argsort(distances, kind='stable')]
+    np.testing.assert_array_equal(index.nearest(45.0, 35.0, k=3), expected[:3])
+    np.testing.assert_array_equal(index.nearest(45.0, 35.0, k=1000), expected)
+    assert len(index.nearest(45.0, 35.0, k=0)) == 0
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.models.consumption import daily_consumption
+from src.models.speed_planner import berth_wait_hours, jit_speed_profile, plan_arrivals, plan_fleet_arrivals
+from src.models.fleet_state import FleetState
+from src.models.vessel import TankerVessel
+from src.utils.api_handler import MarineTrafficAPI
+
+
+def test_berth_wait_hours():
+    # 10 berths, 7 busy, nobody queued: berth now; 10 busy and 2 queued: third release
+    hours = berth_wait_hours([10, 10, 4], [7, 10, 4], [0, 2, 0], turnover_hours=20.0)
+    np.testing.assert_allclose(hours, [0.0, 3 * 2.0, 5.0])
+
+
+def test_profile_is_fuel_optimal_for_the_arrival_time():
+    distances = np.array([[60.0, 40.0, 100.0]])
+    factors = np.array([[1.0, 1.5, 1.15]])
+    speeds = jit_speed_profile(distances, factors, [20.0], min_speed=1.0, max_speed=30.0)
+
+    hours = distances / speeds
+    assert abs(hours.sum() - 20.0) < 1e-9
+    np.testing.assert_allclose(factors * speeds ** 3, (factors * speeds ** 3)[0, 0])
+
+    def fuel(v):
+        return (daily_consumption(v, factors) / 24 * distances / v).sum()
+
+    constant = np.full_like(distances, distances.sum() / 20.0)
+    assert fuel(speeds) < fuel(constant)
+
+
+def test_profile_respects_speed_limits():
+    speeds = jit_speed_profile([[100.0, 10.0]], [[1.0, 1.5]], [2.0], min_speed=6.0, max_speed=20.0)
+    assert speeds.max() <= 20.0
+    slow = jit_speed_profile([50.0], [1.0], [100.0], min_speed=6.0, max_speed=20.0)
+    assert slow[0, 0] == 6.0
+
+
+def test_slow_steaming_into_congested_port():
+    plan = plan_arrivals(distances=[120.0, 120.0], weather_factors=[1.0, 1.0],
+                         berth_hours=[0.0, 15.0], planned_hours=[8.0, 8.0], max_speed=[20.0, 20.0])
+    np.testing.assert_allclose(plan['speed'], [15.0, 8.0])
+    assert plan['fuel_saving'][0] == 0.0
+    assert plan['fuel_saving'][1] > 0
+    assert plan['waiting_hours'][1] == 0.0
+    assert plan['feasible'].all()
+
+
+def test_late_vessels_are_infeasible():
+    plan = plan_arrivals(distances=[300.0], weather_factors=[1.0], berth_hours=[5.0],
+                         planned_hours=[6.0], max_speed=[20.0])
+    assert not plan['feasible'][0]
+    assert plan['speed'][0] == 20.0 and plan['fuel_saving'][0] <= 0.0
+
+
+def test_sample_fleet_only_slows_vessels_that_save_fuel():
+    api = MarineTrafficAPI()
+    vessels = api.get_sample_data()
+    for vessel in vessels:
+        if vessel.jit_speed is not None:
+            assert vessel.status.name in ('EN_ROUTE', 'APPROACHING')
+            assert vessel.port_status['jit_fuel_saving'] > 0
+
+    # A vessel that drops out of the plan loses its stale speed
+    vessel = next(v for v in vessels if v.status.name == 'LOADING')
+    vessel.jit_speed = 20.0
+    vessel.port_status['jit_fuel_saving'] = 0.0
+    api.plan_arrival_speeds(vessels)
+    assert vessel.jit_speed is None and 'jit_fuel_saving' not in vessel.port_status
+
+
+def test_fleet_plan_sets_vessel_speed():
+    now = datetime.now()
+    fleet = FleetState()
+
+    def tanker(name, lat, lon, destination, hours, status="En Route"):
+        return TankerVessel(name=name, lat=lat, lon=lon, destination=destination,
+                            eta=now + timedelta(hours=hours), cargo_status=status, fuel_level=80.0,
+                            tank_type="crude_oil", cargo_capacity=1000.0, fleet=fleet)
+
+    near = tanker("NEAR", 37.5, 23.9, "Piraeus", 3)
+    far = tanker("FAR", 36.0, 25.0, "Heraklion", 5)
+    lost = tanker("LOST", 36.0, 25.0, "Atlantis", 5)
+    congestion = {
+        "Piraeus": {"total_berths": 10, "current_occupancy": 5, "queue": 0},
+        "Heraklion": {"total_berths": 6, "current_occupancy": 6, "queue": 3},
+    }
+    docked = tanker("DOCKED", 37.9, 23.6, "Piraeus", 5, status="Loading")
+    plan = plan_fleet_arrivals([near, far, lost, docked], congestion, now=now)
+
+    assert plan['vessel'].tolist() == [0, 1]
+    assert plan['berth_hours'][0] == 0.0 and plan['berth_hours'][1] == 16.0
+    assert abs(plan['speed'][0] - plan['distance'][0] / 3.0) < 1e-6
+    assert plan['speed'][1] < plan['distance'][1] / 5.0
+
+    far.jit_speed = float(plan['speed'][1])
+    assert far.calculate_optimal_speed() == round(far.jit_speed, 1)
+
+
+def test_each_tick_replans_for_current_congestion():
+    fleet = FleetState()
+    api = MarineTrafficAPI()
+    vessel = TankerVessel(name="FAR", lat=36.0, lon=25.0, destination="Heraklion",
+                          eta=datetime.now() + timedelta(hours=5), cargo_status="En Route", fuel_level=80.0,
+                          tank_type="crude_oil", cargo_capacity=1000.0, fleet=fleet)
+    heraklion = api.port_congestion["Heraklion"]
+
+    heraklion.update(current_occupancy=heraklion['total_berths'], queue=10)
+    api.update_fleet([vessel])
+    assert vessel.jit_speed is not None
+    assert vessel.port_status['berth_available_in'] > timedelta(hours=5)
+
+    # The queue clears: the next tick drops the slow-steaming plan
+    heraklion.update(current_occupancy=0, queue=0)
+    api.update_fleet([vessel])
+    assert vessel.jit_speed is None and 'berth_available_in' not in vessel.port_status
+    assert len(vessel.track_history) == 2  # Moved on both ticks
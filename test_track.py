@@ -0,0 +1,73 @@
+import numpy as np
+
+from src.models.fleet_state import FleetState, HistoryRing
+from src.models.track import simplify_for_zoom, simplify_track, zoom_tolerance
+
+
+def _wander(n, seed=11):
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0, 1e-3, (n, 2)) + [1e-3, 5e-4]
+    return np.cumsum(steps, axis=0) + [37.0, 24.0]
+
+
+def _segment_distance(point, a, b):
+    segment = b - a
+    t = np.clip((point - a) @ segment / (segment @ segment), 0, 1)
+    return np.hypot(*(point - a - t * segment))
+
+
+def test_simplification_stays_within_tolerance():
+    points = _wander(2000)
+    tolerance = 2e-3
+    simplified = simplify_track(points, tolerance)
+
+    assert 2 < len(simplified) < len(points) / 5
+    np.testing.assert_array_equal(simplified[[0, -1]], points[[0, -1]])
+
+    # Every dropped point lies within tolerance of the kept line
+    kept = np.flatnonzero((points[:, None] == simplified[None]).all(axis=2).any(axis=1))
+    for start, end in zip(kept[:-1], kept[1:]):
+        for i in range(start + 1, end):
+            assert _segment_distance(points[i], points[start], points[end]) <= tolerance
+
+
+def test_straight_line_collapses_and_zoom_caps_points():
+    line = np.column_stack((np.linspace(0, 1, 100), np.linspace(0, 2, 100)))
+    assert len(simplify_track(line, 1e-9)) == 2
+
+    points = _wander(5000)
+    assert zoom_tolerance(10) < zoom_tolerance(9)
+    assert len(simplify_for_zoom(points, zoom=18, max_points=300)) <= 300
+
+
+def test_track_ring_grows_per_slot_to_retention():
+    ring = HistoryRing(capacity=4, length=100, shape=(2,), chunk_length=16)
+    for i in range(250):
+        ring.append(np.array([1]), np.array([[i, i]]))
+        if i < 20:
+            ring.append(np.array([2]), np.array([[-i, -i]]))
+        if i == 10:
+            np.testing.assert_array_equal(ring.allocated(), [0, 16, 16, 0])
+
+    # Only the slot with a long track holds its full retention
+    np.testing.assert_array_equal(ring.allocated(), [0, 100, 32, 0])
+    np.testing.assert_array_equal(ring.get(1)[:, 0], np.arange(150, 250))
+    np.testing.assert_array_equal(ring.get(2)[:, 0], -np.arange(20))
+    assert len(ring.get(0)) == 0
+
+    # A reset slot reuses its chunks
+    ring.reset(1)
+    ring.append(np.array([1]), np.array([[7, 7]]))
+    np.testing.assert_array_equal(ring.get(1), [[7, 7]])
+    assert ring.used == 9
+
+
+def test_fleet_keeps_long_tracks():
+    fleet = FleetState(capacity=2, history_size=10)
+    slot = fleet.add(37.0, 24.0)
+    for i in range(500):
+        fleet.move([slot], [37.0 + i * 1e-3], [24.0])
+        fleet.set_speed([slot], [12.0])
+
+    assert len(fleet.track.get(slot)) == 500
+    assert len(fleet.speed_history.get(slot)) == 10
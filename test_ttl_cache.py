@@ -0,0 +1,200 @@
+import gc
+import json
+import os
+import threading
+import time
+import weakref
+
+import pytest
+
+from src.utils.api_handler import POSITIONS_MAX_STALE, APIError, MarineTrafficAPI
+from src.utils.http_client import HostPolicy, HTTPClient
+from src.utils.ttl_cache import TTLCache, get_ttl_cache, prune_cache_files
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _cache(**kwargs):
+    clock = FakeClock()
+    return TTLCache(clock=clock, **kwargs), clock
+
+
+def test_fresh_entries_are_served_until_ttl():
+    cache, clock = _cache(ttl=60)
+    calls = []
+    loader = lambda: calls.append(1) or len(calls)
+
+    assert cache.get('positions', loader) == 1
+    clock.now += 59
+    assert cache.get('positions', loader) == 1
+    assert calls == [1]
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_stale_entry_is_served_while_refreshing_in_background():
+    cache, clock = _cache(ttl=60)
+    cache.get('positions', lambda: 'old')
+    clock.now += 61
+    release = threading.Event()
+
+    loaded = []
+
+    def slow_loader():
+        release.wait(5)
+        loaded.append('new')
+        return 'new'
+
+    assert cache.get('positions', slow_loader) == 'old'
+    assert cache.get('positions', slow_loader) == 'old'  # One refresh is already pending
+    # Both reads were answered before the loader finished
+    assert loaded == [] and cache.stats()['stale_hits'] == 2
+
+    release.set()
+    assert cache.wait_for_refreshes()
+    assert cache.get('positions', slow_loader) == 'new'
+    stats = cache.stats()
+    assert stats['stale_hits'] == 2 and stats['refreshes'] == 1 and stats['hits'] == 1
+
+
+def test_failed_refresh_keeps_the_stale_entry():
+    cache, clock = _cache(ttl=60)
+    cache.get('positions', lambda: 'old')
+    clock.now += 61
+
+    def failing():
+        raise ConnectionError("down")
+
+    assert cache.get('positions', failing) == 'old'
+    assert cache.wait_for_refreshes()
+    assert cache.stats()['refresh_failures'] == 1
+    assert cache.peek('positions')[1] == 'old'
+
+
+def test_freshness_is_bounded_by_max_stale():
+    cache, clock = _cache(ttl=60, max_stale=120)
+    cache.get('positions', lambda: 'old')
+    clock.now += 60 + 120
+    assert cache.get('positions', lambda: 'new') == 'new'
+    assert cache.stats()['misses'] == 2
+
+
+def test_ttl_can_be_overridden_per_read():
+    cache, clock = _cache(ttl=600, max_stale=0)
+    cache.get('positions', lambda: 'old')
+    clock.now += 30
+    assert cache.get('positions', lambda: 'new', ttl=10) == 'new'
+
+
+def test_size_bounded_lru_eviction():
+    cache, _ = _cache(maxsize=2)
+    cache.get('a', lambda: 1)
+    cache.get('b', lambda: 2)
+    cache.get('a', lambda: 1)
+    cache.get('c', lambda: 3)
+    assert cache.peek('b') is None and cache.peek('a') is not None
+    assert cache.stats()['evictions'] == 1 and cache.stats()['entries'] == 2
+
+
+def test_close_shuts_down_the_refresh_threads():
+    cache, clock = _cache(ttl=60)
+    cache.get('positions', lambda: 'old')
+    clock.now += 61
+    assert cache.get('positions', lambda: 'new') == 'old'
+    executor = cache._executor
+
+    cache.close()
+    assert executor._shutdown and cache._executor is None
+    assert cache.get('positions', lambda: 'newer') == 'new'
+    # A later stale read starts a fresh executor
+    clock.now += 61
+    assert cache.get('positions', lambda: 'newest') == 'new'
+    assert cache.wait_for_refreshes()
+    assert cache.peek('positions')[1] == 'newest'
+    cache.close()
+
+
+def test_prune_cache_files(tmp_path):
+    for i in range(6):
+        path = tmp_path / f"vessel_positions_{i}.json"
+        path.write_text("x" * 100)
+        os.utime(path, (1000 + i, 1000 + i))
+    (tmp_path / "other.json").write_text("keep")
+
+    deleted = prune_cache_files(tmp_path, "vessel_positions_*.json", max_files=4)
+    assert [p.name for p in deleted] == ["vessel_positions_0.json", "vessel_positions_1.json"]
+
+    prune_cache_files(tmp_path, "vessel_positions_*.json", max_bytes=250)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["other.json", "vessel_positions_4.json",
+                                                          "vessel_positions_5.json"]
+
+
+def _api(tmp_path, base_url, cache_duration=300):
+    api = MarineTrafficAPI(api_key=f"ttl-{tmp_path.name}", cache_duration=cache_duration,
+                           http=HTTPClient(HostPolicy(max_retries=0)))
+    api.base_url = base_url
+    api.cache_dir = tmp_path
+    return api
+
+
+def test_positions_start_from_disk_and_refresh_in_background(tmp_path):
+    snapshot = tmp_path / "vessel_positions_20240101_120000.json"
+    snapshot.write_text(json.dumps([{'MMSI': 'old'}]))
+    os.utime(snapshot, (time.time() - 600, time.time() - 600))
+    # Nothing listens here, so the background refresh fails
+    api = _api(tmp_path, "http://127.0.0.1:9/api/exportvessel/")
+
+    cache = get_ttl_cache("vessel_positions", ttl=api.cache_duration, max_stale=POSITIONS_MAX_STALE)
+    before = cache.stats()
+
+    # Served from the snapshot; the failing fetch only ran in the background
+    assert api.get_vessel_positions() == [{'MMSI': 'old'}]
+    assert cache.wait_for_refreshes(timeout=30)
+    after = cache.stats()
+    assert after['stale_hits'] == before['stale_hits'] + 1
+    assert after['refresh_failures'] == before['refresh_failures'] + 1
+    assert cache.age((api.base_url, api.api_key)) >= 600
+
+
+def test_positions_are_copies_of_the_cached_records(tmp_path):
+    snapshot = tmp_path / "vessel_positions_20240101_120000.json"
+    snapshot.write_text(json.dumps([{'MMSI': 'recent'}]))
+    api = _api(tmp_path, "http://127.0.0.1:9/api/exportvessel/")
+
+    positions = api.get_vessel_positions()
+    positions[0]['MMSI'] = 'changed'
+    positions.append({'MMSI': 'added'})
+    assert api.get_vessel_positions() == [{'MMSI': 'recent'}]
+
+
+def test_positions_past_the_freshness_bound_are_refetched(tmp_path):
+    snapshot = tmp_path / "vessel_positions_20240101_120000.json"
+    snapshot.write_text(json.dumps([{'MMSI': 'old'}]))
+    too_old = time.time() - 300 - POSITIONS_MAX_STALE - 1
+    os.utime(snapshot, (too_old, too_old))
+    api = _api(tmp_path, "http://127.0.0.1:9/api/exportvessel/")
+    with pytest.raises(APIError):
+        api.get_vessel_positions()
+
+
+def test_positions_without_cache_raise_api_error(tmp_path):
+    api = _api(tmp_path, "http://127.0.0.1:9/api/exportvessel/")
+    with pytest.raises(APIError):
+        api.get_vessel_positions()
+
+
+def test_positions_cache_does_not_pin_the_handler(tmp_path):
+    snapshot = tmp_path / "vessel_positions_20240101_120000.json"
+    snapshot.write_text(json.dumps([{'MMSI': 'recent'}]))
+    api = _api(tmp_path, "http://127.0.0.1:9/api/exportvessel/")
+    assert api.get_vessel_positions() == [{'MMSI': 'recent'}]
+
+    ref = weakref.ref(api)
+    del api
+    gc.collect()
+    assert ref() is None
@@ -1,15 +1,17 @@
-from src.models.vessel import Vessel
+from src.models.vessel import TankerVessel
 from datetime import datetime
 
 # Create test vessel
-test_vessel = Vessel(
+test_vessel = TankerVessel(
     name="TEST SHIP",
     lat=37.9838,
     lon=23.7275,
     destination="Piraeus",
     eta=datetime.now(),
     cargo_status="En Route",
-    fuel_level=80
+    fuel_level=80,
+    tank_type="crude_oil",
+    cargo_capacity=100000.0
 )
 
 # Check efficiency metrics
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+from src.models.fleet_state import FleetState
+from src.models.vessel import PortCongestion, TankerVessel
+
+
+def _tanker(fleet=None):
+    return TankerVessel(
+        name="TEST TANKER", lat=37.9, lon=23.7, destination="Piraeus",
+        eta=datetime.now() + timedelta(hours=48), cargo_status="En Route",
+        fuel_level=80, tank_type="crude_oil", cargo_capacity=100000.0, fleet=fleet
+    )
+
+
+def test_repeated_calls_are_served_from_cache():
+    vessel = _tanker()
+    first = vessel.get_status_info()
+    for _ in range(3):
+        assert vessel.get_status_info() is first
+
+    stats = vessel.cache_info()
+    assert stats['get_status_info']['hits'] == 3
+    assert stats['get_status_info']['misses'] == 1
+    assert stats['get_status_info']['hit_rate'] == 0.75
+
+
+def test_mutators_invalidate_views():
+    vessel = _tanker()
+    vessel.get_status_info()
+
+    vessel.update_engine_status(rpm=95, load=70, pressure=8.0, temp=80)
+    assert vessel.get_status_info()['engine_status']['has_alerts']
+
+    vessel.add_delay(timedelta(hours=1), "Test", 500.0)
+    assert vessel.get_status_info()['current_delay'] == timedelta(hours=1)
+
+    vessel.update_port_status(PortCongestion.NONE, available_berths=3)
+    vessel.get_status_info()
+    assert vessel.cache_info()['get_status_info']['misses'] == 4
+
+
+def test_fleet_row_writes_invalidate_views():
+    fleet = FleetState()
+    vessel = _tanker(fleet)
+    assert vessel.get_efficiency_metrics()['speed'] == 12.0
+
+    fleet.set_speed([vessel.slot], [15.0])
+    assert vessel.get_efficiency_metrics()['speed'] == 15.0
+
+    fleet.speed[vessel.slot] = 10.0
+    fleet.touch(vessel.slot)
+    assert vessel.get_efficiency_metrics()['speed'] == 10.0
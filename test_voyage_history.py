@@ -0,0 +1,87 @@
+import random
+from datetime import datetime, timedelta
+
+from src.models.vessel import TankerVessel, VoyageData
+from src.models.voyage_history import VoyageHistory
+
+PORTS = ["Piraeus", "Santorini", "Heraklion", "Rhodes"]
+
+
+def _voyage(i, start, origin, destination):
+    return VoyageData(
+        voyage_id=f"V{i}", start_date=start, end_date=start + timedelta(days=2),
+        origin=origin, destination=destination, intermediate_stops=[],
+        distance=200.0, fuel_consumption=20.0, cargo_load=80.0, weather_conditions=[],
+        port_waiting_times={}, total_cost=10000.0 + i, average_speed=12.0, route_efficiency=0.95
+    )
+
+
+def _voyages(n, seed=3):
+    rng = random.Random(seed)
+    base = datetime(2020, 1, 1)
+    return [
+        _voyage(i, base + timedelta(hours=rng.randrange(5 * 365 * 24)), *rng.sample(PORTS, 2))
+        for i in range(n)
+    ]
+
+
+def test_queries_match_linear_scans():
+    voyages = _voyages(2000)
+    history = VoyageHistory(voyages)
+    by_start = sorted(voyages, key=lambda v: v.start_date)
+
+    assert list(history) == by_start
+    assert history[-1] is by_start[-1]
+
+    start, end = datetime(2022, 3, 1), datetime(2022, 9, 15)
+    assert history.between(start, end) == [v for v in by_start if start <= v.start_date <= end]
+    assert history.route("Piraeus", "Rhodes") == [
+        v for v in by_start if (v.origin, v.destination) == ("Piraeus", "Rhodes")]
+    assert history.month(2023, 2) == [
+        v for v in by_start if (v.start_date.year, v.start_date.month) == (2023, 2)]
+    assert history.months()[0] == (2020, 1)
+
+
+def test_same_route_last_year():
+    history = VoyageHistory()
+    current = _voyage(0, datetime(2024, 5, 10), "Piraeus", "Santorini")
+    near = _voyage(1, datetime(2023, 5, 20), "Piraeus", "Santorini")
+    for voyage in (current, _voyage(2, datetime(2023, 5, 1), "Piraeus", "Rhodes"), near,
+                   _voyage(3, datetime(2023, 3, 1), "Piraeus", "Santorini")):
+        history.add(voyage)
+
+    assert history.same_route_last_year(current) is near
+    assert history.same_route_last_year(near) is None
+
+
+def test_same_route_last_year_window_edges():
+    current = _voyage(0, datetime(2024, 5, 10), "Piraeus", "Santorini")
+    target = current.start_date - timedelta(days=365)
+
+    def match(*offsets):
+        history = VoyageHistory([current] + [_voyage(i + 1, target + offset, "Piraeus", "Santorini")
+                                             for i, offset in enumerate(offsets)])
+        found = history.same_route_last_year(current)
+        return None if found is None else found.start_date - target
+
+    # Exactly 30 days away on either side is outside the window
+    assert match(timedelta(days=30), timedelta(days=-30)) is None
+    assert match(timedelta(days=30) - timedelta(minutes=1)) == timedelta(days=30) - timedelta(minutes=1)
+    assert match(timedelta(days=-29, hours=-23)) == timedelta(days=-29, hours=-23)
+    # The closest voyage wins, not the earliest in the history
+    assert match(timedelta(days=-20), timedelta(days=3), timedelta(days=-4)) == timedelta(days=3)
+
+
+def test_vessel_voyage_history():
+    vessel = TankerVessel(
+        name="TEST TANKER", lat=37.9, lon=23.7, destination="Piraeus",
+        eta=datetime.now() + timedelta(hours=48), cargo_status="En Route",
+        fuel_level=80, tank_type="crude_oil", cargo_capacity=1000.0
+    )
+    for voyage in _voyages(50):
+        vessel.add_voyage(voyage)
+
+    start, end = datetime(2021, 1, 1), datetime(2021, 12, 31)
+    result = vessel.get_voyage_history(start, end)
+    assert result == [v for v in vessel.voyage_history if start <= v.start_date <= end]
+    assert len(vessel.get_voyage_history()) == 50
@@ -0,0 +1,334 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src.models.vessel import TankerVessel, WeatherCondition
+from src.utils.api_handler import MarineTrafficAPI
+from src.utils.http_client import HTTPClient
+from src.utils.weather_api import WeatherAPI
+from src.utils.weather_cache import WeatherTileCache
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _cache(tmp_path=None, **kwargs):
+    clock = FakeClock()
+    cache = WeatherTileCache(directory=tmp_path, clock=clock, **kwargs)
+    return cache, clock
+
+
+def test_vessels_in_one_tile_share_a_fetch():
+    cache, _ = _cache(tile_size=0.5)
+    calls = []
+
+    def fetch(lat, lon):
+        calls.append((lat, lon))
+        return {'lat': lat, 'lon': lon}
+
+    first = cache.get(37.91, 23.62, fetch)
+    second = cache.get(37.61, 23.99, fetch)
+    third = cache.get(38.2, 23.62, fetch)
+
+    assert first == second == {'lat': 37.75, 'lon': 23.75}
+    assert third == {'lat': 38.25, 'lon': 23.75}
+    assert len(calls) == 2
+    assert cache.stats['memory_hits'] == 1 and cache.stats['misses'] == 2
+    assert cache.hit_ratio() == pytest.approx(1 / 3)
+
+
+def test_entries_expire_after_ttl():
+    cache, clock = _cache(ttl=600)
+    clock.now = 3600 * 500.0
+    calls = []
+    fetch = lambda lat, lon: calls.append(1) or len(calls)
+
+    assert cache.get(37.9, 23.6, fetch) == 1
+    clock.now += 599
+    assert cache.get(37.9, 23.6, fetch) == 1
+    clock.now += 2
+    assert cache.get(37.9, 23.6, fetch) == 2
+
+
+def test_entries_outlive_the_clock_hour_within_ttl():
+    cache, clock = _cache(ttl=2 * 3600)
+    clock.now = 3600 * 500.0 + 3590
+    fetch = lambda lat, lon: clock.now
+
+    before = cache.get(37.9, 23.6, fetch)
+    clock.now += 3600
+    assert cache.get(37.9, 23.6, fetch) == before
+    assert cache.stats['misses'] == 1
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache, _ = _cache(maxsize=2, tile_size=1.0)
+    calls = []
+
+    def fetch(lat, lon):
+        calls.append(lat)
+        return lat
+
+    cache.get(35.5, 25.0, fetch)
+    cache.get(36.5, 25.0, fetch)
+    cache.get(35.5, 25.0, fetch)  # Refreshes the first tile
+    cache.get(37.5, 25.0, fetch)  # Evicts the second tile
+    cache.get(35.5, 25.0, fetch)
+    cache.get(36.5, 25.0, fetch)
+
+    assert calls == [35.5, 36.5, 37.5, 36.5]
+    assert cache.report()['memory_entries'] == 2
+
+
+def test_disk_tier_survives_a_restart_and_is_bounded(tmp_path):
+    cache, clock = _cache(tmp_path, disk_maxsize=3, prune_every=1, tile_size=1.0)
+    for lat in (35.5, 36.5, 37.5, 38.5):
+        cache.get(lat, 25.0, lambda la, lo: {'lat': la})
+    assert len(list(tmp_path.glob('tile_*.json'))) == 3
+
+    restarted = WeatherTileCache(directory=tmp_path, clock=clock, tile_size=1.0)
+    assert restarted.get(38.5, 25.0, lambda la, lo: pytest.fail("fetched")) == {'lat': 38.5}
+    assert restarted.stats['disk_hits'] == 1
+    # Served from memory afterwards
+    restarted.get(38.5, 25.0, lambda la, lo: pytest.fail("fetched"))
+    assert restarted.stats['memory_hits'] == 1
+
+
+def test_failed_fetch_serves_stale_entry():
+    cache, clock = _cache(ttl=60)
+    clock.now = 3600 * 500.0
+    cache.get(37.9, 23.6, lambda lat, lon: 'old')
+    clock.now += 120
+
+    def failing(lat, lon):
+        raise ConnectionError("down")
+
+    assert cache.get(37.9, 23.6, failing) == 'old'
+    assert cache.stats['stale_served'] == 1
+    with pytest.raises(ConnectionError):
+        cache.get(30.1, 20.1, failing)
+
+
+def test_disk_is_pruned_every_few_writes(tmp_path):
+    cache, _ = _cache(tmp_path, disk_maxsize=2, prune_every=4, tile_size=1.0)
+    for lat in (35.5, 36.5, 37.5):
+        cache.get(lat, 25.0, lambda la, lo: la)
+    assert len(list(tmp_path.glob('tile_*.json'))) == 3
+    cache.get(38.5, 25.0, lambda la, lo: la)
+    assert sorted(p.name.split('_')[1] for p in tmp_path.glob('tile_*.json')) == ['37', '38']
+
+
+def _failing(lat, lon):
+    raise ConnectionError("down")
+
+
+def test_failed_fetch_serves_the_newest_entry(tmp_path):
+    cache, clock = _cache(tmp_path)
+    clock.now = 3600 * 500.0
+    cache.get(37.9, 23.6, lambda lat, lon: 'older')
+    clock.now += 3600
+    cache.get(37.9, 23.6, lambda lat, lon: 'newest')
+    cache.get(37.9, 23.6, lambda lat, lon: 'other', hours=48)
+    clock.now += 5 * 3600
+
+    assert cache.get(37.9, 23.6, _failing) == 'newest'
+    # After a restart the disk tier still has it
+    restarted = WeatherTileCache(directory=tmp_path, clock=clock)
+    assert restarted.get(37.9, 23.6, _failing) == 'newest'
+    assert restarted.stats['stale_served'] == 1
+
+
+def test_concurrent_requests_for_a_tile_fetch_once():
+    cache, _ = _cache()
+    calls = []
+    release = threading.Event()
+
+    def slow_fetch(lat, lon):
+        calls.append(1)
+        release.wait(5)
+        return 'data'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get(37.9, 23.6, slow_fetch)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == ['data'] * 8
+    assert len(calls) == 1
+    report = cache.report()
+    assert report['misses'] == 1 and report['coalesced'] == 7 and report['memory_hits'] == 0
+    assert report['hit_ratio'] == pytest.approx(7 / 8)
+
+
+class StandIn:
+    """Local server answering Stormglass point requests with injected latency"""
+
+    def __init__(self):
+        self.requests = []
+        self.latency = 0.0
+        self.slow = {}  # Latency override per requested latitude
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def start(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.respond(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def respond(self, handler):
+        query = parse_qs(urlparse(handler.path).query)
+        lat, lon = float(query['lat'][0]), float(query['lng'][0])
+        with self.lock:
+            self.requests.append((lat, lon))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.slow.get(lat, self.latency))
+        with self.lock:
+            self.in_flight -= 1
+        body = json.dumps({
+            'hours': [{'time': '2024-01-01T%02d:00:00+00:00' % h,
+                       'waveHeight': {'noaa': 1.0}, 'windSpeed': {'noaa': 4.0}} for h in range(3)],
+            'meta': {'lat': lat, 'lng': lon}
+        }).encode()
+        try:
+            handler.send_response(200)
+            handler.send_header('Content-Type', 'application/json')
+            handler.send_header('Content-Length', str(len(body)))
+            handler.end_headers()
+            handler.wfile.write(body)
+        except OSError:
+            pass  # Client gave up waiting
+
+
+@pytest.fixture
+def stormglass():
+    stand_in = StandIn()
+    stand_in.start()
+    yield stand_in
+    stand_in.stop()
+
+
+def _api(stand_in, tile_size=0.5):
+    api = WeatherAPI(api_key="test", cache=WeatherTileCache(tile_size=tile_size, directory=None), http=HTTPClient())
+    api.base_url = stand_in.base_url
+    return api
+
+
+def test_weather_api_fetches_each_tile_once(stormglass):
+    requests_seen = stormglass.requests
+    api = _api(stormglass)
+
+    positions = [(37.91, 23.62), (37.80, 23.70), (37.60, 23.90), (40.60, 22.90)]
+    results = api.get_fleet_weather_data(positions, hours=3)
+
+    assert len(results) == 4
+    assert all(result['wave_height'] == 1.0 and len(result['weather_forecasts']) == 3 for result in results)
+    assert sorted(requests_seen) == [(37.75, 23.75), (40.75, 22.75)]
+    report = api.cache_report()
+    assert report['misses'] == 2 and report['coalesced'] == 2 and report['memory_hits'] == 0
+    assert report['hit_ratio'] == pytest.approx(0.5)
+
+
+def _positions(count, tile_size=0.5):
+    """One position in each of count distinct tiles"""
+    return [(30.0 + tile_size * i + 0.1, 20.1) for i in range(count)]
+
+
+def test_fleet_refresh_runs_requests_concurrently(stormglass):
+    stormglass.latency = 0.2
+    positions = _positions(12)
+
+    results = asyncio.run(_api(stormglass).fetch_fleet_weather(positions, hours=3, concurrency=6))
+
+    assert all(result is not None for result in results)
+    assert len(stormglass.requests) == 12
+    # Six requests at a time instead of twelve sequential round-trips
+    assert stormglass.max_in_flight == 6
+
+
+def test_slow_tiles_time_out_and_others_are_kept(stormglass):
+    stormglass.latency = 0.05
+    positions = _positions(4)
+    stormglass.slow[30.75] = 2.0  # Tile centre of the second position
+
+    results = asyncio.run(_api(stormglass).fetch_fleet_weather(positions, hours=3, concurrency=4, timeout=0.5))
+
+    assert results[1] is None
+    assert all(results[i]['wave_height'] == 1.0 for i in (0, 2, 3))
+
+
+def test_sync_fleet_weather_falls_back_for_failed_tiles(stormglass):
+    positions = _positions(2)
+    stormglass.slow[30.75] = 2.0
+    results = _api(stormglass).get_fleet_weather_data(positions, hours=3, timeout=0.3)
+
+    assert results[0]['wave_height'] == 1.0
+    assert results[1]['current_weather'].name == 'CALM'
+
+
+def test_fleet_fetch_leaves_the_client_policies_alone(stormglass):
+    api = _api(stormglass)
+    asyncio.run(api.fetch_fleet_weather(_positions(3), hours=3, concurrency=64))
+    assert api.http.policies == {}
+
+
+def test_slow_tile_past_its_deadline_serves_stale_data(stormglass):
+    cache, clock = _cache(tile_size=0.5)
+    clock.now = time.time()
+    api = WeatherAPI(api_key="test", cache=cache, http=HTTPClient())
+    api.base_url = stormglass.base_url
+    positions = _positions(1)
+    assert asyncio.run(api.fetch_fleet_weather(positions, hours=3))[0] is not None
+
+    clock.now += 2 * 3600
+    stormglass.slow[30.25] = 2.0
+    results = asyncio.run(api.fetch_fleet_weather(positions, hours=3, timeout=0.3))
+
+    # The HTTP client gave up in time, so the cache could fall back instead of the fetch being abandoned
+    assert results[0]['wave_height'] == 1.0
+    assert cache.stats['stale_served'] == 1
+
+
+def test_fleet_weather_refresh_updates_every_vessel(stormglass):
+    api = MarineTrafficAPI(weather=_api(stormglass))
+    vessels = [TankerVessel(f"Tanker {i}", lat, lon, "Piraeus", datetime.now() + timedelta(hours=24),
+                            "Loaded", 80.0, "Crude", 50000.0, fleet=api.fleet)
+               for i, (lat, lon) in enumerate([(37.91, 23.62), (37.80, 23.70), (40.60, 22.90)])]
+    for vessel in vessels:
+        vessel.current_weather = WeatherCondition.SEVERE
+
+    api.refresh_fleet_weather(vessels)
+
+    assert len(stormglass.requests) == 2  # One request per weather tile
+    assert all(vessel.current_weather is WeatherCondition.CALM for vessel in vessels)
+    assert all(len(vessel.weather_forecasts) == 3 for vessel in vessels)